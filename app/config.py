@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import validator
-from typing import Optional, List
+from typing import Dict, Optional, List
 import os
 
 
@@ -18,14 +18,51 @@ class Settings(BaseSettings):
     NEWS_FETCH_INTERVAL_MINUTES: int = 30
     NEWS_SOURCES: str = "bbc-news,cnn,reuters,associated-press,the-washington-post"
     NEWS_CATEGORIES: str = "business,technology,science,health,politics"
-    NEWS_HISTORY_DAYS: int = 1
+    NEWS_HISTORY_DAYS: int = 1  # Max age of cached items; 0 keeps them forever
+    # Memory budgets for the cache, trimmed oldest-first per category (0 = none)
+    NEWS_MAX_ITEMS: int = 0
+    NEWS_MAX_BYTES: int = 0
+    # Extra keywords per category, e.g. {"technology": ["tech", "software"]}
+    NEWS_CATEGORY_SYNONYMS: Dict[str, List[str]] = {}
+    NEWS_FETCH_CONCURRENCY: int = 5
+    NEWS_FETCH_TIMEOUT_SECONDS: float = 10.0
+    NEWS_FETCH_RETRIES: int = 2
+    NEWS_FETCH_RETRY_BACKOFF_SECONDS: float = 0.5
+    NEWS_DEDUP_ENABLED: bool = True
+    NEWS_DEDUP_THRESHOLD: float = 0.6  # Jaccard similarity of title+description
     
     # Ollama settings
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "llama3"  # Default model for Nvidia 3090 with 24GB VRAM
+    # One pooled client is shared by every request to Ollama
+    OLLAMA_MAX_CONNECTIONS: int = 8
+    OLLAMA_MAX_KEEPALIVE_CONNECTIONS: int = 8
+    OLLAMA_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    OLLAMA_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    # Non-streaming generations only answer once the whole text is ready
+    OLLAMA_READ_TIMEOUT_SECONDS: float = 300.0
+    # Generated articles cached per model and prompt (0 entries disables it)
+    GENERATION_CACHE_SIZE: int = 128
+    GENERATION_CACHE_TTL_SECONDS: float = 3600
+    # Also keep cached generations on disk across restarts; empty disables it
+    GENERATION_CACHE_DIR: str = ""
     
     # Storage settings
+    NEWS_STORAGE_BACKEND: str = "json"  # "json", "snapshot" or "sqlite"
     NEWS_STORAGE_FILE: str = "data/news_cache.json"
+    NEWS_SNAPSHOT_FILE: str = "data/news_cache.snap"
+    NEWS_STORAGE_DB: str = "data/news_cache.db"
+    NEWS_STORAGE_PRELOAD_ITEMS: int = 10000
+    NEWS_STORAGE_FSYNC: bool = True  # fsync writes before they are reported done
+    NEWS_PERSIST_DEBOUNCE_SECONDS: float = 2.0
+    # Memory-mapped columnar metadata shared by workers; empty disables it
+    NEWS_COLUMNS_FILE: str = "data/news_columns.bin"
+    # Pre-encoded responses cached per store version (0 entries disables it)
+    NEWS_RESPONSE_CACHE_SIZE: int = 256
+    NEWS_RESPONSE_MAX_AGE_SECONDS: int = 60  # Cache-Control max-age; 0 = no-cache
+    # Day-partitioned archive of every ingested article; empty disables it
+    NEWS_ARCHIVE_DIR: str = "data/archive"
+    NEWS_ARCHIVE_SEAL_GRACE_HOURS: float = 6  # Late articles accepted after midnight
     
     @validator("NEWSAPI_API_KEY", pre=True)
     def validate_newsapi_key(cls, v: Optional[str]) -> str:
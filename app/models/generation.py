@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Generator, Any
+from typing import List, Optional
 from enum import Enum
 from datetime import datetime
 
@@ -19,9 +19,23 @@ class NewsStyle(str, Enum):
     ANALYTICAL = "analytical"
 
 
+class CacheOutcome(str, Enum):
+    HIT = "hit"
+    MISS = "miss"
+    # Shared the result of an identical generation already in flight
+    COLLAPSED = "collapsed"
+
+
+class StreamFormat(str, Enum):
+    SSE = "sse"
+    NDJSON = "ndjson"
+
+
 class GenerationRequest(BaseModel):
     category: Optional[str] = None
     source: Optional[str] = None
+    # Free-text topic; when set, context is picked by search relevance
+    query: Optional[str] = None
     time_frame: TimeFrame = TimeFrame.WEEK
     style: NewsStyle = NewsStyle.NEUTRAL
     context_size: int = Field(10, ge=1, le=50)
@@ -34,6 +48,8 @@ class GeneratedNewsItem(BaseModel):
     predicted_date: datetime
     source: str
     category: Optional[str] = None
+    # Placeholder for an unusable completion; never cached or serialized
+    fallback: bool = Field(False, exclude=True)
 
 
 class GenerationResponse(BaseModel):
@@ -43,5 +59,31 @@ class GenerationResponse(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
 
 
-class StreamingGenerationResponse(BaseModel):
-    stream: Generator[str, Any, None]
+class GenerationCacheStats(BaseModel):
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    # Whether entries are also kept on disk across restarts
+    disk: bool
+    hits: int
+    disk_hits: int
+    misses: int
+    hit_ratio: float
+
+
+class LLMClientStats(BaseModel):
+    """Usage of the pooled Ollama client since startup"""
+
+    max_connections: int
+    max_keepalive_connections: int
+    # Requests currently holding or waiting for a pooled connection
+    in_flight: int
+    peak_in_flight: int
+    # in_flight / max_connections; above 1.0 requests queue for the pool
+    utilization: float
+    requests: int
+    errors: int
+    # Requests answered by joining an identical generation in flight
+    coalesced_generations: int = 0
+    coalesced_streams: int = 0
+    cache: Optional[GenerationCacheStats] = None
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime
 
 
 class NewsItem(BaseModel):
@@ -14,6 +14,9 @@ class NewsItem(BaseModel):
     category: Optional[str] = None
     author: Optional[str] = None
     published_at: datetime
+    # Near-duplicate coverage folded into this article at ingest
+    cluster_size: int = 1
+    duplicate_ids: Tuple[str, ...] = ()
     
     class Config:
         frozen = True
@@ -22,3 +25,54 @@ class NewsItem(BaseModel):
 class NewsResponse(BaseModel):
     count: int
     news: List[NewsItem]
+    # Pass back as `cursor` to fetch the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class RefreshResponse(NewsResponse):
+    added: int
+    updated: int
+    evicted: int
+    trimmed: int = 0
+
+
+class SearchResponse(NewsResponse):
+    query: str
+
+
+class CacheStats(BaseModel):
+    items: int
+    resident_bytes: int
+    categories: Dict[str, int]
+    # Configured limits; None means unlimited
+    max_items: Optional[int] = None
+    max_bytes: Optional[int] = None
+    max_age_days: Optional[int] = None
+    # Totals since startup
+    evicted_expired: int = 0
+    evicted_trimmed: int = 0
+
+
+class Facet(BaseModel):
+    value: str
+    count: int
+    newest: Optional[datetime] = None
+
+
+class NewsFacets(BaseModel):
+    """Distinct sources and categories of the cache, most common first"""
+    total: int
+    sources: List[Facet]
+    categories: List[Facet]
+
+
+class ArchivePartition(BaseModel):
+    """Summary of one day of the archive, precomputed when the day is sealed"""
+    day: date
+    count: int
+    # Open days still accept articles; sealed days are immutable
+    sealed: bool
+    first_published: Optional[datetime] = None
+    last_published: Optional[datetime] = None
+    sources: Dict[str, int] = {}
+    categories: Dict[str, int] = {}
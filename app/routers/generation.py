@@ -1,20 +1,88 @@
-from fastapi import APIRouter, HTTPException, Query, Depends, BackgroundTasks
-from typing import List, Optional
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List, Optional
 
 from app.models.generation import (
+    CacheOutcome,
     GenerationRequest,
     GenerationResponse,
-    StreamingGenerationResponse,
+    LLMClientStats,
+    StreamFormat,
+    TimeFrame,
 )
+from app.models.news import NewsItem
 from app.services.llm_service import LLMService, get_llm_service
 from app.services.news_service import NewsService, get_news_service
+from app.services.streaming import (
+    MEDIA_TYPES,
+    STREAM_HEADERS,
+    frame_articles,
+    frame_tokens,
+    relay_until_disconnect,
+)
 
 router = APIRouter()
 
+# Cache name reported in Cache-Status headers (RFC 9211)
+CACHE_STATUS_NAME = "news-from-future-generation"
+CACHE_STATUS_PARAMS = {
+    CacheOutcome.HIT: "hit",
+    CacheOutcome.MISS: "fwd=miss",
+    CacheOutcome.COLLAPSED: "fwd=miss; collapsed",
+}
+
+# Long horizons draw context from as far back as they look ahead
+HISTORY_LOOKBACK = {
+    TimeFrame.MONTH: timedelta(days=30),
+    TimeFrame.YEAR: timedelta(days=365),
+}
+
+
+async def get_context_news(
+    request: GenerationRequest, news_service: NewsService
+) -> List[NewsItem]:
+    """News used as generation context
+
+    Most relevant first if a query is set; month and year horizons sample
+    the archive over a matching lookback window.
+    """
+    if request.query:
+        return await news_service.search_news(
+            request.query,
+            category=request.category,
+            source=request.source,
+            limit=request.context_size,
+        )
+    lookback = HISTORY_LOOKBACK.get(request.time_frame)
+    if lookback is not None:
+        news_items = await news_service.sample_history(
+            since=datetime.now(timezone.utc) - lookback,
+            category=request.category,
+            source=request.source,
+            limit=request.context_size,
+        )
+        if news_items:
+            return news_items
+    return await news_service.get_news(
+        category=request.category,
+        source=request.source,
+        limit=request.context_size,
+    )
+
 
 @router.post("", response_model=GenerationResponse)
 async def generate_future_news(
     request: GenerationRequest,
+    response: Response,
     llm_service: LLMService = Depends(get_llm_service),
     news_service: NewsService = Depends(get_news_service),
 ):
@@ -23,11 +91,7 @@ async def generate_future_news(
     """
     try:
         # Get news for context
-        news_items = await news_service.get_news(
-            category=request.category,
-            source=request.source,
-            limit=request.context_size,
-        )
+        news_items = await get_context_news(request, news_service)
         
         if not news_items:
             raise HTTPException(
@@ -35,13 +99,16 @@ async def generate_future_news(
                 detail="No news found for the given parameters to use as context",
             )
         
-        # Generate future news
-        generated_news = await llm_service.generate_future_news(
+        # Generate future news, reusing an identical earlier generation
+        generated_news, outcome = await llm_service.generate_future_news_cached(
             news_items=news_items,
             time_frame=request.time_frame,
             style=request.style,
             model=request.model,
         )
+        response.headers["Cache-Status"] = (
+            f"{CACHE_STATUS_NAME}; {CACHE_STATUS_PARAMS[outcome]}"
+        )
         
         return GenerationResponse(
             generated_news=generated_news,
@@ -52,40 +119,97 @@ async def generate_future_news(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/stream", response_model=StreamingGenerationResponse)
+def stream_format(request: Request, format: Optional[StreamFormat]) -> StreamFormat:
+    """Explicit `format`, else NDJSON if the client accepts it, else SSE"""
+    if format is not None:
+        return format
+    if MEDIA_TYPES[StreamFormat.NDJSON] in request.headers.get("accept", ""):
+        return StreamFormat.NDJSON
+    return StreamFormat.SSE
+
+
+async def require_context_news(
+    request: GenerationRequest, news_service: NewsService
+) -> List[NewsItem]:
+    """Context news for a streaming generation; 404 if there is none
+
+    Resolved before the response starts, while errors can still set its
+    status.
+    """
+    try:
+        news_items = await get_context_news(request, news_service)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if not news_items:
+        raise HTTPException(
+            status_code=404,
+            detail="No news found for the given parameters to use as context",
+        )
+    return news_items
+
+
+def stream_response(
+    http_request: Request, frames: AsyncIterator[bytes], format: StreamFormat
+) -> StreamingResponse:
+    """Send frames as they are produced, aborting when the client leaves"""
+    return StreamingResponse(
+        relay_until_disconnect(http_request, frames),
+        media_type=MEDIA_TYPES[format],
+        headers=STREAM_HEADERS,
+    )
+
+
+@router.post("/stream", response_class=StreamingResponse)
 async def stream_future_news(
     request: GenerationRequest,
+    http_request: Request,
+    format: Optional[StreamFormat] = Query(
+        None, description="sse (text/event-stream) or ndjson; defaults from Accept"
+    ),
     llm_service: LLMService = Depends(get_llm_service),
     news_service: NewsService = Depends(get_news_service),
 ):
     """
-    Stream future news generation based on current news context.
+    Stream future news generation token by token, as server-sent events or
+    newline-delimited JSON. Every frame is a `token`, followed by a final
+    `done`, or `error` if generation fails midway. The generation is aborted
+    as soon as the client disconnects.
     """
-    try:
-        # Get news for context
-        news_items = await news_service.get_news(
-            category=request.category,
-            source=request.source,
-            limit=request.context_size,
-        )
-        
-        if not news_items:
-            raise HTTPException(
-                status_code=404,
-                detail="No news found for the given parameters to use as context",
-            )
-        
-        # Stream generation
-        return StreamingGenerationResponse(
-            stream=llm_service.stream_future_news(
-                news_items=news_items,
-                time_frame=request.time_frame,
-                style=request.style,
-                model=request.model,
-            )
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    news_items = await require_context_news(request, news_service)
+    format = stream_format(http_request, format)
+    tokens = llm_service.stream_future_news(
+        news_items=news_items,
+        time_frame=request.time_frame,
+        style=request.style,
+        model=request.model,
+    )
+    return stream_response(http_request, frame_tokens(tokens, format), format)
+
+
+@router.post("/stream/articles", response_class=StreamingResponse)
+async def stream_future_articles(
+    request: GenerationRequest,
+    http_request: Request,
+    format: Optional[StreamFormat] = Query(
+        None, description="sse (text/event-stream) or ndjson; defaults from Accept"
+    ),
+    llm_service: LLMService = Depends(get_llm_service),
+    news_service: NewsService = Depends(get_news_service),
+):
+    """
+    Stream generated future news articles, each sent as an `article` frame
+    as soon as the model has finished writing it, then `done` (or `error`).
+    """
+    news_items = await require_context_news(request, news_service)
+    format = stream_format(http_request, format)
+    articles = llm_service.stream_future_articles(
+        news_items=news_items,
+        time_frame=request.time_frame,
+        style=request.style,
+        model=request.model,
+    )
+    return stream_response(http_request, frame_articles(articles, format), format)
 
 
 @router.get("/models", response_model=List[str])
@@ -99,3 +223,13 @@ async def get_available_models(
         return await llm_service.list_available_models()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats", response_model=LLMClientStats)
+async def get_llm_stats(
+    llm_service: LLMService = Depends(get_llm_service),
+):
+    """
+    Get connection pool limits and request counters of the Ollama client.
+    """
+    return llm_service.stats()
@@ -1,34 +1,226 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Awaitable, Callable, List, Optional
+import json
 
-from app.models.news import NewsItem, NewsResponse
+from app.config import settings
+from app.models.news import (
+    ArchivePartition,
+    CacheStats,
+    NewsFacets,
+    NewsItem,
+    NewsResponse,
+    RefreshResponse,
+    SearchResponse,
+)
 from app.services.news_service import NewsService, get_news_service
+from app.services.news_store import decode_cursor
+from app.services.response_cache import etag_matches
 
 router = APIRouter()
 
+# Response header carrying the store version a response was read from
+VERSION_HEADER = "X-News-Version"
+
+
+def parse_fields(fields: str) -> List[str]:
+    """Field names from a `fields` parameter, with `id` always first"""
+    selected = ["id"]
+    for name in fields.split(","):
+        name = name.strip()
+        if not name or name in selected:
+            continue
+        if name not in NewsItem.model_fields:
+            raise HTTPException(status_code=400, detail=f"Unknown field '{name}'")
+        selected.append(name)
+    return selected
+
+
+def check_time_range(since: Optional[datetime], until: Optional[datetime]):
+    """Reject a `from`/`to` range that ends before it starts"""
+    if since is None or until is None:
+        return
+    if since.timestamp() >= until.timestamp():
+        raise HTTPException(status_code=400, detail="'from' must be before 'to'")
+
+
+def check_cursor(
+    cursor: Optional[str], since: Optional[datetime], until: Optional[datetime]
+):
+    """Reject malformed cursors and cursors combined with a time range"""
+    if cursor is None:
+        return
+    if since is not None or until is not None:
+        raise HTTPException(
+            status_code=400, detail="'cursor' cannot be combined with 'from'/'to'"
+        )
+    try:
+        decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def page_cursor(
+    news_service: NewsService,
+    page: list,
+    limit: int,
+    cursor: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+) -> Optional[str]:
+    """`next_cursor` for a page; time-range pages are paged with `skip`"""
+    if since is not None or until is not None:
+        return None
+    return news_service.next_cursor(page, limit, cursor)
+
+
+def version_of(news_service: NewsService, cursor: Optional[str] = None) -> str:
+    """Header value for the store version a response was read from"""
+    return str(news_service.snapshot(cursor).version)
+
+
+def encode_json(payload: Any) -> bytes:
+    """JSON body for a model or plain data, encoded once per cache entry"""
+    if isinstance(payload, BaseModel):
+        return payload.model_dump_json().encode("utf-8")
+    return json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode("utf-8")
+
+
+def cache_control() -> str:
+    max_age = settings.NEWS_RESPONSE_MAX_AGE_SECONDS
+    return f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+
+
+async def cached_json(
+    request: Request,
+    news_service: NewsService,
+    build: Callable[[], Awaitable[Any]],
+    cursor: Optional[str] = None,
+) -> Response:
+    """Serve the JSON of `build()` from the response cache
+
+    Entries are keyed by path, query string and store version, so they are
+    only reused until a refresh publishes a new version. A body whose build
+    overlapped a publish or an archive or storage write is served but not
+    cached. Matching If-None-Match requests get an empty 304.
+    """
+    query = tuple(sorted(request.query_params.multi_items()))
+    key = (request.url.path, query, news_service.snapshot(cursor).version)
+    cache = news_service.response_cache
+    entry = cache.get(key)
+    if entry is None:
+        generation = cache.generation
+        body = encode_json(await build())
+        # Building may have fetched news and so published a new version
+        version = news_service.snapshot(cursor).version
+        entry = cache.put((*key[:2], version), body, generation)
+    else:
+        version = key[2]
+
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": cache_control(),
+        VERSION_HEADER: str(version),
+    }
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
 
 @router.get("", response_model=NewsResponse)
 async def get_news(
+    request: Request,
     category: Optional[str] = Query(None, description="Filter by news category"),
     source: Optional[str] = Query(None, description="Filter by news source"),
     limit: int = Query(10, ge=1, le=100, description="Number of news items to return"),
     skip: int = Query(0, ge=0, description="Number of news items to skip"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated item fields to return, e.g. id,title"
+    ),
+    from_: Optional[datetime] = Query(
+        None, alias="from", description="Only news published at or after this time"
+    ),
+    to: Optional[datetime] = Query(
+        None, description="Only news published before this time"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="`next_cursor` of the previous page, to continue from it"
+    ),
     news_service: NewsService = Depends(get_news_service),
 ):
     """
     Retrieve current news articles.
-    Optionally filter by category or source.
+    Optionally filter by category, source or publication time range (served
+    from the archive), and trim each item to `fields`. Follow `next_cursor`
+    for stable paging across refreshes. Responses carry an ETag and answer
+    If-None-Match with 304 until the next refresh.
     """
-    try:
-        news_items = await news_service.get_news(
+    check_time_range(from_, to)
+    check_cursor(cursor, from_, to)
+    selected = parse_fields(fields) if fields else None
+
+    async def build():
+        filters = dict(
             category=category,
             source=source,
             limit=limit,
             skip=skip,
+            since=from_,
+            until=to,
+            cursor=cursor,
         )
+        if selected:
+            news_items = await news_service.get_news_fields(selected, **filters)
+            # Partial items do not fit NewsItem, so they skip the model
+            return {
+                "count": len(news_items),
+                "news": news_items,
+                "next_cursor": page_cursor(
+                    news_service, news_items, limit, cursor, from_, to
+                ),
+            }
+        news_items = await news_service.get_news(**filters)
         return NewsResponse(
             count=len(news_items),
             news=news_items,
+            next_cursor=page_cursor(news_service, news_items, limit, cursor, from_, to),
+        )
+
+    try:
+        return await cached_json(request, news_service, build, cursor)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search_news(
+    response: Response,
+    q: str = Query(..., min_length=1, description="Search terms"),
+    category: Optional[str] = Query(None, description="Filter by news category"),
+    source: Optional[str] = Query(None, description="Filter by news source"),
+    limit: int = Query(10, ge=1, le=100, description="Number of news items to return"),
+    skip: int = Query(0, ge=0, description="Number of news items to skip"),
+    news_service: NewsService = Depends(get_news_service),
+):
+    """
+    Search cached news articles by keyword.
+    Results are ranked by relevance (BM25).
+    """
+    try:
+        news_items = await news_service.search_news(
+            q,
+            category=category,
+            source=source,
+            limit=limit,
+            skip=skip,
+        )
+        response.headers[VERSION_HEADER] = version_of(news_service)
+        return SearchResponse(
+            count=len(news_items),
+            news=news_items,
+            query=q,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -36,43 +228,116 @@ async def get_news(
 
 @router.get("/categories", response_model=List[str])
 async def get_categories(
+    request: Request,
     news_service: NewsService = Depends(get_news_service),
 ):
     """
     Get all available news categories.
     """
     try:
-        return await news_service.get_categories()
+        return await cached_json(request, news_service, news_service.get_categories)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/sources", response_model=List[str])
 async def get_sources(
+    request: Request,
     news_service: NewsService = Depends(get_news_service),
 ):
     """
     Get all available news sources.
     """
     try:
-        return await news_service.get_sources()
+        return await cached_json(request, news_service, news_service.get_sources)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/refresh", response_model=NewsResponse)
+@router.get("/facets", response_model=NewsFacets)
+async def get_facets(
+    request: Request,
+    news_service: NewsService = Depends(get_news_service),
+):
+    """
+    Get the sources and categories of cached news with their article counts
+    and newest publication time, most common first.
+    """
+    try:
+        return await cached_json(request, news_service, news_service.get_facets)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/refresh", response_model=RefreshResponse)
 async def refresh_news(
     news_service: NewsService = Depends(get_news_service),
 ):
     """
     Force refresh of news data from external API.
+    Reports how many items the refresh added, updated, evicted and trimmed.
     """
     try:
         await news_service.fetch_news()
+        delta = news_service.last_merge
         news_items = await news_service.get_news(limit=20)
-        return NewsResponse(
+        return RefreshResponse(
             count=len(news_items),
             news=news_items,
+            added=len(delta.added),
+            updated=len(delta.updated),
+            evicted=len(delta.evicted),
+            trimmed=len(delta.trimmed),
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats", response_model=CacheStats)
+async def get_stats(
+    news_service: NewsService = Depends(get_news_service),
+):
+    """
+    Get cache size, retention limits and eviction counters.
+    """
+    try:
+        return await news_service.get_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/archive", response_model=List[ArchivePartition])
+async def get_archive_partitions(
+    from_: Optional[datetime] = Query(
+        None, alias="from", description="First day to summarize"
+    ),
+    to: Optional[datetime] = Query(None, description="End of the range (exclusive)"),
+    news_service: NewsService = Depends(get_news_service),
+):
+    """
+    Get per-day summaries of the news archive, newest day first.
+    """
+    check_time_range(from_, to)
+    try:
+        return await news_service.get_archive_partitions(since=from_, until=to)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{news_id}", response_model=NewsItem)
+async def get_news_item(
+    news_id: str,
+    response: Response,
+    news_service: NewsService = Depends(get_news_service),
+):
+    """
+    Retrieve a single news article by its id.
+    """
+    try:
+        news_item = await news_service.get_news_item(news_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if news_item is None:
+        raise HTTPException(status_code=404, detail="News item not found")
+    response.headers[VERSION_HEADER] = version_of(news_service)
+    return news_item
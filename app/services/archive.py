@@ -0,0 +1,340 @@
+import json
+import logging
+import mmap
+import os
+import threading
+from collections import Counter, OrderedDict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from app.models.news import ArchivePartition, NewsItem
+from app.services.news_store import sort_key
+from app.services.records import AnyNewsItem, materialize
+from app.services.snapshot import read_snapshot, write_snapshot
+from app.services.storage import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Directory layout:
+#   manifest.json          summaries of the sealed days
+#   YYYY-MM-DD.snap        sealed day, in the snapshot format, newest first
+#   YYYY-MM-DD.open.jsonl  open day, one NewsItem per line, last version wins
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+SEGMENT_SUFFIX = ".snap"
+OPEN_SUFFIX = ".open.jsonl"
+# Sealed days kept memory-mapped between queries
+MAPPED_PARTITIONS = 64
+
+
+def partition_day(published_at: datetime) -> date:
+    """UTC day an article is archived under"""
+    return datetime.fromtimestamp(published_at.timestamp(), timezone.utc).date()
+
+
+def summarize(day: date, items: List[AnyNewsItem], sealed: bool) -> ArchivePartition:
+    """Summary of a day's items, which must be in store order"""
+    return ArchivePartition(
+        day=day,
+        count=len(items),
+        sealed=sealed,
+        first_published=items[-1].published_at if items else None,
+        last_published=items[0].published_at if items else None,
+        sources=dict(Counter(item.source for item in items)),
+        categories=dict(Counter(item.category for item in items if item.category)),
+    )
+
+
+def _matching_count(
+    summary: ArchivePartition, category: Optional[str], source: Optional[str]
+) -> Optional[int]:
+    """Items of the partition matching the filters, if the summary tells"""
+    if category and source:
+        return None
+    if category:
+        return summary.categories.get(category, 0)
+    if source:
+        return summary.sources.get(source, 0)
+    return summary.count
+
+
+class NewsArchive:
+    """Append-only archive of every ingested article, partitioned by day
+
+    Articles go to the open partition of their UTC publication day. Once a
+    day has been over for `grace`, its partition is sealed: written once as
+    an immutable snapshot segment, with its summary stored in the manifest.
+    Articles arriving later for a sealed day are dropped and counted.
+
+    Time-range queries only open the partitions of the days in range. Sealed
+    partitions are memory-mapped and filtered on their index, and whole
+    partitions are skipped by their summary counts where possible.
+    """
+
+    def __init__(
+        self, root: str, grace: timedelta = timedelta(hours=6), fsync: bool = True
+    ):
+        self.root = root
+        self.grace = grace
+        self.fsync = fsync
+        self.late_dropped = 0
+        self._lock = threading.Lock()
+        self._sealed: Dict[date, ArchivePartition] = {}
+        self._open: Dict[date, Dict[str, NewsItem]] = {}
+        self._mapped: "OrderedDict[date, List[AnyNewsItem]]" = OrderedDict()
+        os.makedirs(root, exist_ok=True)
+        self._load()
+
+    def _segment_path(self, day: date) -> str:
+        return os.path.join(self.root, f"{day.isoformat()}{SEGMENT_SUFFIX}")
+
+    def _open_path(self, day: date) -> str:
+        return os.path.join(self.root, f"{day.isoformat()}{OPEN_SUFFIX}")
+
+    def _load(self):
+        manifest_path = os.path.join(self.root, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+            for entry in manifest["partitions"]:
+                summary = ArchivePartition.model_validate(entry)
+                self._sealed[summary.day] = summary
+
+        for name in os.listdir(self.root):
+            if not name.endswith(OPEN_SUFFIX):
+                continue
+            day = date.fromisoformat(name[: -len(OPEN_SUFFIX)])
+            if day in self._sealed:
+                # Sealed, but the process stopped before removing the log
+                os.unlink(os.path.join(self.root, name))
+                continue
+            self._open[day] = self._read_open(os.path.join(self.root, name))
+
+    @staticmethod
+    def _read_open(path: str) -> Dict[str, NewsItem]:
+        items: Dict[str, NewsItem] = {}
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    item = NewsItem.model_validate_json(line)
+                except ValueError:
+                    # A torn final line from a crash mid-append
+                    logger.warning(f"Skipping unreadable archive line in {path}")
+                    continue
+                items[item.id] = item
+        return items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(summary.count for summary in self._sealed.values()) + sum(
+                len(items) for items in self._open.values()
+            )
+
+    def add(self, items: Iterable[AnyNewsItem]) -> int:
+        """Append new or changed articles to their open day partitions
+
+        Returns the number of articles written.
+        """
+        appended: Dict[date, List[NewsItem]] = {}
+        with self._lock:
+            for item in items:
+                day = partition_day(item.published_at)
+                if day in self._sealed:
+                    self.late_dropped += 1
+                    continue
+                item = materialize(item)
+                partition = self._open.setdefault(day, {})
+                if partition.get(item.id) == item:
+                    continue
+                partition[item.id] = item
+                appended.setdefault(day, []).append(item)
+
+            for day, day_items in appended.items():
+                with open(self._open_path(day), "a") as f:
+                    f.writelines(item.model_dump_json() + "\n" for item in day_items)
+                    if self.fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+        return sum(len(day_items) for day_items in appended.values())
+
+    def backfill(self, items: Iterable[AnyNewsItem]) -> int:
+        """Add the articles the archive has never seen, leaving others alone
+
+        Unlike `add`, known ids are skipped without decoding the item.
+        """
+        unseen = []
+        with self._lock:
+            for item in items:
+                day = partition_day(item.published_at)
+                if day not in self._sealed and item.id not in self._open.get(day, ()):
+                    unseen.append(item)
+        return self.add(unseen)
+
+    def seal(self, now: Optional[datetime] = None) -> List[date]:
+        """Seal the open partitions of days that closed over `grace` ago"""
+        now = now or datetime.now(timezone.utc)
+        sealed = []
+        with self._lock:
+            for day in sorted(self._open):
+                closed = datetime.combine(day + timedelta(days=1), time(), timezone.utc)
+                if closed + self.grace > now:
+                    continue
+                items = sorted(self._open[day].values(), key=sort_key)
+                with atomic_write(self._segment_path(day), "wb", self.fsync) as f:
+                    write_snapshot(f, items)
+                self._sealed[day] = summarize(day, items, sealed=True)
+                # The manifest commits the seal; only then is the log redundant
+                self._write_manifest()
+                os.unlink(self._open_path(day))
+                del self._open[day]
+                sealed.append(day)
+        if sealed:
+            logger.info(f"Sealed archive partitions {', '.join(map(str, sealed))}")
+        return sealed
+
+    def _write_manifest(self):
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "partitions": [
+                self._sealed[day].model_dump(mode="json")
+                for day in sorted(self._sealed)
+            ],
+        }
+        path = os.path.join(self.root, MANIFEST)
+        with atomic_write(path, "w", self.fsync) as f:
+            json.dump(manifest, f)
+
+    def _days(self, since: Optional[datetime], until: Optional[datetime]) -> List[date]:
+        """Archived days overlapping [since, until), newest first"""
+        first = None if since is None else partition_day(since)
+        last = None
+        if until is not None:
+            last = partition_day(until - timedelta(microseconds=1))
+        return sorted(
+            (
+                day
+                for day in (*self._sealed, *self._open)
+                if (first is None or day >= first) and (last is None or day <= last)
+            ),
+            reverse=True,
+        )
+
+    def _summary(self, day: date) -> ArchivePartition:
+        if day in self._sealed:
+            return self._sealed[day]
+        return summarize(day, self._items(day), sealed=False)
+
+    def _items(self, day: date) -> List[AnyNewsItem]:
+        """A day's articles in store order; sealed days are lazily decoded"""
+        if day in self._open:
+            return sorted(self._open[day].values(), key=sort_key)
+        items = self._mapped.get(day)
+        if items is None:
+            with open(self._segment_path(day), "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            items = read_snapshot(buffer)
+            self._mapped[day] = items
+            if len(self._mapped) > MAPPED_PARTITIONS:
+                self._mapped.popitem(last=False)
+        else:
+            self._mapped.move_to_end(day)
+        return items
+
+    def _matching(
+        self,
+        day: date,
+        start: Optional[float],
+        end: Optional[float],
+        category: Optional[str],
+        source: Optional[str],
+    ) -> List[AnyNewsItem]:
+        return [
+            item
+            for item in self._items(day)
+            if (start is None or item.published_at.timestamp() >= start)
+            and (end is None or item.published_at.timestamp() < end)
+            and (not category or item.category == category)
+            and (not source or item.source == source)
+        ]
+
+    def query(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: int = 10,
+        skip: int = 0,
+    ) -> List[AnyNewsItem]:
+        """Newest-first archived articles published in [since, until)"""
+        start = None if since is None else since.timestamp()
+        end = None if until is None else until.timestamp()
+        results: List[AnyNewsItem] = []
+        with self._lock:
+            for day in self._days(since, until):
+                if day in self._sealed:
+                    summary = self._sealed[day]
+                    count = _matching_count(summary, category, source)
+                    if count == 0:
+                        continue
+                    covered = (
+                        start is None or summary.first_published.timestamp() >= start
+                    ) and (end is None or summary.last_published.timestamp() < end)
+                    # Whole pages of skipped items never open the partition
+                    if covered and count is not None and count <= skip:
+                        skip -= count
+                        continue
+                matching = self._matching(day, start, end, category, source)
+                if skip >= len(matching):
+                    skip -= len(matching)
+                    continue
+                results.extend(matching[skip : skip + limit - len(results)])
+                skip = 0
+                if len(results) >= limit:
+                    break
+        return results
+
+    def sample(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[AnyNewsItem]:
+        """Up to `limit` articles spread evenly over the days in range
+
+        Used for long-horizon context, where the newest articles alone would
+        all come from the last day or two. At most `limit` days are opened.
+        """
+        start = None if since is None else since.timestamp()
+        end = None if until is None else until.timestamp()
+        with self._lock:
+            days = [
+                day
+                for day in self._days(since, until)
+                if _matching_count(self._summary(day), category, source) != 0
+            ]
+            if len(days) > limit:
+                step = len(days) / limit
+                days = [days[int(i * step)] for i in range(limit)]
+            per_day = [
+                self._matching(day, start, end, category, source) for day in days
+            ]
+
+        # Round-robin over the days, newest article of each day first
+        results: List[AnyNewsItem] = []
+        depth = 0
+        while len(results) < limit and any(depth < len(items) for items in per_day):
+            for items in per_day:
+                if depth < len(items) and len(results) < limit:
+                    results.append(items[depth])
+            depth += 1
+        return sorted(results, key=sort_key)
+
+    def partitions(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[ArchivePartition]:
+        """Summaries of the days overlapping [since, until), newest first"""
+        with self._lock:
+            return [self._summary(day) for day in self._days(since, until)]
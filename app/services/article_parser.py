@@ -0,0 +1,88 @@
+import json
+import logging
+import re
+from typing import List, Optional
+
+from pydantic import ValidationError
+
+from app.models.generation import GeneratedNewsItem
+
+logger = logging.getLogger(__name__)
+
+# Characters that can change the parser state; everything else is skipped
+SPECIAL_RE = re.compile(r'[{}"\\]')
+
+
+class ArticleStreamParser:
+    """Incremental parser for the JSON articles in a streamed LLM completion
+
+    Fed the completion in arbitrary pieces, it returns each article as soon
+    as its object closes instead of waiting for the whole array. It tracks
+    brace depth and string escapes across pieces, so braces inside strings
+    and escapes split between tokens are handled. Text outside objects,
+    such as prose or code fences around the array, is ignored. Objects that
+    are not valid JSON or not a valid article are skipped.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self._in_string = False
+        # A backslash ended the previous piece, so its first char is escaped
+        self._escape_pending = False
+        # Pieces of the object currently open
+        self._parts: List[str] = []
+        self.skipped = 0
+
+    def feed(self, text: str) -> List[GeneratedNewsItem]:
+        """Consume the next piece of the completion, returning closed articles"""
+        articles = []
+        start = 0 if self._depth else None
+        skip_until = 0
+        if self._escape_pending:
+            self._escape_pending = False
+            skip_until = 1
+
+        for match in SPECIAL_RE.finditer(text):
+            i = match.start()
+            if i < skip_until:
+                continue
+            char = match.group()
+            # Strings only matter inside objects; stray quotes in prose do not
+            if self._in_string:
+                if char == "\\":
+                    skip_until = i + 2
+                    self._escape_pending = skip_until > len(text)
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = self._depth > 0
+            elif char == "{":
+                if self._depth == 0:
+                    start = i
+                self._depth += 1
+            elif char == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._parts.append(text[start : i + 1])
+                    article = self._close("".join(self._parts))
+                    self._parts = []
+                    start = None
+                    if article is not None:
+                        articles.append(article)
+
+        if start is not None:
+            self._parts.append(text[start:])
+        return articles
+
+    def _close(self, raw: str) -> Optional[GeneratedNewsItem]:
+        try:
+            return GeneratedNewsItem.model_validate(json.loads(raw))
+        except (ValueError, ValidationError) as e:
+            self.skipped += 1
+            logger.warning(f"Skipping unparseable generated article: {e}")
+            return None
+
+
+def parse_articles(text: str) -> List[GeneratedNewsItem]:
+    """Every valid article in a complete LLM response"""
+    return ArticleStreamParser().feed(text)
@@ -0,0 +1,51 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class CategoryClassifier:
+    """Assigns categories by keyword using a table built once per config
+
+    Every category matches its own name plus any configured synonyms as a
+    case-insensitive substring of the article URL or title. When several
+    categories match, the one listed first in the configuration wins.
+    """
+
+    def __init__(
+        self,
+        categories: Sequence[str],
+        synonyms: Optional[Dict[str, List[str]]] = None,
+    ):
+        self.categories = list(categories)
+        synonyms = synonyms or {}
+
+        # Keywords are lowercased once and kept in priority order, so the
+        # first keyword found in an article decides its category
+        seen = set()
+        keywords: List[Tuple[str, str]] = []
+        for category in self.categories:
+            for keyword in [category, *synonyms.get(category, [])]:
+                keyword = keyword.strip().lower()
+                if keyword and keyword not in seen:
+                    seen.add(keyword)
+                    keywords.append((keyword, category))
+        self._keywords = tuple(keywords)
+
+    def classify(self, url: str, title: str) -> Optional[str]:
+        """Category of a single article"""
+        return self.classify_batch([(url, title)])[0]
+
+    def classify_batch(
+        self, articles: Sequence[Tuple[str, str]]
+    ) -> List[Optional[str]]:
+        """Categories of many (url, title) pairs in one pass over the batch"""
+        keywords = self._keywords
+        result: List[Optional[str]] = []
+        for url, title in articles:
+            # One lowercase copy per article; `in` is a C-level substring scan
+            text = f"{url}\n{title}".lower()
+            for keyword, category in keywords:
+                if keyword in text:
+                    result.append(category)
+                    break
+            else:
+                result.append(None)
+        return result
@@ -0,0 +1,260 @@
+import hashlib
+import json
+import mmap
+import struct
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.records import AnyNewsItem
+from app.services.storage import atomic_write
+
+# File layout (little endian, arrays 8-byte aligned):
+#   header    MAGIC, version, item count, length of the JSON metadata,
+#             digest of the rows (see `rows_digest`)
+#   metadata  JSON with the source and category dictionaries
+#   arrays    published (float64), source codes (int32), category codes
+#             (int32, -1 for none), id offsets (int64, count + 1), id blob
+MAGIC = b"NFFCOLS\0"
+VERSION = 2
+DIGEST_SIZE = 16
+HEADER = struct.Struct(f"<8sHxxxxxxQQ{DIGEST_SIZE}s")
+ALIGNMENT = 8
+NO_CATEGORY = -1
+
+
+class ColumnsFormatError(ValueError):
+    """Raised when a file is not a columns file this version can read"""
+
+
+def _padding(offset: int) -> int:
+    return -offset % ALIGNMENT
+
+
+def rows_digest(items: Iterable[AnyNewsItem]) -> bytes:
+    """Digest of every row's id and filtered metadata, in order
+
+    Two item sequences share a digest only if the columns built from them
+    are identical, so it tells whether a saved file is stale without
+    building the columns again.
+    """
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for item in items:
+        row = (
+            f"{item.id}\0{item.published_at.timestamp()!r}\0"
+            f"{item.source}\0{item.category!r}\n"
+        )
+        digest.update(row.encode("utf-8"))
+    return digest.digest()
+
+
+def _encode(values: List[Optional[str]], dictionary: Dict[str, int]) -> np.ndarray:
+    """Dictionary-encode `values`, adding unseen ones to `dictionary`"""
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        if value is None:
+            codes[i] = NO_CATEGORY
+        else:
+            codes[i] = dictionary.setdefault(value, len(dictionary))
+    return codes
+
+
+class NewsColumns:
+    """Columnar, read-only view of the cache metadata
+
+    Each column is a NumPy array in store order (newest first), with sources
+    and categories dictionary-encoded as integer codes. Filters are computed
+    as vectorized boolean masks instead of loops over NewsItem objects. The
+    arrays can be backed by a memory-mapped file, in which case processes
+    opening the same file share its pages through the OS cache. Columns
+    rebuilt after a refresh live in each process's own memory; the saved
+    file is only mapped again on the next start.
+    """
+
+    def __init__(
+        self,
+        published: np.ndarray,
+        source_codes: np.ndarray,
+        category_codes: np.ndarray,
+        id_offsets: np.ndarray,
+        id_blob,
+        sources: List[str],
+        categories: List[str],
+        digest: bytes,
+    ):
+        self.published = published
+        self.source_codes = source_codes
+        self.category_codes = category_codes
+        self._id_offsets = id_offsets
+        self._id_blob = id_blob
+        self.sources = sources
+        self.categories = categories
+        self.digest = digest
+        self._source_lookup = {value: code for code, value in enumerate(sources)}
+        self._category_lookup = {value: code for code, value in enumerate(categories)}
+
+    def __len__(self) -> int:
+        return len(self.published)
+
+    @classmethod
+    def from_items(cls, items: Iterable[AnyNewsItem]) -> "NewsColumns":
+        """Build columns from items already in store order"""
+        items = list(items)
+        sources: Dict[str, int] = {}
+        categories: Dict[str, int] = {}
+        ids = [item.id.encode("utf-8") for item in items]
+        id_offsets = np.zeros(len(items) + 1, dtype=np.int64)
+        np.cumsum([len(item_id) for item_id in ids], out=id_offsets[1:])
+        return cls(
+            published=np.fromiter(
+                (item.published_at.timestamp() for item in items),
+                dtype=np.float64,
+                count=len(items),
+            ),
+            source_codes=_encode([item.source for item in items], sources),
+            category_codes=_encode([item.category for item in items], categories),
+            id_offsets=id_offsets,
+            id_blob=b"".join(ids),
+            sources=list(sources),
+            categories=list(categories),
+            digest=rows_digest(items),
+        )
+
+    def item_id(self, index: int) -> str:
+        start, end = self._id_offsets[index], self._id_offsets[index + 1]
+        return bytes(self._id_blob[start:end]).decode("utf-8")
+
+    def ids(self, indices: Iterable[int]) -> List[str]:
+        """Article ids at the given row indices"""
+        return [self.item_id(index) for index in indices]
+
+    def mask(
+        self,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> np.ndarray:
+        """Boolean mask of the rows matching all given filters
+
+        `since` is inclusive and `until` exclusive.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if category:
+            code = self._category_lookup.get(category)
+            if code is None:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.category_codes == code
+        if source:
+            code = self._source_lookup.get(source)
+            if code is None:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.source_codes == code
+        if since is not None:
+            mask &= self.published >= since.timestamp()
+        if until is not None:
+            mask &= self.published < until.timestamp()
+        return mask
+
+    def select(
+        self,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        skip: int = 0,
+    ) -> List[str]:
+        """Ids of the newest matching rows, in store order"""
+        indices = np.flatnonzero(self.mask(category, source, since, until))
+        end = None if limit is None else skip + limit
+        return self.ids(indices[skip:end].tolist())
+
+    def count_by(self, field: str, mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+        """Number of (masked) rows per source or category value"""
+        if field == "source":
+            codes, values = self.source_codes, self.sources
+        elif field == "category":
+            codes, values = self.category_codes, self.categories
+        else:
+            raise ValueError(f"Cannot count by '{field}'")
+        if mask is not None:
+            codes = codes[mask]
+        codes = codes[codes != NO_CATEGORY]
+        counts = np.bincount(codes, minlength=len(values))
+        return {value: int(count) for value, count in zip(values, counts) if count}
+
+    def write(self, f: BinaryIO):
+        """Write the columns in the memory-mappable file format"""
+        metadata = json.dumps(
+            {"sources": self.sources, "categories": self.categories}
+        ).encode("utf-8")
+        f.write(HEADER.pack(MAGIC, VERSION, len(self), len(metadata), self.digest))
+        offset = HEADER.size
+        for chunk in (
+            metadata,
+            self.published.astype("<f8", copy=False).tobytes(),
+            self.source_codes.astype("<i4", copy=False).tobytes(),
+            self.category_codes.astype("<i4", copy=False).tobytes(),
+            self._id_offsets.astype("<i8", copy=False).tobytes(),
+            bytes(self._id_blob),
+        ):
+            f.write(chunk)
+            padding = _padding(offset + len(chunk))
+            f.write(b"\0" * padding)
+            offset += len(chunk) + padding
+
+    @classmethod
+    def from_buffer(cls, buffer) -> "NewsColumns":
+        """Columns viewing `buffer` (bytes or mmap) without copying the arrays"""
+        if len(buffer) < HEADER.size:
+            raise ColumnsFormatError("File too short for a columns header")
+        magic, version = HEADER.unpack_from(buffer, 0)[:2]
+        if magic != MAGIC:
+            raise ColumnsFormatError("Not a news columns file")
+        if version != VERSION:
+            raise ColumnsFormatError(f"Unsupported columns version {version}")
+        count, metadata_len, digest = HEADER.unpack_from(buffer, 0)[2:]
+
+        offset = HEADER.size
+        metadata = json.loads(bytes(buffer[offset : offset + metadata_len]))
+        offset += metadata_len + _padding(offset + metadata_len)
+
+        def array(dtype: str, length: int) -> np.ndarray:
+            nonlocal offset
+            values = np.frombuffer(buffer, dtype=dtype, count=length, offset=offset)
+            offset += values.nbytes + _padding(offset + values.nbytes)
+            return values
+
+        published = array("<f8", count)
+        source_codes = array("<i4", count)
+        category_codes = array("<i4", count)
+        id_offsets = array("<i8", count + 1)
+        id_blob = memoryview(buffer)[offset : offset + int(id_offsets[-1])]
+        return cls(
+            published,
+            source_codes,
+            category_codes,
+            id_offsets,
+            id_blob,
+            metadata["sources"],
+            metadata["categories"],
+            digest,
+        )
+
+    def save(self, path: str, fsync: bool = True):
+        """Atomically replace the columns file at `path`"""
+        with atomic_write(path, "wb", fsync) as f:
+            self.write(f)
+
+    @classmethod
+    def open(cls, path: str) -> "NewsColumns":
+        """Memory-map a columns file written by `write`"""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.from_buffer(buffer)
+
+    def matches(self, items: Sequence[AnyNewsItem]) -> bool:
+        """Whether these columns describe exactly `items`, in order"""
+        return len(items) == len(self) and rows_digest(items) == self.digest
@@ -0,0 +1,91 @@
+import re
+import zlib
+from collections import Counter
+from typing import Iterable, Optional, Union
+
+WORD_RE = re.compile(r"\w+")
+
+# zlib only looks back 32 KiB, so a larger preset dictionary is wasted
+MAX_DICT_SIZE = 32 * 1024
+# Shorter texts rarely shrink enough to pay for the bytes object
+MIN_COMPRESS_LENGTH = 64
+# Raw deflate: no zlib header or checksum on every small body
+WBITS = -15
+
+StoredText = Union[str, bytes, None]
+
+
+class ContentCodec:
+    """Compresses article bodies with zlib and a shared preset dictionary
+
+    Bodies of one corpus repeat the same words and phrases, which a preset
+    dictionary lets even short texts reference. Texts that would not shrink
+    are kept as plain strings, so `decode` accepts either form.
+    """
+
+    def __init__(self, zdict: bytes = b"", level: int = 6):
+        self.zdict = zdict
+        self.level = level
+
+    @property
+    def trained(self) -> bool:
+        return bool(self.zdict)
+
+    def encode(self, text: Optional[str]) -> StoredText:
+        """Compressed form of `text`, or `text` itself if that is smaller"""
+        if text is None or len(text) < MIN_COMPRESS_LENGTH:
+            return text
+        raw = text.encode("utf-8")
+        if self.zdict:
+            compressor = zlib.compressobj(
+                self.level, zlib.DEFLATED, WBITS, zdict=self.zdict
+            )
+        else:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, WBITS)
+        data = compressor.compress(raw) + compressor.flush()
+        return data if len(data) < len(raw) else text
+
+    def decode(self, value: StoredText) -> Optional[str]:
+        """Text stored by `encode`"""
+        if not isinstance(value, bytes):
+            return value
+        if self.zdict:
+            decompressor = zlib.decompressobj(WBITS, zdict=self.zdict)
+        else:
+            decompressor = zlib.decompressobj(WBITS)
+        return (decompressor.decompress(value) + decompressor.flush()).decode("utf-8")
+
+    @classmethod
+    def train(cls, texts: Iterable[str], size: int = MAX_DICT_SIZE) -> "ContentCodec":
+        """Build a codec whose dictionary holds the corpus' most useful phrases
+
+        Word 1- to 3-grams are scored by frequency times length. The best
+        ones fill the dictionary, placed last since zlib encodes nearer
+        matches more cheaply.
+        """
+        counts: Counter = Counter()
+        for text in texts:
+            words = WORD_RE.findall(text)
+            for n in (1, 2, 3):
+                for i in range(len(words) - n + 1):
+                    counts[" ".join(words[i : i + n])] += 1
+
+        phrases, used = [], 0
+        ranked = sorted(
+            (
+                (count * len(phrase), phrase)
+                for phrase, count in counts.items()
+                if count > 1
+            ),
+            reverse=True,
+        )
+        for _, phrase in ranked:
+            encoded = phrase.encode("utf-8") + b" "
+            if used + len(encoded) > size:
+                break
+            phrases.append(encoded)
+            used += len(encoded)
+        return cls(b"".join(reversed(phrases)))
+
+
+PLAIN_CODEC = ContentCodec()
@@ -0,0 +1,208 @@
+import hashlib
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.models.news import NewsItem
+from app.services.records import AnyNewsItem, replace
+from app.services.snapshot import read_fields
+
+TOKEN_RE = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were will with".split()
+)
+
+# 16 bands of 3 rows: pairs above ~0.4 Jaccard become candidates, while
+# unrelated headlines almost never share a bucket
+BANDS = 16
+ROWS = 3
+NUM_PERM = BANDS * ROWS
+MAX_HASH = (1 << 64) - 1
+
+# Fixed pseudo-random masks keep signatures identical across processes
+_MASKS = [
+    int.from_bytes(hashlib.blake2b(b"minhash-%d" % i, digest_size=8).digest(), "big")
+    for i in range(NUM_PERM)
+]
+
+Signature = Tuple[int, ...]
+
+
+def _token_hash(token: str) -> int:
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def shingles(text: str) -> Set[str]:
+    """Distinct significant words of `text`"""
+    return {
+        token
+        for token in TOKEN_RE.findall(text.casefold())
+        if len(token) > 1 and token not in STOPWORDS
+    }
+
+
+def minhash(text: str) -> Signature:
+    """MinHash signature of the word set of `text`
+
+    Each token is hashed once; the permutations are XOR masks over that hash.
+    """
+    hashes = [_token_hash(token) for token in shingles(text)]
+    if not hashes:
+        return (MAX_HASH,) * NUM_PERM
+    return tuple(min([h ^ mask for h in hashes]) for mask in _MASKS)
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def fingerprint_text(title: str, description: Optional[str]) -> str:
+    """Text an article is fingerprinted on"""
+    return f"{title} {description or ''}"
+
+
+def article_text(item: AnyNewsItem) -> str:
+    """Fingerprinted text of a cached item, without decoding lazy items"""
+    return fingerprint_text(*read_fields(item, ("title", "description")))
+
+
+class MinHashIndex:
+    """Finds similar signatures through LSH band buckets
+
+    A lookup only compares the items sharing at least one band with the
+    query, so its cost does not grow with the number of indexed items.
+    """
+
+    def __init__(self, threshold: float = 0.6):
+        self.threshold = threshold
+        self._buckets: List[Dict[Signature, Set[str]]] = [{} for _ in range(BANDS)]
+        self._signatures: Dict[str, Signature] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @staticmethod
+    def _bands(signature: Signature) -> List[Signature]:
+        return [signature[i : i + ROWS] for i in range(0, NUM_PERM, ROWS)]
+
+    def add(self, item_id: str, signature: Signature):
+        self.remove(item_id)
+        self._signatures[item_id] = signature
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            bucket.setdefault(band, set()).add(item_id)
+
+    def remove(self, item_id: str):
+        signature = self._signatures.pop(item_id, None)
+        if signature is None:
+            return
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            members = bucket[band]
+            members.discard(item_id)
+            if not members:
+                del bucket[band]
+
+    def find(self, signature: Signature) -> Optional[str]:
+        """Id of the most similar indexed item at or above the threshold"""
+        candidates: Set[str] = set()
+        for bucket, band in zip(self._buckets, self._bands(signature)):
+            candidates.update(bucket.get(band, ()))
+
+        best_id, best_score = None, self.threshold
+        for item_id in candidates:
+            score = similarity(self._signatures[item_id], signature)
+            if score >= best_score:
+                best_id, best_score = item_id, score
+        return best_id
+
+
+class NearDuplicateDetector:
+    """Clusters near-identical stories, keeping one canonical article each
+
+    Duplicates are folded into the canonical article's `duplicate_ids` and
+    `cluster_size`, which doubles as a popularity signal.
+    """
+
+    def __init__(self, threshold: float = 0.6):
+        self.index = MinHashIndex(threshold)
+        # Maps every known article id (canonical or duplicate) to its cluster
+        self._canonical_of: Dict[str, str] = {}
+        self._members: Dict[str, Set[str]] = {}
+
+    def rebuild(self, items: Iterable[AnyNewsItem]):
+        """Reset the clusters from already deduplicated canonical items
+
+        Snapshot items are fingerprinted from their raw records and stay
+        undecoded, so this can run over the whole cache right after startup.
+        """
+        self.index = MinHashIndex(self.index.threshold)
+        self._canonical_of.clear()
+        self._members.clear()
+        for item in items:
+            title, description, duplicate_ids = read_fields(
+                item, ("title", "description", "duplicate_ids")
+            )
+            self._add_cluster(item.id, minhash(fingerprint_text(title, description)))
+            for duplicate_id in duplicate_ids:
+                self._canonical_of[duplicate_id] = item.id
+                self._members[item.id].add(duplicate_id)
+
+    def _add_cluster(self, item_id: str, signature: Signature):
+        self.index.add(item_id, signature)
+        self._canonical_of[item_id] = item_id
+        self._members[item_id] = set()
+
+    def forget(self, canonical_ids: Iterable[str]):
+        """Drop the clusters of evicted canonical articles"""
+        for canonical_id in canonical_ids:
+            self.index.remove(canonical_id)
+            for member_id in self._members.pop(canonical_id, ()):
+                self._canonical_of.pop(member_id, None)
+            self._canonical_of.pop(canonical_id, None)
+
+    def _with_cluster(self, item: NewsItem) -> NewsItem:
+        members = self._members[item.id]
+        size = len(members) + 1
+        if item.cluster_size == size and set(item.duplicate_ids) == members:
+            return item
+        return replace(item, duplicate_ids=tuple(sorted(members)), cluster_size=size)
+
+    def deduplicate(
+        self,
+        items: Iterable[NewsItem],
+        existing: Callable[[str], Optional[AnyNewsItem]],
+    ) -> List[AnyNewsItem]:
+        """Fold a batch into clusters and return the canonical articles
+
+        `existing` looks up canonical articles already in the cache so their
+        cluster size can be bumped when a new duplicate arrives.
+        """
+        canonical: Dict[str, NewsItem] = {}
+        for item in items:
+            canonical_id = self._canonical_of.get(item.id)
+            signature = None
+            if canonical_id is None:
+                signature = minhash(article_text(item))
+                canonical_id = self.index.find(signature)
+
+            base = None
+            if canonical_id is not None and canonical_id != item.id:
+                base = canonical.get(canonical_id) or existing(canonical_id)
+                if base is None:
+                    # The cluster's canonical article is gone; drop the cluster
+                    self.forget([canonical_id])
+                elif item.id not in self._canonical_of:
+                    self._canonical_of[item.id] = canonical_id
+                    self._members[canonical_id].add(item.id)
+
+            if base is None:
+                # A new story leads its own cluster
+                if self._canonical_of.get(item.id) != item.id:
+                    if signature is None:
+                        signature = minhash(article_text(item))
+                    self._add_cluster(item.id, signature)
+                canonical_id, base = item.id, item
+
+            canonical[canonical_id] = self._with_cluster(base)
+        return list(canonical.values())
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from app.models.generation import GeneratedNewsItem, GenerationCacheStats
+from app.services.storage import atomic_write
+
+logger = logging.getLogger(__name__)
+
+ENTRY_SUFFIX = ".json"
+
+Entry = Tuple[float, List[GeneratedNewsItem]]
+
+
+def generation_key(model: str, prompt: str) -> str:
+    """Cache key of a completion request
+
+    The prompt holds the selected context articles, the time frame, the
+    style and the target date, so a key changes whenever any of them does,
+    e.g. once a refresh changes which articles are picked as context.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(model.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class GenerationCache:
+    """LRU cache of generated articles with a TTL and an optional disk tier
+
+    Entries expire `ttl` seconds after they were generated. With a
+    `directory`, every entry is also written there as one JSON file, so
+    generations survive restarts; memory misses fall back to it. Disk
+    access is blocking, so async callers run it in a worker thread.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl: float = 3600,
+        directory: Optional[str] = None,
+        fsync: bool = False,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = directory or None
+        self.fsync = fsync
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self.prune()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{ENTRY_SUFFIX}")
+
+    def get(self, key: str) -> Optional[List[GeneratedNewsItem]]:
+        """Cached articles for `key`, unless missing or expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        entry = self._read(key, now) if self.directory else None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, entry)
+        return entry[1]
+
+    def put(self, key: str, articles: List[GeneratedNewsItem]):
+        """Cache freshly generated articles for `key`"""
+        if self.max_entries <= 0:
+            return
+        entry = (time.time() + self.ttl, list(articles))
+        with self._lock:
+            self._remember(key, entry)
+        if self.directory:
+            self._write(key, entry)
+
+    def _remember(self, key: str, entry: Entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read(self, key: str, now: float) -> Optional[Entry]:
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            expires_at = data["expires_at"]
+            articles = [
+                GeneratedNewsItem.model_validate(article)
+                for article in data["articles"]
+            ]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable generation cache entry {path}: {e}")
+            return None
+        if expires_at <= now:
+            self._unlink(path)
+            return None
+        return expires_at, articles
+
+    def _write(self, key: str, entry: Entry):
+        expires_at, articles = entry
+        data = {
+            "expires_at": expires_at,
+            "articles": [article.model_dump(mode="json") for article in articles],
+        }
+        try:
+            with atomic_write(self._path(key), "w", self.fsync) as f:
+                json.dump(data, f)
+        except OSError as e:
+            logger.error(f"Error writing generation cache entry: {e}")
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def prune(self) -> int:
+        """Delete expired entries from disk, returning how many were removed"""
+        if not self.directory:
+            return 0
+        now, removed = time.time(), 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, "r") as f:
+                    expired = json.load(f)["expires_at"] <= now
+            except (OSError, ValueError, KeyError, TypeError):
+                expired = True
+            if expired:
+                self._unlink(path)
+                removed += 1
+        return removed
+
+    def clear(self):
+        """Drop every entry, from disk as well"""
+        with self._lock:
+            self._entries.clear()
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(ENTRY_SUFFIX):
+                    self._unlink(os.path.join(self.directory, name))
+
+    def stats(self) -> GenerationCacheStats:
+        lookups = self.hits + self.disk_hits + self.misses
+        return GenerationCacheStats(
+            entries=len(self._entries),
+            max_entries=self.max_entries,
+            ttl_seconds=self.ttl,
+            disk=self.directory is not None,
+            hits=self.hits,
+            disk_hits=self.disk_hits,
+            misses=self.misses,
+            hit_ratio=(self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        )
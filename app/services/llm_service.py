@@ -1,30 +1,119 @@
+import asyncio
 import logging
 import json
 import os
-from typing import List, Optional, Generator, Any, Dict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Tuple
 
 import httpx
 import ollama
-from fastapi import Depends
+from fastapi import Depends, Request
 
 from app.config import settings
 from app.models.news import NewsItem
-from app.models.generation import TimeFrame, NewsStyle, GeneratedNewsItem
+from app.models.generation import (
+    CacheOutcome,
+    GeneratedNewsItem,
+    LLMClientStats,
+    NewsStyle,
+    TimeFrame,
+)
+from app.services.article_parser import ArticleStreamParser
+from app.services.generation_cache import GenerationCache, generation_key
+from app.services.single_flight import SingleFlight, StreamFanout
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Source of the placeholder articles returned when a completion is unusable
+FALLBACK_SOURCE = "AI News Generator"
+
+
+def create_ollama_client(base_url: Optional[str] = None) -> httpx.AsyncClient:
+    """Pooled keep-alive HTTP client for the Ollama API"""
+    return httpx.AsyncClient(
+        base_url=base_url or settings.OLLAMA_BASE_URL,
+        timeout=httpx.Timeout(
+            settings.OLLAMA_READ_TIMEOUT_SECONDS,
+            connect=settings.OLLAMA_CONNECT_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OLLAMA_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OLLAMA_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
 
 class LLMService:
-    def __init__(self):
+    """Ollama client shared by all generation requests
+
+    Requests go through one pooled connection pool, so generations reuse
+    kept-alive connections instead of opening one each. Owned by the
+    application lifespan, which closes it on shutdown.
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[GenerationCache] = None,
+    ):
         self.base_url = settings.OLLAMA_BASE_URL
         self.default_model = settings.OLLAMA_MODEL
-        self.client = httpx.AsyncClient(base_url=self.base_url, timeout=60.0)
+        self.client = client or create_ollama_client(self.base_url)
+        self.cache = cache or GenerationCache(
+            settings.GENERATION_CACHE_SIZE,
+            ttl=settings.GENERATION_CACHE_TTL_SECONDS,
+            directory=settings.GENERATION_CACHE_DIR,
+            fsync=settings.NEWS_STORAGE_FSYNC,
+        )
+        # Identical concurrent requests share one upstream generation
+        self.generations: SingleFlight[List[GeneratedNewsItem]] = SingleFlight()
+        self.streams: StreamFanout[str] = StreamFanout()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+    
+    @asynccontextmanager
+    async def _track(self) -> AsyncIterator[None]:
+        """Count a request against the pool while it holds a connection"""
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            yield
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+    
+    def stats(self) -> LLMClientStats:
+        """Pool limits and request counters of the shared client"""
+        max_connections = settings.OLLAMA_MAX_CONNECTIONS
+        return LLMClientStats(
+            max_connections=max_connections,
+            max_keepalive_connections=settings.OLLAMA_MAX_KEEPALIVE_CONNECTIONS,
+            in_flight=self.in_flight,
+            peak_in_flight=self.peak_in_flight,
+            utilization=self.in_flight / max_connections if max_connections else 0.0,
+            requests=self.requests,
+            errors=self.errors,
+            coalesced_generations=self.generations.coalesced,
+            coalesced_streams=self.streams.coalesced,
+            cache=self.cache.stats(),
+        )
+    
+    async def close(self):
+        """Close the pooled HTTP client"""
+        await self.client.aclose()
     
     async def list_available_models(self) -> List[str]:
         """List available models from Ollama"""
         try:
-            response = await self.client.get("/api/tags")
+            async with self._track():
+                response = await self.client.get("/api/tags")
             data = response.json()
             return [model["name"] for model in data.get("models", [])]
         except Exception as e:
@@ -110,18 +199,21 @@ Make sure to only output valid JSON that can be parsed. The articles should feel
         
         try:
             # Make the generation request to Ollama
-            response = await self.client.post(
-                "/api/generate",
-                json={
-                    "model": model_name,
-                    "prompt": prompt,
-                    "system": "You are a future news prediction AI that creates plausible future news articles based on current events.",
-                    "options": {
-                        "temperature": 0.7,
-                        "top_p": 0.9,
+            async with self._track():
+                response = await self.client.post(
+                    "/api/generate",
+                    json={
+                        "model": model_name,
+                        "prompt": prompt,
+                        # Ollama streams NDJSON unless told otherwise
+                        "stream": False,
+                        "system": "You are a future news prediction AI that creates plausible future news articles based on current events.",
+                        "options": {
+                            "temperature": 0.7,
+                            "top_p": 0.9,
+                        }
                     }
-                }
-            )
+                )
             
             if response.status_code != 200:
                 logger.error(f"Error from Ollama API: {response.text}")
@@ -130,69 +222,115 @@ Make sure to only output valid JSON that can be parsed. The articles should feel
             result = response.json()
             generated_text = result.get("response", "")
             
-            # Extract JSON from the response
-            try:
-                # Find JSON array in the text
-                json_start = generated_text.find("[")
-                json_end = generated_text.rfind("]") + 1
-                
-                if json_start >= 0 and json_end > json_start:
-                    json_str = generated_text[json_start:json_end]
-                    articles = json.loads(json_str)
-                    
-                    # Convert to model objects
-                    return [
-                        GeneratedNewsItem(
-                            title=article["title"],
-                            content=article["content"],
-                            predicted_date=datetime.fromisoformat(article["predicted_date"]),
-                            source=article["source"],
-                            category=article.get("category"),
-                        )
-                        for article in articles
-                    ]
-                else:
-                    # Fallback if we can't extract JSON
-                    logger.warning("Could not extract JSON from LLM response, returning raw text")
-                    return [
-                        GeneratedNewsItem(
-                            title="Generated Future News",
-                            content=generated_text,
-                            predicted_date=datetime.now() + timedelta(days=7),
-                            source="AI News Generator",
-                            category="General",
-                        )
-                    ]
-            except json.JSONDecodeError as e:
-                logger.error(f"Error parsing JSON from LLM response: {e}")
+            # Extract the articles from the response
+            parser = ArticleStreamParser()
+            articles = parser.feed(generated_text)
+            if articles:
+                return articles
+            if parser.skipped:
+                logger.error("Could not parse any article from LLM response")
                 return [
                     GeneratedNewsItem(
                         title="Error in Future News Generation",
                         content=f"Could not parse generated content: {generated_text[:500]}...",
                         predicted_date=datetime.now() + timedelta(days=7),
-                        source="AI News Generator",
+                        source=FALLBACK_SOURCE,
                         category="Error",
+                        fallback=True,
                     )
                 ]
+            # Fallback if we can't extract JSON
+            logger.warning("Could not extract JSON from LLM response, returning raw text")
+            return [
+                GeneratedNewsItem(
+                    title="Generated Future News",
+                    content=generated_text,
+                    predicted_date=datetime.now() + timedelta(days=7),
+                    source=FALLBACK_SOURCE,
+                    category="General",
+                    fallback=True,
+                )
+            ]
         except Exception as e:
             logger.error(f"Error generating future news: {e}")
             raise
     
+    async def generate_future_news_cached(
+        self,
+        news_items: List[NewsItem],
+        time_frame: TimeFrame = TimeFrame.WEEK,
+        style: NewsStyle = NewsStyle.NEUTRAL,
+        model: Optional[str] = None,
+    ) -> Tuple[List[GeneratedNewsItem], CacheOutcome]:
+        """Like `generate_future_news`, but reuses an earlier identical completion
+        
+        Returns the articles and where they came from: the cache, a new
+        completion, or one already in flight for an identical request.
+        Fallback placeholders for unusable completions are never cached.
+        """
+        model_name = model or self.default_model
+        key = generation_key(
+            model_name, self._create_prompt(news_items, time_frame, style)
+        )
+        cached = await self._cache_call(self.cache.get, key)
+        if cached is not None:
+            return cached, CacheOutcome.HIT
+        
+        async def generate() -> List[GeneratedNewsItem]:
+            articles = await self.generate_future_news(
+                news_items, time_frame=time_frame, style=style, model=model_name
+            )
+            if articles and not any(article.fallback for article in articles):
+                await self._cache_call(self.cache.put, key, articles)
+            return articles
+        
+        articles, shared = await self.generations.do(key, generate)
+        return articles, CacheOutcome.COLLAPSED if shared else CacheOutcome.MISS
+    
+    async def _cache_call(self, method, *args):
+        """Call a cache method, off the loop if it may touch the disk tier"""
+        if self.cache.directory:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+    
     async def stream_future_news(
         self,
         news_items: List[NewsItem],
         time_frame: TimeFrame = TimeFrame.WEEK,
         style: NewsStyle = NewsStyle.NEUTRAL,
         model: Optional[str] = None,
-    ) -> Generator[str, Any, None]:
-        """Stream future news generation"""
+    ) -> AsyncIterator[str]:
+        """Stream future news generation token by token
+        
+        Concurrent identical requests share one upstream generation; a late
+        joiner first receives the tokens streamed so far. The generation is
+        aborted once every subscriber has closed its iterator.
+        """
         model_name = model or self.default_model
         prompt = self._create_prompt(news_items, time_frame, style)
+        tokens = self.streams.subscribe(
+            generation_key(model_name, prompt),
+            lambda: self._stream_completion(model_name, prompt),
+        )
+        try:
+            async for token in tokens:
+                yield token
+        finally:
+            await tokens.aclose()
+    
+    async def _stream_completion(
+        self, model_name: str, prompt: str
+    ) -> AsyncIterator[str]:
+        """Tokens of one streamed Ollama completion
         
-        async with httpx.AsyncClient(timeout=None) as client:
-            with client.stream(
+        Ollama streams one JSON object per line; lines are reassembled from
+        the raw chunks before parsing. Closing the iterator early closes the
+        upstream response, which aborts the generation.
+        """
+        async with self._track():
+            async with self.client.stream(
                 "POST",
-                f"{self.base_url}/api/generate",
+                "/api/generate",
                 json={
                     "model": model_name,
                     "prompt": prompt,
@@ -204,17 +342,52 @@ Make sure to only output valid JSON that can be parsed. The articles should feel
                     }
                 }
             ) as response:
-                async for chunk in response.aiter_text():
+                if response.status_code != 200:
+                    await response.aread()
+                    logger.error(f"Error from Ollama API: {response.text}")
+                    raise Exception(f"Failed to generate news: {response.status_code}")
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
                     try:
-                        if chunk.strip():
-                            data = json.loads(chunk)
-                            if "response" in data:
-                                yield data["response"]
+                        data = json.loads(line)
                     except json.JSONDecodeError:
-                        # Skip malformed chunks
+                        logger.warning(
+                            f"Skipping malformed Ollama stream line: {line[:200]}"
+                        )
                         continue
+                    if "error" in data:
+                        raise Exception(f"Ollama stream failed: {data['error']}")
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        return
+    
+    async def stream_future_articles(
+        self,
+        news_items: List[NewsItem],
+        time_frame: TimeFrame = TimeFrame.WEEK,
+        style: NewsStyle = NewsStyle.NEUTRAL,
+        model: Optional[str] = None,
+    ) -> AsyncIterator[GeneratedNewsItem]:
+        """Stream generated articles, each as soon as its JSON object closes"""
+        parser = ArticleStreamParser()
+        tokens = self.stream_future_news(news_items, time_frame, style, model)
+        try:
+            async for token in tokens:
+                for article in parser.feed(token):
+                    yield article
+        finally:
+            # Closing early must reach the upstream request
+            await tokens.aclose()
 
 
 # Dependency
-def get_llm_service() -> LLMService:
-    return LLMService()
+def get_llm_service(request: Request) -> LLMService:
+    """Return the process-wide LLMService owned by the application lifespan"""
+    llm_service = getattr(request.app.state, "llm_service", None)
+    if llm_service is None:
+        # Lifespan did not run (e.g. a bare TestClient); create it once lazily
+        llm_service = LLMService()
+        request.app.state.llm_service = llm_service
+    return llm_service
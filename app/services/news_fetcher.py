@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and transient upstream failures
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class NewsFetchError(Exception):
+    """Raised when a NewsAPI request fails after all retries"""
+
+
+class NewsFetcher:
+    """Async NewsAPI client issuing top-headline requests concurrently"""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.api_key = api_key or settings.NEWSAPI_API_KEY
+        self.base_url = base_url or settings.NEWSAPI_BASE_URL
+        self.max_concurrency = settings.NEWS_FETCH_CONCURRENCY
+        self.retries = settings.NEWS_FETCH_RETRIES
+        self.retry_backoff = settings.NEWS_FETCH_RETRY_BACKOFF_SECONDS
+        self.client = client or httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"X-Api-Key": self.api_key},
+            timeout=httpx.Timeout(settings.NEWS_FETCH_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+
+    async def get_top_headlines(self, **params: Any) -> Dict[str, Any]:
+        """Fetch one top-headlines page, retrying transient failures"""
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.get("/top-headlines", params=params)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                    return response.json()
+                error: Exception = NewsFetchError(
+                    f"NewsAPI returned {response.status_code} for {params}"
+                )
+            except httpx.TransportError as e:
+                error = e
+            except httpx.HTTPStatusError as e:
+                raise NewsFetchError(
+                    f"NewsAPI returned {e.response.status_code} for {params}"
+                ) from e
+
+            if attempt >= self.retries:
+                raise NewsFetchError(f"Giving up on {params}: {error}") from error
+            attempt += 1
+            delay = self.retry_backoff * 2 ** (attempt - 1)
+            logger.warning(f"Retrying NewsAPI request {params} in {delay}s: {error}")
+            await asyncio.sleep(delay)
+
+    async def fetch_all(
+        self,
+        sources: List[str],
+        categories: List[str],
+        language: str = "en",
+    ) -> List[Dict[str, Any]]:
+        """Fetch headlines for every source and category concurrently
+
+        Failed requests are logged and skipped, so one bad source does not
+        abort the whole refresh.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await self.get_top_headlines(**params)
+                except Exception as e:
+                    logger.error(f"Error fetching top headlines for {params}: {e}")
+                    return None
+
+        requests = [{"sources": source, "language": language} for source in sources]
+        requests += [
+            {"category": category, "language": language} for category in categories
+        ]
+        responses = await asyncio.gather(*(fetch(params) for params in requests))
+        return [response for response in responses if response is not None]
+
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        await self.client.aclose()
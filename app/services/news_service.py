@@ -1,54 +1,178 @@
-import json
+import asyncio
+import hashlib
 import logging
 import os
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Collection, Iterable, List, Optional, Dict, Any, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import httpx
-from fastapi import Depends
-from newsapi import NewsApiClient
+from fastapi import Depends, Request
 
 from app.config import settings
-from app.models.news import NewsItem
+from app.models.news import ArchivePartition, CacheStats, NewsFacets, NewsItem
+from app.services.archive import NewsArchive
+from app.services.classifier import CategoryClassifier
+from app.services.columnar import NewsColumns
+from app.services.compression import PLAIN_CODEC, ContentCodec
+from app.services.dedup import NearDuplicateDetector
+from app.services.news_fetcher import NewsFetcher
+from app.services.news_store import (
+    MergeResult,
+    NewsStore,
+    decode_cursor,
+    encode_cursor,
+)
+from app.services.persistence import WriteBatch, WriteBehindPersister, write_batch
+from app.services.records import AnyNewsItem, Article, materialize, project
+from app.services.response_cache import ResponseCache
+from app.services.search import SearchIndex
+from app.services.storage import get_storage
 
 logger = logging.getLogger(__name__)
 
+# Number of bodies needed before a compression dictionary is trained, and
+# the most that are sampled for it
+CODEC_MIN_SAMPLES = 50
+CODEC_TRAINING_SAMPLES = 2000
+
+# Store versions kept alive for cursors issued against them
+RETAINED_VERSIONS = 4
+
+# Query parameters that vary between shares of the same article
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "ocid", "cmpid")
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of an article URL for identity purposes"""
+    parts = urlsplit(url.strip())
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query)
+            if not key.lower().startswith(TRACKING_PARAMS)
+        )
+    )
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/"),
+            query,
+            "",
+        )
+    )
+
+
+def make_article_id(url: str, title: str) -> str:
+    """Deterministic 16-hex-digit id from the normalized URL and title
+
+    Unlike the built-in hash() this is stable across processes and restarts.
+    """
+    normalized_title = " ".join(title.casefold().split())
+    key = f"{normalize_url(url)}\n{normalized_title}".encode("utf-8")
+    return hashlib.blake2b(key, digest_size=8).hexdigest()
+
 
 class NewsService:
     def __init__(self):
         self.api_key = settings.NEWSAPI_API_KEY
-        self.newsapi = NewsApiClient(api_key=self.api_key)
-        self.news_cache: List[NewsItem] = []
+        self.fetcher = NewsFetcher(api_key=self.api_key)
+        self.store = NewsStore()
+        # Recently published store versions, which cursors may pin
+        self._versions: "OrderedDict[int, NewsStore]" = OrderedDict()
+        self._refresh_lock = asyncio.Lock()
+        # One search index build at a time
+        self._search_lock = asyncio.Lock()
+        # Encoded responses per store version, dropped on every publish
+        self.response_cache = ResponseCache(settings.NEWS_RESPONSE_CACHE_SIZE)
         self.categories = settings.NEWS_CATEGORIES.split(",")
         self.sources = settings.NEWS_SOURCES.split(",")
-        
-        # Create data directory if it doesn't exist
-        os.makedirs(os.path.dirname(settings.NEWS_STORAGE_FILE), exist_ok=True)
+        self.classifier = CategoryClassifier(
+            self.categories, settings.NEWS_CATEGORY_SYNONYMS
+        )
+        self.storage = get_storage()
+        self.persister = WriteBehindPersister(
+            self._write_batch,
+            # Backends without delta support rewrite the whole cache
+            snapshot=None if self.storage.supports_delta else lambda: list(self.store),
+            debounce_seconds=settings.NEWS_PERSIST_DEBOUNCE_SECONDS,
+        )
+        # True when storage holds older items than those kept in memory
+        self.history_truncated = False
+        # Delta applied by the most recent refresh
+        self.last_merge = MergeResult()
+        # Items evicted for age and trimmed for memory budgets since startup
+        self.evicted_total = 0
+        self.trimmed_total = 0
+        self.detector: Optional[NearDuplicateDetector] = None
+        if settings.NEWS_DEDUP_ENABLED:
+            self.detector = NearDuplicateDetector(settings.NEWS_DEDUP_THRESHOLD)
+        # Clusters are rebuilt on the first refresh rather than at startup
+        self._detector_stale = False
+        # Full-text index, built on the first search and then kept in sync
+        self.search_index: Optional[SearchIndex] = None
+        # Columnar metadata for vectorized filters, rebuilt after changes
+        self._columns: Optional[NewsColumns] = None
+        # Compresses article bodies; trained once enough bodies were seen
+        self.codec: ContentCodec = PLAIN_CODEC
+        # Every ingested article, kept beyond the cache's retention window
+        self.archive: Optional[NewsArchive] = None
+        if settings.NEWS_ARCHIVE_DIR:
+            try:
+                self.archive = NewsArchive(
+                    settings.NEWS_ARCHIVE_DIR,
+                    grace=timedelta(hours=settings.NEWS_ARCHIVE_SEAL_GRACE_HOURS),
+                    fsync=settings.NEWS_STORAGE_FSYNC,
+                )
+            except Exception as e:
+                logger.error(f"Error opening news archive, archiving disabled: {e}")
         
         # Load cached news if available
         self._load_cache()
     
-    async def fetch_news(self) -> List[NewsItem]:
+    @property
+    def news_cache(self) -> List[NewsItem]:
+        """All cached news items, newest first"""
+        return [materialize(item) for item in self.store]
+    
+    @news_cache.setter
+    def news_cache(self, items: List[AnyNewsItem]):
+        # Pydantic models are only kept at the API boundary; lazily loaded
+        # snapshot items stay lazy until a response needs them
+        items = [
+            Article.from_item(item, self.codec) if isinstance(item, NewsItem) else item
+            for item in items
+        ]
+        # Indexes are built once per replacement, never per query
+        self._publish(NewsStore(items, version=self.store.version + 1))
+        self._detector_stale = self.detector is not None
+        self.search_index = None
+        self._columns = None
+    
+    @property
+    def columns(self) -> NewsColumns:
+        """Columnar view of the cache metadata, built on demand"""
+        if self._columns is None:
+            self._columns = NewsColumns.from_items(self.store)
+        return self._columns
+    
+    async def fetch_news(self) -> List[Article]:
         """Fetch news from NewsAPI and update cache"""
         logger.info("Fetching news from NewsAPI...")
         
         news_items = []
         
-        # Fetch by top headlines from sources
-        for source in self.sources:
-            try:
-                top_headlines = self.newsapi.get_top_headlines(sources=source, language='en')
-                news_items.extend(self._parse_news_items(top_headlines))
-            except Exception as e:
-                logger.error(f"Error fetching top headlines for source {source}: {e}")
-        
-        # Fetch by category
-        for category in self.categories:
-            try:
-                category_news = self.newsapi.get_top_headlines(category=category, language='en')
-                news_items.extend(self._parse_news_items(category_news))
-            except Exception as e:
-                logger.error(f"Error fetching news for category {category}: {e}")
+        # Fetch top headlines by source and by category concurrently
+        responses = await self.fetcher.fetch_all(self.sources, self.categories)
+        self._train_codec(
+            article
+            for response in responses
+            for article in response.get("articles", [])
+        )
+        for response in responses:
+            news_items.extend(self._parse_news_items(response))
         
         # Deduplicate by title
         unique_news = {}
@@ -56,22 +180,160 @@ class NewsService:
             if item.title not in unique_news:
                 unique_news[item.title] = item
         
-        self.news_cache = list(unique_news.values())
-        logger.info(f"Fetched {len(self.news_cache)} unique news items")
+        fetched = list(unique_news.values())
+        
+        # One refresh at a time, so no two merges start from the same version
+        async with self._refresh_lock:
+            return await self._apply_refresh(fetched)
+    
+    async def _apply_refresh(self, fetched: List[Article]) -> List[Article]:
+        """Merge fetched items into a new store version and publish it"""
+        # Deduplicate, copy and merge off the loop, keeping history within
+        # retention; readers keep using the current version meanwhile
+        evict_before = self._retention_cutoff()
+        current = self.store
+        detector = self.detector
+        rebuild_detector = self._detector_stale
+        # Columns are rebuilt with the merge when they are saved or in use;
+        # otherwise they are built on demand
+        build_columns = bool(settings.NEWS_COLUMNS_FILE) or self._columns is not None
+        
+        def merge():
+            batch = fetched
+            # Fold syndicated near-duplicates into one canonical article.
+            # Refreshes run one at a time, so only this worker touches the
+            # detector while it runs
+            if detector:
+                if rebuild_detector:
+                    detector.rebuild(current)
+                # Canonical articles are looked up as stored, so re-emitted
+                # ones stay compact records instead of materialized models
+                batch = detector.deduplicate(batch, current.record)
+            next_store = current.copy()
+            delta = next_store.merge(
+                batch,
+                evict_before=evict_before,
+                max_items=settings.NEWS_MAX_ITEMS or None,
+                max_bytes=settings.NEWS_MAX_BYTES or None,
+            )
+            if detector:
+                detector.forget(item.id for item in delta.removed)
+            columns = None
+            if delta.changed and build_columns:
+                columns = NewsColumns.from_items(next_store)
+            return batch, next_store, delta, columns
+        
+        fetched, next_store, delta, columns = await asyncio.to_thread(merge)
+        if rebuild_detector:
+            self._detector_stale = False
+        self.last_merge = delta
+        self.evicted_total += len(delta.evicted)
+        self.trimmed_total += len(delta.trimmed)
+        logger.info(
+            f"Fetched {len(fetched)} unique news items: "
+            f"{len(delta.added)} added, "
+            f"{len(delta.updated)} updated, "
+            f"{len(delta.evicted)} evicted, "
+            f"{len(delta.trimmed)} trimmed"
+        )
+        if delta.changed:
+            # Publishing and updating the derived indexes happen without an
+            # await in between, so no request sees one without the other
+            self._publish(next_store)
+            self._columns = columns
+            if self.search_index is not None:
+                self.search_index.apply(delta)
+        if self.archive is not None and delta.upserts:
+            await self._append_to_archive(delta.upserts)
         
-        # Save to cache file
-        self._save_cache()
+        # Persist only what changed
+        self._save_cache(
+            delta,
+            evict_before=evict_before,
+            keep=[item.id for item in fetched],
+            columns=columns,
+        )
         
-        return self.news_cache
+        return fetched
+    
+    def _publish(self, store: NewsStore):
+        """Make `store` the current version, retaining a few older ones
+        
+        Published stores are never modified again, so a request keeps a
+        consistent view of whichever version it started reading.
+        """
+        self.store = store
+        self.response_cache.clear()
+        self._versions[store.version] = store
+        while len(self._versions) > RETAINED_VERSIONS:
+            self._versions.popitem(last=False)
+    
+    def snapshot(self, cursor: Optional[str] = None) -> NewsStore:
+        """The store version a cursor was issued for, else the current one"""
+        if cursor is not None:
+            version, _ = decode_cursor(cursor)
+            store = self._versions.get(version)
+            if store is not None:
+                return store
+        return self.store
     
-    def _parse_news_items(self, api_response: Dict[str, Any]) -> List[NewsItem]:
-        """Parse NewsAPI response into NewsItem objects"""
+    def _train_codec(self, articles: Iterable[Any]):
+        """Train the body compression dictionary once enough bodies are known
+        
+        Accepts NewsAPI article dicts or items. Items cached before training
+        keep the codec they were compressed with.
+        """
+        if self.codec.trained:
+            return
+        bodies = []
+        for article in articles:
+            if isinstance(article, dict):
+                texts = (article.get("description"), article.get("content"))
+            else:
+                texts = (article.description, article.content)
+            bodies.extend(text for text in texts if isinstance(text, str) and text)
+            if len(bodies) >= CODEC_TRAINING_SAMPLES:
+                break
+        if len(bodies) >= CODEC_MIN_SAMPLES:
+            self.codec = ContentCodec.train(bodies)
+            logger.info(f"Trained content dictionary on {len(bodies)} bodies")
+    
+    async def _append_to_archive(self, items: List[AnyNewsItem]):
+        """Append new and changed items to the archive and seal closed days"""
+        def write():
+            self.archive.add(items)
+            self.archive.seal()
+
+        try:
+            await asyncio.to_thread(write)
+        except Exception as e:
+            logger.error(f"Error archiving news: {e}")
+        finally:
+            # Archive pages cached since the publish predate these items
+            self.response_cache.clear()
+    
+    def _retention_cutoff(self) -> Optional[datetime]:
+        """Publication time before which cached items are evicted"""
+        if settings.NEWS_HISTORY_DAYS <= 0:
+            return None
+        return datetime.now(timezone.utc) - timedelta(days=settings.NEWS_HISTORY_DAYS)
+    
+    def _parse_news_items(self, api_response: Dict[str, Any]) -> List[Article]:
+        """Parse NewsAPI response into compact Article records"""
         news_items = []
+        articles = api_response.get("articles", [])
+        
+        # Classify the whole batch against the keyword table
+        categories = self.classifier.classify_batch(
+            [(a.get("url") or "", a.get("title") or "") for a in articles]
+        )
         
-        for article in api_response.get("articles", []):
+        for article, category in zip(articles, categories):
             try:
-                # Generate a unique ID
-                article_id = f"{article.get('source', {}).get('id', 'unknown')}-{hash(article.get('title', ''))}"
+                # Generate a stable, content-derived ID
+                article_id = make_article_id(
+                    article.get("url") or "", article.get("title") or ""
+                )
                 
                 # Parse the published date
                 published_str = article.get("publishedAt")
@@ -80,25 +342,24 @@ class NewsService:
                 else:
                     published_at = datetime.now()
                 
-                # Extract category from url or default to unknown
-                category = None
-                for cat in self.categories:
-                    if cat.lower() in article.get("url", "").lower() or cat.lower() in article.get("title", "").lower():
-                        category = cat
-                        break
+                title = article.get("title", "")
+                url = article.get("url", "")
+                if not isinstance(title, str) or not isinstance(url, str):
+                    raise ValueError(f"Missing title or url for {article_id}")
                 
                 news_items.append(
-                    NewsItem(
+                    Article(
                         id=article_id,
-                        title=article.get("title", ""),
+                        title=title,
                         description=article.get("description"),
                         content=article.get("content"),
-                        url=article.get("url", ""),
+                        url=url,
                         image_url=article.get("urlToImage"),
                         source=article.get("source", {}).get("name", "Unknown"),
                         category=category,
                         author=article.get("author"),
                         published_at=published_at,
+                        codec=self.codec,
                     )
                 )
             except Exception as e:
@@ -112,71 +373,344 @@ class NewsService:
         source: Optional[str] = None,
         limit: int = 10,
         skip: int = 0,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
     ) -> List[NewsItem]:
-        """Get news from cache with optional filtering"""
+        """Get news from cache with optional filtering
+        
+        A `cursor` from `next_cursor` continues a listing where its previous
+        page ended, even if a refresh landed in between.
+        """
+        records = await self._get_records(
+            category, source, limit, skip, since, until, cursor
+        )
+        return [self.store.model(item) for item in records]
+    
+    async def get_news_fields(
+        self,
+        fields: Sequence[str],
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: int = 10,
+        skip: int = 0,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Like get_news, but only the given fields of each item
+        
+        Fields that are not requested are never read, so compressed bodies
+        stay compressed for list views.
+        """
+        records = await self._get_records(
+            category, source, limit, skip, since, until, cursor
+        )
+        return [project(item, fields) for item in records]
+    
+    async def _get_records(
+        self,
+        category: Optional[str],
+        source: Optional[str],
+        limit: int,
+        skip: int,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        cursor: Optional[str] = None,
+    ) -> List[AnyNewsItem]:
+        """Cached items matching the filters, as stored"""
         # If cache is empty, fetch news
-        if not self.news_cache:
+        if not len(self.store):
             await self.fetch_news()
         
-        filtered_news = self.news_cache
+        if cursor is not None:
+            if since is not None or until is not None:
+                raise ValueError("Cursors cannot be combined with a time range")
+            # Keyset seek into the version the cursor pinned, if still kept
+            _, after = decode_cursor(cursor)
+            news_items = self.snapshot(cursor).query_records(
+                category=category, source=source, limit=limit, skip=skip, after=after
+            )
+            # Past the in-memory window the same seek continues in storage
+            if len(news_items) < limit and self.history_truncated:
+                news_items = self.storage.query(
+                    category=category,
+                    source=source,
+                    limit=limit,
+                    skip=skip,
+                    after=after,
+                )
+            return news_items
+        
+        if self._needs_archive(since, until):
+            # Only the day partitions overlapping the window are read, in a
+            # worker thread since segments and open day logs are on disk
+            return await asyncio.to_thread(
+                self.archive.query,
+                since=since,
+                until=until,
+                category=category,
+                source=source,
+                limit=limit,
+                skip=skip,
+            )
         
-        # Apply filters
-        if category:
-            filtered_news = [item for item in filtered_news if item.category == category]
+        if since is not None or until is not None:
+            # Time windows are vectorized masks over the columnar metadata
+            ids = self.columns.select(
+                category=category,
+                source=source,
+                since=since,
+                until=until,
+                limit=limit,
+                skip=skip,
+            )
+            return [self.store.record(item_id) for item_id in ids]
         
-        if source:
-            filtered_news = [item for item in filtered_news if item.source == source]
+        # Presorted secondary indexes make this a slice, not a scan
+        news_items = self.store.query_records(
+            category=category,
+            source=source,
+            limit=limit,
+            skip=skip,
+        )
         
-        # Sort by published date (newest first)
-        filtered_news.sort(key=lambda x: x.published_at, reverse=True)
+        # Pages beyond the in-memory window come straight from storage
+        if len(news_items) < limit and self.history_truncated:
+            news_items = self.storage.query(
+                category=category,
+                source=source,
+                limit=limit,
+                skip=skip,
+            )
         
-        # Apply pagination
-        return filtered_news[skip:skip + limit]
+        return news_items
+    
+    def next_cursor(
+        self, page: List[Any], limit: int, cursor: Optional[str] = None
+    ) -> Optional[str]:
+        """Cursor for the page after `page`, or None if it was the last one
+        
+        `page` holds items or projected dicts, as returned by get_news or
+        get_news_fields for `cursor`. Only pages of cached items can be
+        continued, and the next cursor pins the same store version.
+        Pages read from storage beyond the in-memory window continue too.
+        """
+        if not page or len(page) < limit:
+            return None
+        store = self.snapshot(cursor)
+        last = page[-1]
+        item_id = last["id"] if isinstance(last, dict) else last.id
+        item = store.record(item_id)
+        if item is None and self.history_truncated:
+            item = self.storage.get(item_id)
+        if item is None:
+            return None
+        return encode_cursor(store.version, item)
+    
+    def _needs_archive(
+        self, since: Optional[datetime], until: Optional[datetime]
+    ) -> bool:
+        """Whether a time window reaches back past the oldest cached item"""
+        if self.archive is None or (since is None and until is None):
+            return False
+        oldest = self.store.oldest()
+        if oldest is None or since is None:
+            return True
+        return since.timestamp() < oldest.published_at.timestamp()
+    
+    async def count_news(
+        self,
+        by: str,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """Number of cached items per source or category matching the filters"""
+        columns = self.columns
+        mask = columns.mask(category=category, source=source, since=since, until=until)
+        return columns.count_by(by, mask)
+    
+    async def search_news(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: int = 10,
+        skip: int = 0,
+    ) -> List[NewsItem]:
+        """Full-text search over the in-memory cache, best BM25 match first"""
+        if not len(self.store):
+            await self.fetch_news()
+        index = await self._get_search_index()
+
+        def where(item_id: str) -> bool:
+            return self.store.matches(item_id, category=category, source=source)
+
+        hits = index.search(
+            query, limit=skip + limit, where=where if category or source else None
+        )
+        return [self.store.get(item_id) for item_id, _ in hits[skip:]]
+    
+    async def _get_search_index(self) -> SearchIndex:
+        """The full-text index, built off the loop on first use
+        
+        Tokenizing every cached article takes a while, so it runs in a
+        worker thread. Refreshes only update an index that is already
+        published, so one built from a version superseded meanwhile is
+        discarded and built again from the current one.
+        """
+        async with self._search_lock:
+            while self.search_index is None:
+                store = self.store
+                index = await asyncio.to_thread(SearchIndex, store)
+                if self.store is store:
+                    self.search_index = index
+            return self.search_index
+    
+    async def sample_history(
+        self,
+        since: datetime,
+        until: Optional[datetime] = None,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[NewsItem]:
+        """Archived articles spread evenly over a time range, newest first"""
+        if self.archive is None:
+            return []
+        items = await asyncio.to_thread(
+            self.archive.sample,
+            since=since,
+            until=until,
+            category=category,
+            source=source,
+            limit=limit,
+        )
+        return [self.store.model(item) for item in items]
+    
+    async def get_archive_partitions(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[ArchivePartition]:
+        """Per-day archive summaries overlapping a time range, newest first"""
+        if self.archive is None:
+            return []
+        return await asyncio.to_thread(
+            self.archive.partitions, since=since, until=until
+        )
+    
+    async def get_news_item(self, item_id: str) -> Optional[NewsItem]:
+        """Get a single news item by id"""
+        item = self.store.get(item_id)
+        if item is None and self.history_truncated:
+            item = self.storage.get(item_id)
+        return item
+    
+    async def close(self):
+        """Flush pending writes and release network and storage resources"""
+        await self.fetcher.aclose()
+        await self.persister.close()
+        self.storage.close()
+    
+    async def get_stats(self) -> CacheStats:
+        """Current cache size, retention limits and eviction totals"""
+        max_age_days = settings.NEWS_HISTORY_DAYS
+        return CacheStats(
+            items=len(self.store),
+            resident_bytes=self.store.resident_bytes,
+            categories=self.store.category_counts(),
+            max_items=settings.NEWS_MAX_ITEMS or None,
+            max_bytes=settings.NEWS_MAX_BYTES or None,
+            max_age_days=max_age_days if max_age_days > 0 else None,
+            evicted_expired=self.evicted_total,
+            evicted_trimmed=self.trimmed_total,
+        )
     
     async def get_categories(self) -> List[str]:
         """Get available news categories"""
         return self.categories
     
     async def get_sources(self) -> List[str]:
-        """Get available news sources"""
-        return [item.source for item in self.news_cache]
+        """Get the distinct sources of cached news"""
+        return sorted(self.store.sources())
     
-    def _save_cache(self):
-        """Save news cache to file"""
-        try:
-            with open(settings.NEWS_STORAGE_FILE, "w") as f:
-                json.dump(
-                    [item.model_dump() for item in self.news_cache],
-                    f,
-                    default=str,
-                )
-        except Exception as e:
-            logger.error(f"Error saving news cache: {e}")
+    async def get_facets(self) -> NewsFacets:
+        """Get article counts and newest publication time per source and category"""
+        return self.store.facets()
+    
+    def _save_cache(
+        self,
+        delta: MergeResult,
+        evict_before: Optional[datetime] = None,
+        keep: Collection[str] = (),
+        columns: Optional[NewsColumns] = None,
+    ):
+        """Queue a refresh delta for debounced write-behind persistence"""
+        self.persister.submit(
+            delta, evict_before=evict_before, keep=keep, columns=columns
+        )
+    
+    def _write_batch(self, batch: WriteBatch):
+        """Write a coalesced batch to storage (runs in a worker thread)"""
+        write_batch(self.storage, batch)
+        if batch.columns is not None and settings.NEWS_COLUMNS_FILE:
+            batch.columns.save(
+                settings.NEWS_COLUMNS_FILE, fsync=settings.NEWS_STORAGE_FSYNC
+            )
+        if self.storage.supports_query:
+            self.history_truncated = self.storage.count() > len(self.store)
+        # Storage fallback pages cached since the publish predate this batch
+        self.response_cache.clear()
     
     def _load_cache(self):
-        """Load news cache from file"""
+        """Load news cache from the storage backend"""
         try:
-            if os.path.exists(settings.NEWS_STORAGE_FILE):
-                with open(settings.NEWS_STORAGE_FILE, "r") as f:
-                    data = json.load(f)
-                    
-                    # Convert string dates back to datetime
-                    for item in data:
-                        if isinstance(item["published_at"], str):
-                            try:
-                                item["published_at"] = datetime.fromisoformat(
-                                    item["published_at"].replace("Z", "+00:00")
-                                )
-                            except ValueError:
-                                item["published_at"] = datetime.now()
-                    
-                    self.news_cache = [NewsItem(**item) for item in data]
-                    logger.info(f"Loaded {len(self.news_cache)} news items from cache")
+            limit = None
+            if self.storage.supports_query:
+                # Deep history stays on disk and is queried on demand
+                limit = settings.NEWS_STORAGE_PRELOAD_ITEMS
+            items = self.storage.load(limit=limit)
+            self._train_codec(item for item in items if isinstance(item, NewsItem))
+            self.news_cache = items
+            # Budgets may have shrunk since the cache was written
+            self.trimmed_total += len(
+                self.store.trim(
+                    settings.NEWS_MAX_ITEMS or None, settings.NEWS_MAX_BYTES or None
+                )
+            )
+            self.history_truncated = limit is not None and len(self.store) >= limit
+            self._load_columns()
+            if self.archive is not None:
+                # Items cached before the archive existed are backfilled once
+                self.archive.backfill(self.store)
+                self.archive.seal()
+            logger.info(f"Loaded {len(self.store)} news items from cache")
         except Exception as e:
             logger.error(f"Error loading news cache: {e}")
-            self.news_cache = []
+            self.store = NewsStore()
+
+
+    def _load_columns(self):
+        """Map the persisted columns file if it matches the loaded cache"""
+        path = settings.NEWS_COLUMNS_FILE
+        if not path or not os.path.exists(path):
+            return
+        try:
+            columns = NewsColumns.open(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable columns file {path}: {e}")
+            return
+        if columns.matches(list(self.store)):
+            self._columns = columns
 
 
 # Dependency
-def get_news_service() -> NewsService:
-    return NewsService()
+def get_news_service(request: Request) -> NewsService:
+    """Return the process-wide NewsService owned by the application lifespan"""
+    news_service = getattr(request.app.state, "news_service", None)
+    if news_service is None:
+        # Lifespan did not run (e.g. a bare TestClient); create it once lazily
+        news_service = NewsService()
+        request.app.state.news_service = news_service
+    return news_service
@@ -0,0 +1,378 @@
+import base64
+import json
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.models.news import Facet, NewsFacets, NewsItem
+from app.services.records import AnyNewsItem, estimated_size, materialize
+
+IndexKey = Tuple[Optional[str], Optional[str]]
+
+# API models kept for recently returned items, so hot pages are converted once
+MODEL_CACHE_SIZE = 1024
+# Category bucket of items without a category; never a valid query filter
+UNCATEGORIZED = ""
+
+
+def sort_key(item: NewsItem) -> Tuple[float, str]:
+    """Newest first, ties broken by id so the order is total and stable"""
+    return (-item.published_at.timestamp(), item.id)
+
+
+def _facet_rank(facet: Facet) -> Tuple[int, str]:
+    return (-facet.count, facet.value)
+
+
+def encode_cursor(version: int, item: AnyNewsItem) -> str:
+    """Opaque cursor resuming a listing right after `item`"""
+    timestamp, item_id = sort_key(item)
+    raw = json.dumps([version, timestamp, item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, Tuple[float, str]]:
+    """Store version and sort key encoded by `encode_cursor`
+
+    Raises ValueError for anything that is not such a cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        version, timestamp, item_id = json.loads(raw)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if (
+        not isinstance(version, int)
+        or not isinstance(timestamp, (int, float))
+        or not isinstance(item_id, str)
+    ):
+        raise ValueError("Invalid cursor")
+    return version, (float(timestamp), item_id)
+
+
+@dataclass
+class MergeResult:
+    """Delta produced by merging a refresh into the store"""
+
+    added: List[NewsItem] = field(default_factory=list)
+    updated: List[NewsItem] = field(default_factory=list)
+    # Expired past the retention age; removed from storage as well
+    evicted: List[NewsItem] = field(default_factory=list)
+    # Dropped from memory to stay within the item and byte budgets
+    trimmed: List[NewsItem] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+    @property
+    def removed(self) -> List[NewsItem]:
+        return self.evicted + self.trimmed
+
+    @property
+    def upserts(self) -> List[NewsItem]:
+        return self.added + self.updated
+
+
+class NewsStore:
+    """In-memory news index presorted by publication date
+
+    Items are sorted once when the store is built. Every (category, source)
+    filter combination gets its own presorted list, so a filtered and
+    paginated read is a plain slice costing O(limit) regardless of how many
+    items are cached.
+    """
+
+    def __init__(self, items: Iterable[AnyNewsItem] = (), version: int = 0):
+        unique: Dict[str, AnyNewsItem] = {}
+        for item in items:
+            unique[item.id] = item
+
+        self._by_id = unique
+        self._ordered: List[NewsItem] = sorted(unique.values(), key=sort_key)
+        self._indexes: Dict[IndexKey, List[NewsItem]] = {(None, None): self._ordered}
+        # id -> (stored item, its model); the item is kept to detect stale hits
+        self._models: "OrderedDict[str, Tuple[AnyNewsItem, NewsItem]]" = OrderedDict()
+        # The only state readers change, so copies can be taken from any thread
+        self._models_lock = threading.Lock()
+        # Bumped on every change, so cursors can tell what they paged through
+        self.version = version
+        self.resident_bytes = sum(estimated_size(item) for item in self._ordered)
+        # Built from the indexes on first use, dropped on every change
+        self._facets: Optional[NewsFacets] = None
+        for item in self._ordered:
+            for key in self._index_keys(item):
+                self._indexes.setdefault(key, []).append(item)
+
+    @staticmethod
+    def _index_keys(item: NewsItem) -> List[IndexKey]:
+        """Secondary index keys an item belongs to"""
+        if not item.category:
+            return [(UNCATEGORIZED, None), (None, item.source)]
+        return [
+            (item.category, None),
+            (None, item.source),
+            (item.category, item.source),
+        ]
+
+    def copy(self) -> "NewsStore":
+        """Independent store with the same contents and version
+
+        Only the indexes are copied; items are immutable and shared. Changes
+        made to the copy, e.g. by a refresh, never show in this store. Safe
+        to call from a worker thread while the loop keeps reading this store.
+        """
+        store = NewsStore.__new__(NewsStore)
+        store._by_id = dict(self._by_id)
+        store._indexes = {key: list(index) for key, index in self._indexes.items()}
+        store._ordered = store._indexes[(None, None)]
+        with self._models_lock:
+            store._models = OrderedDict(self._models)
+        store._models_lock = threading.Lock()
+        store.version = self.version
+        store.resident_bytes = self.resident_bytes
+        store._facets = self._facets
+        return store
+
+    def __len__(self) -> int:
+        return len(self._ordered)
+
+    def __iter__(self) -> Iterator[AnyNewsItem]:
+        """Iterate stored items as held, without decoding lazy ones"""
+        return iter(self._ordered)
+
+    def get(self, item_id: str) -> Optional[NewsItem]:
+        """Look up a single item by id"""
+        item = self._by_id.get(item_id)
+        return None if item is None else self.model(item)
+
+    def oldest(self) -> Optional[AnyNewsItem]:
+        """The least recently published item, if any"""
+        return self._ordered[-1] if self._ordered else None
+
+    def record(self, item_id: str) -> Optional[AnyNewsItem]:
+        """Look up a single item as stored, without converting it"""
+        return self._by_id.get(item_id)
+
+    def matches(
+        self,
+        item_id: str,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> bool:
+        """Whether a stored item passes the filters, without decoding it"""
+        item = self._by_id.get(item_id)
+        if item is None:
+            return False
+        return (not category or item.category == category) and (
+            not source or item.source == source
+        )
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: int = 10,
+        skip: int = 0,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[NewsItem]:
+        """Return newest-first items matching the filters"""
+        # Lazily loaded items are only decoded once a page actually needs them
+        return [
+            self.model(item)
+            for item in self.query_records(category, source, limit, skip, after)
+        ]
+
+    def query_records(
+        self,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: int = 10,
+        skip: int = 0,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[AnyNewsItem]:
+        """Like `query`, but returns the items as stored
+
+        `after` is a sort key from a cursor; the page then starts right after
+        it, found by binary search instead of counting from the start.
+        """
+        index = self._indexes.get((category or None, source or None), [])
+        if after is not None:
+            skip += bisect_right(index, after, key=sort_key)
+        return index[skip : skip + limit]
+
+    def model(self, item: AnyNewsItem) -> NewsItem:
+        """API model for a stored item, converted at most once while it is hot"""
+        if isinstance(item, NewsItem):
+            return item
+        with self._models_lock:
+            cached = self._models.get(item.id)
+            if cached is not None and cached[0] is item:
+                self._models.move_to_end(item.id)
+                return cached[1]
+        model = materialize(item)
+        with self._models_lock:
+            self._models[item.id] = (item, model)
+            self._models.move_to_end(item.id)
+            if len(self._models) > MODEL_CACHE_SIZE:
+                self._models.popitem(last=False)
+        return model
+
+    def _insert(self, item: NewsItem):
+        self.version += 1
+        self._facets = None
+        self._by_id[item.id] = item
+        self.resident_bytes += estimated_size(item)
+        insort(self._ordered, item, key=sort_key)
+        for key in self._index_keys(item):
+            insort(self._indexes.setdefault(key, []), item, key=sort_key)
+
+    def _remove(self, item: NewsItem):
+        self.version += 1
+        self._facets = None
+        del self._by_id[item.id]
+        with self._models_lock:
+            self._models.pop(item.id, None)
+        self.resident_bytes -= estimated_size(item)
+        item_key = sort_key(item)
+        self._ordered.pop(bisect_left(self._ordered, item_key, key=sort_key))
+        for key in self._index_keys(item):
+            index = self._indexes[key]
+            index.pop(bisect_left(index, item_key, key=sort_key))
+            if not index:
+                del self._indexes[key]
+
+    def merge(
+        self,
+        items: Iterable[NewsItem],
+        evict_before: Optional[datetime] = None,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> MergeResult:
+        """Merge a refresh into the store by article id
+
+        New ids are inserted and changed items replaced; everything else is
+        kept. Items published before `evict_before` are evicted, then the
+        store is trimmed to `max_items` / `max_bytes`. Items that are part
+        of this refresh are never evicted or trimmed.
+        """
+        result = MergeResult()
+        incoming: Dict[str, NewsItem] = {item.id: item for item in items}
+
+        for item in incoming.values():
+            existing = self._by_id.get(item.id)
+            if existing is None:
+                self._insert(item)
+                result.added.append(item)
+            elif existing != item:
+                self._remove(existing)
+                self._insert(item)
+                result.updated.append(item)
+
+        if evict_before is not None:
+            result.evicted = self.evict_before(evict_before, keep=incoming)
+        if max_items or max_bytes:
+            result.trimmed = self.trim(max_items, max_bytes, keep=incoming)
+        return result
+
+    def evict_before(
+        self, cutoff: datetime, keep: Collection[str] = ()
+    ) -> List[NewsItem]:
+        """Evict items published before `cutoff`, oldest first"""
+        cutoff_ts = cutoff.timestamp()
+        expired = []
+        # Items are sorted newest first, so expired ones sit at the tail
+        for item in reversed(self._ordered):
+            if item.published_at.timestamp() >= cutoff_ts:
+                break
+            if item.id not in keep:
+                expired.append(item)
+        for item in expired:
+            self._remove(item)
+        return expired
+
+    def trim(
+        self,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        keep: Collection[str] = (),
+    ) -> List[NewsItem]:
+        """Evict oldest items until the store fits the item and byte budgets
+
+        Each eviction takes the oldest item of the currently largest
+        category, so a busy category cannot push a quiet one out entirely.
+        """
+        trimmed = []
+        exhausted = set()  # Buckets holding nothing but `keep` items
+        while (max_items and len(self) > max_items) or (
+            max_bytes and self.resident_bytes > max_bytes
+        ):
+            victim = self._trim_candidate(keep, exhausted)
+            if victim is None:
+                break
+            self._remove(victim)
+            trimmed.append(victim)
+        return trimmed
+
+    def _trim_candidate(self, keep: Collection[str], exhausted: set):
+        """Oldest evictable item of the largest category bucket"""
+        best, best_rank = None, None
+        for (category, source), index in self._indexes.items():
+            if category is None or source is not None or category in exhausted:
+                continue
+            evictable = (item for item in reversed(index) if item.id not in keep)
+            oldest = next(evictable, None)
+            if oldest is None:
+                exhausted.add(category)
+                continue
+            rank = (len(index), -oldest.published_at.timestamp())
+            if best_rank is None or rank > best_rank:
+                best, best_rank = oldest, rank
+        return best
+
+    def category_counts(self) -> Dict[str, int]:
+        """Number of stored items per category"""
+        return {
+            key[0]: len(index)
+            for key, index in self._indexes.items()
+            if key[0] and key[1] is None
+        }
+
+    def categories(self) -> List[str]:
+        """Distinct categories present in the store"""
+        return [key[0] for key in self._indexes if key[0] and key[1] is None]
+
+    def sources(self) -> List[str]:
+        """Distinct sources present in the store"""
+        return [key[1] for key in self._indexes if key[1] and key[0] is None]
+
+    def facets(self) -> NewsFacets:
+        """Counts and newest publication time per source and per category
+
+        The per-value indexes are kept up to date by every merge and are
+        sorted newest first, so each facet is read off its index head in
+        O(1). The result is kept until the store next changes.
+        """
+        if self._facets is None:
+            sources, categories = [], []
+            for (category, source), index in self._indexes.items():
+                if category is None and source:
+                    facets = sources
+                    value = source
+                elif category and source is None:
+                    facets = categories
+                    value = category
+                else:
+                    continue
+                facets.append(
+                    Facet(value=value, count=len(index), newest=index[0].published_at)
+                )
+            self._facets = NewsFacets(
+                total=len(self._ordered),
+                sources=sorted(sources, key=_facet_rank),
+                categories=sorted(categories, key=_facet_rank),
+            )
+        return self._facets
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Collection, Dict, Iterable, List, Optional, Set
+
+from app.models.news import NewsItem
+from app.services.columnar import NewsColumns
+from app.services.news_store import MergeResult
+from app.services.storage import NewsStorage
+
+logger = logging.getLogger(__name__)
+
+# Failed writes are retried after the debounce delay, doubled per failure
+MAX_RETRY_DELAY_SECONDS = 300.0
+
+
+@dataclass
+class WriteBatch:
+    """Coalesced changes waiting to be written to storage"""
+
+    upserts: Dict[str, NewsItem] = field(default_factory=dict)
+    deletes: Set[str] = field(default_factory=set)
+    evict_before: Optional[datetime] = None
+    keep: Set[str] = field(default_factory=set)
+    # Full cache contents, only for backends that cannot persist a delta
+    snapshot: Optional[List[NewsItem]] = None
+    # Columns of the store version the latest changes produced
+    columns: Optional[NewsColumns] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.upserts or self.deletes or self.evict_before)
+
+    def add(
+        self,
+        upserts: Iterable[NewsItem] = (),
+        deletes: Iterable[str] = (),
+        evict_before: Optional[datetime] = None,
+        keep: Collection[str] = (),
+        columns: Optional[NewsColumns] = None,
+    ):
+        """Fold newer changes into the batch; the latest change per id wins"""
+        for item in upserts:
+            self.upserts[item.id] = item
+            self.deletes.discard(item.id)
+        for item_id in deletes:
+            self.upserts.pop(item_id, None)
+            self.deletes.add(item_id)
+        if evict_before is not None:
+            self.evict_before = evict_before
+            self.keep = set(keep)
+        if columns is not None:
+            self.columns = columns
+
+    def merge(self, older: "WriteBatch"):
+        """Re-queue an older batch that failed to write underneath this one"""
+        newer_upserts, newer_deletes = self.upserts, self.deletes
+        self.upserts = {**older.upserts, **newer_upserts}
+        self.deletes = (older.deletes - set(newer_upserts)) | newer_deletes
+        for item_id in newer_deletes:
+            self.upserts.pop(item_id, None)
+        if self.evict_before is None:
+            self.evict_before, self.keep = older.evict_before, older.keep
+        if self.columns is None:
+            self.columns = older.columns
+
+
+class WriteBehindPersister:
+    """Debounced write-behind queue in front of a storage backend
+
+    Changes submitted within `debounce_seconds` of each other are coalesced
+    into one batch, which is written in a worker thread so the event loop is
+    never blocked by serialization or disk I/O. A batch that fails to write
+    is requeued and retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[WriteBatch], None],
+        snapshot: Optional[Callable[[], List[NewsItem]]] = None,
+        debounce_seconds: float = 1.0,
+    ):
+        self._write = write
+        self._snapshot = snapshot
+        self.debounce_seconds = debounce_seconds
+        self._pending = WriteBatch()
+        self._timer: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        # Consecutive failed writes, which set the retry delay
+        self.failures = 0
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending)
+
+    def submit(
+        self,
+        delta: MergeResult,
+        evict_before: Optional[datetime] = None,
+        keep: Collection[str] = (),
+        columns: Optional[NewsColumns] = None,
+    ):
+        """Queue a refresh delta and schedule a debounced flush
+
+        `columns` are those of the store version the delta produced, to be
+        saved along with it.
+        """
+        if not delta.changed:
+            return
+        self._pending.add(
+            upserts=delta.upserts,
+            deletes=[item.id for item in delta.evicted],
+            evict_before=evict_before,
+            keep=keep,
+            columns=columns,
+        )
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self, delay: Optional[float] = None):
+        await asyncio.sleep(self.debounce_seconds if delay is None else delay)
+        # Shielded so that close() cancelling the timer never aborts a write
+        await asyncio.shield(self.flush())
+
+    async def flush(self):
+        """Write all pending changes now"""
+        async with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, WriteBatch()
+            if self._snapshot is not None:
+                # Captured on the loop so the worker sees a consistent view
+                batch.snapshot = self._snapshot()
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception as e:
+                self._pending.merge(batch)
+                self.failures += 1
+                delay = min(
+                    self.debounce_seconds * 2**self.failures, MAX_RETRY_DELAY_SECONDS
+                )
+                logger.error(
+                    f"Error persisting news cache, retrying in {delay:.0f}s: {e}"
+                )
+                # The timer may be the task running this very flush
+                if self._timer is not asyncio.current_task():
+                    self._cancel_timer()
+                self._timer = asyncio.get_running_loop().create_task(
+                    self._flush_later(delay)
+                )
+            else:
+                self.failures = 0
+
+    def _cancel_timer(self):
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+
+    async def close(self):
+        """Cancel the debounce timer and flush whatever is still pending"""
+        self._cancel_timer()
+        await self.flush()
+        # Storage is closed next, so a failed final write is not retried
+        self._cancel_timer()
+
+
+def write_batch(storage: NewsStorage, batch: WriteBatch):
+    """Apply a batch to a storage backend (runs in a worker thread)"""
+    if not storage.supports_delta:
+        if batch.snapshot is None:
+            raise ValueError(f"{type(storage).__name__} needs a full snapshot")
+        storage.save(batch.snapshot)
+        return
+    storage.apply_delta(batch.upserts.values(), batch.deletes)
+    if batch.evict_before is not None and storage.supports_query:
+        storage.delete_before(batch.evict_before, keep=batch.keep)
@@ -0,0 +1,146 @@
+import sys
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple, Union
+
+from app.models.news import NewsItem
+from app.services.compression import PLAIN_CODEC, ContentCodec
+
+if TYPE_CHECKING:
+    from app.services.snapshot import LazyNewsItem
+
+FIELDS = tuple(NewsItem.model_fields)
+TEXT_FIELDS = ("id", "title", "description", "content", "url", "image_url", "author")
+# Rough fixed cost of one cached record: the object, its datetime and tuple
+RECORD_OVERHEAD = 200
+# Bulky fields kept compressed in Article records
+COMPRESSED_FIELDS = ("description", "content")
+
+
+class Article:
+    """Compact in-memory article record used inside the service layer
+
+    A plain `__slots__` object with interned `source` and `category`
+    strings, so thousands of cached articles cost a fraction of the memory
+    of pydantic models. `description` and `content` are held compressed by
+    a ContentCodec and decompressed on access. It is converted to a
+    `NewsItem` only when a response actually returns it.
+    """
+
+    __slots__ = (
+        *(name for name in FIELDS if name not in COMPRESSED_FIELDS),
+        "_description",
+        "_content",
+        "_codec",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        url: str,
+        source: str,
+        published_at: datetime,
+        description: Optional[str] = None,
+        content: Optional[str] = None,
+        image_url: Optional[str] = None,
+        category: Optional[str] = None,
+        author: Optional[str] = None,
+        cluster_size: int = 1,
+        duplicate_ids: Tuple[str, ...] = (),
+        codec: ContentCodec = PLAIN_CODEC,
+    ):
+        self.id = id
+        self.title = title
+        self._codec = codec
+        self._description = codec.encode(description)
+        self._content = codec.encode(content)
+        self.url = url
+        self.image_url = image_url
+        # Few distinct values shared by many articles
+        self.source = sys.intern(source)
+        self.category = None if category is None else sys.intern(category)
+        self.author = author
+        self.published_at = published_at
+        self.cluster_size = cluster_size
+        self.duplicate_ids = tuple(duplicate_ids)
+
+    @property
+    def description(self) -> Optional[str]:
+        return self._codec.decode(self._description)
+
+    @property
+    def content(self) -> Optional[str]:
+        return self._codec.decode(self._content)
+
+    @classmethod
+    def from_item(
+        cls, item: "AnyNewsItem", codec: ContentCodec = PLAIN_CODEC
+    ) -> "Article":
+        """Compact copy of any cached item"""
+        if isinstance(item, Article):
+            return item
+        return cls(**{name: getattr(item, name) for name in FIELDS}, codec=codec)
+
+    def estimated_size(self) -> int:
+        """Approximate resident bytes, counting text but not shared strings"""
+        size = RECORD_OVERHEAD + len(self._description or "") + len(self._content or "")
+        for name in TEXT_FIELDS:
+            if name not in COMPRESSED_FIELDS:
+                size += len(getattr(self, name) or "")
+        return size
+
+    def values(self) -> tuple:
+        return tuple(getattr(self, name) for name in FIELDS)
+
+    def materialize(self) -> NewsItem:
+        """The API model for this article"""
+        # Validating from attributes runs in pydantic-core and is cheaper
+        # than model_construct, which assembles the model in Python
+        return NewsItem.model_validate(self, from_attributes=True)
+
+    def replace(self, **changes) -> "Article":
+        """Copy of this article with some fields changed"""
+        values = {name: getattr(self, name) for name in FIELDS}
+        values.update(changes)
+        return Article(**values, codec=self._codec)
+
+    def __eq__(self, other):
+        if not isinstance(other, (Article, NewsItem)) and not hasattr(
+            other, "materialize"
+        ):
+            return NotImplemented
+        return self.values() == tuple(getattr(other, name) for name in FIELDS)
+
+    def __repr__(self) -> str:
+        return f"Article(id={self.id!r}, title={self.title!r})"
+
+
+AnyNewsItem = Union[NewsItem, Article, "LazyNewsItem"]
+
+
+def materialize(item: AnyNewsItem) -> NewsItem:
+    """The full NewsItem for a cached item, converting it if needed"""
+    if isinstance(item, NewsItem):
+        return item
+    return item.materialize()
+
+
+def estimated_size(item: AnyNewsItem) -> int:
+    """Approximate resident bytes of a cached item"""
+    if isinstance(item, NewsItem):
+        return RECORD_OVERHEAD + sum(
+            len(getattr(item, name) or "") for name in TEXT_FIELDS
+        )
+    return item.estimated_size()
+
+
+def project(item: AnyNewsItem, fields: Sequence[str]) -> Dict[str, Any]:
+    """Only the given fields of a cached item, reading nothing else"""
+    return {name: getattr(item, name) for name in fields}
+
+
+def replace(item: AnyNewsItem, **changes) -> AnyNewsItem:
+    """Copy of a cached item with some fields changed, keeping its kind"""
+    if isinstance(item, NewsItem):
+        return item.model_copy(update=changes)
+    return Article.from_item(item).replace(**changes)
@@ -0,0 +1,91 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """An encoded JSON body and its strong validator"""
+
+    body: bytes
+    etag: str
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the exact bytes of a body"""
+    return f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches `etag`
+
+    If-None-Match uses the weak comparison, so a W/ prefix is ignored.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """LRU cache of pre-encoded JSON responses
+
+    Keys are chosen by the caller and should include the store version the
+    response was read from, so a published refresh can never be answered
+    from an older entry. `clear()` drops everything when a new version is
+    published, as no older entry can be asked for again, and whenever the
+    archive or storage behind the responses was written. Entries built
+    from reads that started before a clear are not stored.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Bumped by every clear(), so builds that straddle one can tell
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(
+        self, key: Hashable, body: bytes, generation: Optional[int] = None
+    ) -> CachedResponse:
+        """Cache `body` under `key` and return the entry
+
+        With the `generation` read before building the body, the entry is
+        only returned, not stored, if the cache was cleared meanwhile.
+        """
+        entry = CachedResponse(body, make_etag(body))
+        if self.max_entries <= 0:
+            return entry
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return entry
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
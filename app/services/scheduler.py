@@ -14,10 +14,9 @@ scheduler = AsyncIOScheduler(
 )
 
 
-async def fetch_news_job():
-    """Job to fetch news periodically"""
+async def fetch_news_job(news_service: NewsService):
+    """Job to fetch news periodically into the shared news service"""
     logger.info("Running scheduled news fetch job")
-    news_service = NewsService()
     try:
         await news_service.fetch_news()
         logger.info("Scheduled news fetch completed successfully")
@@ -25,12 +24,13 @@ async def fetch_news_job():
         logger.error(f"Error in scheduled news fetch: {e}")
 
 
-def start_scheduler():
+def start_scheduler(news_service: NewsService):
     """Start the scheduler with configured jobs"""
     if not scheduler.running:
         # Add the news fetching job
         scheduler.add_job(
             fetch_news_job,
+            args=[news_service],
             trigger=IntervalTrigger(
                 minutes=settings.NEWS_FETCH_INTERVAL_MINUTES,
             ),
@@ -41,6 +41,7 @@ def start_scheduler():
         # Also run once at startup
         scheduler.add_job(
             fetch_news_job,
+            args=[news_service],
             trigger="date",
             id="initial_fetch_news_job",
             replace_existing=True,
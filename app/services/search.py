@@ -0,0 +1,197 @@
+import heapq
+import math
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.models.news import NewsItem
+from app.services.dedup import STOPWORDS, TOKEN_RE
+from app.services.news_store import MergeResult
+
+# Standard Okapi BM25 parameters
+K1 = 1.2
+B = 0.75
+# Impact-ordered postings are cached only for terms at least this common;
+# shorter lists are cheaper to sort per query than to keep around
+IMPACT_CACHE_MIN_POSTINGS = 1024
+# Queries touching fewer postings than this are simply scored in full
+EXHAUSTIVE_MAX_POSTINGS = 16384
+
+
+def tokenize(text: str) -> List[str]:
+    """Searchable terms of `text`, in order and with repeats"""
+    return [
+        token
+        for token in TOKEN_RE.findall(text.casefold())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def _ranking(hit: Tuple[str, float]) -> Tuple[float, str]:
+    # Best score first, ties broken by id so paging is stable
+    return (-hit[1], hit[0])
+
+
+def document_text(item: NewsItem) -> str:
+    """Text an article is indexed on"""
+    return f"{item.title} {item.description or ''} {item.content or ''}"
+
+
+class SearchIndex:
+    """Inverted index over cached articles, ranked with BM25
+
+    Postings map each term to the term frequency per article id. The index
+    is updated from refresh deltas, so a refresh costs O(changed articles)
+    and a query only touches the postings of its own terms.
+
+    Top-k queries over common terms walk each term's postings in descending
+    score order and stop once no unseen article can still make the top k
+    (Fagin's threshold algorithm), instead of scoring every posting.
+    """
+
+    def __init__(self, items: Iterable[NewsItem] = ()):
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        # Distinct terms per article, needed to drop its postings again
+        self._terms: Dict[str, Tuple[str, ...]] = {}
+        self._total_length = 0
+        # term -> postings as (-score, id), best first; any change clears it
+        # because every score depends on the average document length
+        self._impacts: Dict[str, List[Tuple[float, str]]] = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._lengths
+
+    def add(self, item: NewsItem):
+        """Index an article, replacing any earlier version with the same id"""
+        self.remove(item.id)
+        self._impacts.clear()
+        counts = Counter(tokenize(document_text(item)))
+        for term, frequency in counts.items():
+            self._postings.setdefault(term, {})[item.id] = frequency
+        length = sum(counts.values())
+        self._lengths[item.id] = length
+        self._terms[item.id] = tuple(counts)
+        self._total_length += length
+
+    def remove(self, item_id: str):
+        """Drop an article from the index (no-op if it is not indexed)"""
+        length = self._lengths.pop(item_id, None)
+        if length is None:
+            return
+        self._impacts.clear()
+        self._total_length -= length
+        for term in self._terms.pop(item_id):
+            postings = self._postings[term]
+            del postings[item_id]
+            if not postings:
+                del self._postings[term]
+
+    def apply(self, delta: MergeResult):
+        """Bring the index in line with a store merge"""
+        for item in delta.removed:
+            self.remove(item.id)
+        for item in delta.upserts:
+            self.add(item)
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        where: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """(article id, score) pairs matching `query`, best first
+
+        `where` optionally restricts the results to the ids it accepts.
+        """
+        terms = [term for term in set(tokenize(query)) if term in self._postings]
+        if not terms or (limit is not None and limit <= 0):
+            return []
+        total_postings = sum(len(self._postings[term]) for term in terms)
+        if limit is not None and total_postings > EXHAUSTIVE_MAX_POSTINGS:
+            return self._top_k(terms, limit, where)
+
+        scores: Dict[str, float] = {}
+        for term in terms:
+            for item_id, score in self._term_scores(term):
+                scores[item_id] = scores.get(item_id, 0.0) + score
+        hits = scores.items()
+        if where is not None:
+            hits = [hit for hit in hits if where(hit[0])]
+        if limit is None:
+            return sorted(hits, key=_ranking)
+        return heapq.nsmallest(limit, hits, key=_ranking)
+
+    def _scorer(self, term: str) -> Callable[[str], float]:
+        """BM25 contribution of `term` to an article's score"""
+        count = len(self._lengths)
+        postings = self._postings[term]
+        df = len(postings)
+        weight = math.log(1 + (count - df + 0.5) / (df + 0.5)) * (K1 + 1)
+        # K1 * (1 - B + B * length / average_length), split into two terms
+        base = K1 * (1 - B)
+        norm = K1 * B / (self._total_length / count or 1.0)
+        lengths = self._lengths
+
+        def score(item_id: str) -> float:
+            tf = postings.get(item_id)
+            if tf is None:
+                return 0.0
+            return weight * tf / (tf + base + norm * lengths[item_id])
+
+        return score
+
+    def _term_scores(self, term: str) -> List[Tuple[str, float]]:
+        score = self._scorer(term)
+        return [(item_id, score(item_id)) for item_id in self._postings[term]]
+
+    def _impact_order(self, term: str) -> List[Tuple[float, str]]:
+        """Postings of `term` as (-score, id) pairs, best first"""
+        impacts = self._impacts.get(term)
+        if impacts is None:
+            impacts = sorted(
+                (-score, item_id) for item_id, score in self._term_scores(term)
+            )
+            if len(impacts) >= IMPACT_CACHE_MIN_POSTINGS:
+                self._impacts[term] = impacts
+        return impacts
+
+    def _top_k(
+        self,
+        terms: List[str],
+        limit: int,
+        where: Optional[Callable[[str], bool]],
+    ) -> List[Tuple[str, float]]:
+        lists = [self._impact_order(term) for term in terms]
+        scorers = [self._scorer(term) for term in terms]
+        seen = set()
+        hits: List[Tuple[str, float]] = []
+        best: List[float] = []  # min-heap of the k best scores so far
+
+        for depth in range(max(len(impacts) for impacts in lists)):
+            # No unseen article can score above the sum at the current depth
+            threshold = 0.0
+            for impacts in lists:
+                if depth >= len(impacts):
+                    continue
+                negative_score, item_id = impacts[depth]
+                threshold -= negative_score
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+                if where is not None and not where(item_id):
+                    continue
+                score = sum(scorer(item_id) for scorer in scorers)
+                hits.append((item_id, score))
+                if len(best) < limit:
+                    heapq.heappush(best, score)
+                elif score > best[0]:
+                    heapq.heapreplace(best, score)
+            if len(best) == limit and best[0] > threshold:
+                break
+
+        return heapq.nsmallest(limit, hits, key=_ranking)
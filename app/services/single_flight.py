@@ -0,0 +1,200 @@
+import asyncio
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent identical calls into one execution
+
+    While a call for a key is in flight, further calls with that key wait
+    for its result instead of starting their own. A waiter that is
+    cancelled leaves the others unaffected; the call itself is only
+    cancelled once every waiter has gone.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call[T]] = {}
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Result of `fn()`, or of the identical call already in flight
+
+        Returns the result and whether it was shared with an earlier caller.
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task), shared
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: Hashable, call: _Call[T]):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+class _Broadcast(Generic[T]):
+    """One upstream stream, replayed to every subscriber from the start
+
+    Every item is kept until the broadcast is dropped, since a subscriber
+    may join at any point before the upstream finishes and must replay it
+    all. The buffer is deliberately unbounded: it holds a single stream,
+    so it never outgrows that stream, and it is freed once the upstream
+    has finished and its last subscriber has let go.
+    """
+
+    def __init__(self, upstream: AsyncIterator[T], on_finish: Callable[[], None]):
+        self.items: List[T] = []
+        self.error: Optional[BaseException] = None
+        self.finished = False
+        self.subscribers = 0
+        self._changed = asyncio.Event()
+        self._on_finish = on_finish
+        self._task = asyncio.ensure_future(self._pump(upstream))
+
+    def _notify(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def _pump(self, upstream: AsyncIterator[T]):
+        try:
+            async for item in upstream:
+                self.items.append(item)
+                self._notify()
+        except asyncio.CancelledError:
+            self.error = RuntimeError("Shared stream was cancelled")
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished = True
+            self._on_finish()
+            self._notify()
+            await upstream.aclose()
+
+    async def replay(self) -> AsyncIterator[T]:
+        """Every item from the first; subscribers are counted by _Subscription"""
+        position = 0
+        while True:
+            changed = self._changed
+            if position < len(self.items):
+                position += 1
+                yield self.items[position - 1]
+            elif self.finished:
+                if self.error is not None:
+                    raise self.error
+                return
+            else:
+                await changed.wait()
+
+    def release(self):
+        """Drop one subscriber, cancelling the upstream after the last"""
+        self.subscribers -= 1
+        if not self.subscribers and not self.finished:
+            # Nobody is listening any more; stop the upstream work
+            self._on_finish()
+            self._task.cancel()
+
+
+class _Subscription(Generic[T]):
+    """One subscriber of a broadcast, counted from creation until it ends
+
+    Counted up front, so the upstream cannot be cancelled while a joined
+    subscriber has not started reading yet. Closing an async generator
+    that never started runs none of its code, so the count is released
+    here rather than in a `finally` of the generator.
+    """
+
+    def __init__(self, broadcast: _Broadcast[T]):
+        self._broadcast = broadcast
+        self._items = broadcast.replay()
+        self._released = False
+        broadcast.subscribers += 1
+
+    def __aiter__(self) -> "_Subscription[T]":
+        return self
+
+    async def __anext__(self) -> T:
+        try:
+            return await anext(self._items)
+        except BaseException:
+            # The replay is over once anything escapes it, cancellation too
+            self._release()
+            raise
+
+    async def aclose(self):
+        try:
+            await self._items.aclose()
+        finally:
+            self._release()
+
+    def _release(self):
+        if not self._released:
+            self._released = True
+            self._broadcast.release()
+
+
+class StreamFanout(Generic[T]):
+    """Shares one upstream stream between concurrent identical subscribers
+
+    The first subscriber for a key opens the upstream; later ones join it
+    and first receive everything already produced, then each new item as
+    it arrives. The upstream is read at its own pace and buffered, and is
+    cancelled once its last subscriber leaves.
+    """
+
+    def __init__(self):
+        self._streams: Dict[Hashable, _Broadcast[T]] = {}
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+    def subscribe(
+        self, key: Hashable, open_stream: Callable[[], AsyncIterator[T]]
+    ) -> AsyncIterator[T]:
+        """Items of the stream for `key`, opening it if none is in flight"""
+        broadcast = self._streams.get(key)
+        if broadcast is None:
+            broadcast = _Broadcast(open_stream(), lambda: self._forget(key, broadcast))
+            self._streams[key] = broadcast
+        else:
+            self.coalesced += 1
+        return _Subscription(broadcast)
+
+    def _forget(self, key: Hashable, broadcast: "_Broadcast[T]"):
+        if self._streams.get(key) is broadcast:
+            del self._streams[key]
@@ -0,0 +1,220 @@
+import json
+import struct
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+from app.models.news import NewsItem
+from app.services.records import RECORD_OVERHEAD, AnyNewsItem
+
+# File layout (little endian):
+#   header   MAGIC, version, flags, item count, offset of the index section
+#   records  one JSON array per item holding its bulky fields
+#   index    one fixed-size entry per item, newest first, followed by a blob
+#            with the id, source and category strings of every entry
+MAGIC = b"NFFSNAP\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHHIQ")
+ENTRY = struct.Struct("<dhQIHHH")
+
+NAIVE_OFFSET = -32768
+NO_CATEGORY = 0xFFFF
+RECORD_FIELDS = (
+    "title",
+    "description",
+    "content",
+    "url",
+    "image_url",
+    "author",
+    "cluster_size",
+    "duplicate_ids",
+)
+
+_timezones: Dict[int, timezone] = {}
+
+
+class SnapshotFormatError(ValueError):
+    """Raised when a file is not a snapshot this version can read"""
+
+
+def _timezone(offset_minutes: int) -> Optional[timezone]:
+    if offset_minutes == NAIVE_OFFSET:
+        return None
+    tz = _timezones.get(offset_minutes)
+    if tz is None:
+        tz = _timezones[offset_minutes] = timezone(timedelta(minutes=offset_minutes))
+    return tz
+
+
+class LazyNewsItem:
+    """Cached article whose full NewsItem is decoded only on first access
+
+    The fields the store indexes on (id, source, category, published_at) are
+    read from the snapshot index up front; everything else stays as raw
+    bytes in the snapshot buffer until `materialize()` is called.
+    """
+
+    __slots__ = (
+        "id",
+        "source",
+        "category",
+        "published_at",
+        "_buffer",
+        "_span",
+        "_item",
+    )
+
+    def __init__(self, item_id, source, category, published_at, buffer, span):
+        self.id = item_id
+        self.source = source
+        self.category = category
+        self.published_at = published_at
+        self._buffer = buffer
+        self._span = span
+        self._item: Optional[NewsItem] = None
+
+    @property
+    def raw_record(self) -> bytes:
+        start, length = self._span
+        return bytes(self._buffer[start : start + length])
+
+    def materialize(self) -> NewsItem:
+        if self._item is None:
+            values = dict(zip(RECORD_FIELDS, json.loads(self.raw_record)))
+            values["duplicate_ids"] = tuple(values["duplicate_ids"])
+            # Validation runs in pydantic-core and beats model_construct
+            self._item = NewsItem(
+                id=self.id,
+                source=self.source,
+                category=self.category,
+                published_at=self.published_at,
+                **values,
+            )
+        return self._item
+
+    def peek(self, names: Sequence[str]) -> Tuple[Any, ...]:
+        """Values of the given fields, decoding the record without keeping it
+
+        Unlike attribute access this leaves the item lazy, for passes that
+        read a few fields of every cached article once.
+        """
+        if self._item is not None:
+            return tuple(getattr(self._item, name) for name in names)
+        values = dict(zip(RECORD_FIELDS, json.loads(self.raw_record)))
+        values["duplicate_ids"] = tuple(values["duplicate_ids"])
+        return tuple(
+            values[name] if name in values else getattr(self, name) for name in names
+        )
+
+    def estimated_size(self) -> int:
+        """Approximate bytes of the item, without decoding it"""
+        return RECORD_OVERHEAD + len(self.id) + self._span[1]
+
+    def __getattr__(self, name):
+        return getattr(self.materialize(), name)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyNewsItem):
+            other = other.materialize()
+        return self.materialize() == other
+
+    def __repr__(self) -> str:
+        return f"LazyNewsItem(id={self.id!r}, source={self.source!r})"
+
+
+def read_fields(item: AnyNewsItem, names: Sequence[str]) -> Tuple[Any, ...]:
+    """Values of the given fields of any cached item, leaving lazy ones lazy"""
+    if isinstance(item, LazyNewsItem):
+        return item.peek(names)
+    return tuple(getattr(item, name) for name in names)
+
+
+def _encode_record(item: AnyNewsItem) -> bytes:
+    if isinstance(item, LazyNewsItem) and item._item is None:
+        # Never decoded, so the original bytes can be copied as they are
+        return item.raw_record
+    values = [getattr(item, name) for name in RECORD_FIELDS]
+    values[-1] = list(item.duplicate_ids)
+    return json.dumps(values, separators=(",", ":")).encode("utf-8")
+
+
+def write_snapshot(f: BinaryIO, items: Sequence[AnyNewsItem]):
+    """Write items (already in store order) as a snapshot file"""
+    f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0))
+    entries, strings = [], []
+    offset = HEADER.size
+    for item in items:
+        record = _encode_record(item)
+        f.write(record)
+
+        utcoffset = item.published_at.utcoffset()
+        tz_minutes = (
+            NAIVE_OFFSET if utcoffset is None else int(utcoffset.total_seconds() // 60)
+        )
+        encoded = [
+            item.id.encode("utf-8"),
+            item.source.encode("utf-8"),
+            (item.category or "").encode("utf-8"),
+        ]
+        entries.append(
+            ENTRY.pack(
+                item.published_at.timestamp(),
+                tz_minutes,
+                offset,
+                len(record),
+                len(encoded[0]),
+                len(encoded[1]),
+                NO_CATEGORY if item.category is None else len(encoded[2]),
+            )
+        )
+        strings.extend(encoded)
+        offset += len(record)
+
+    index_offset = offset
+    f.write(b"".join(entries))
+    f.write(b"".join(strings))
+    f.seek(0)
+    f.write(HEADER.pack(MAGIC, VERSION, 0, len(entries), index_offset))
+
+
+def read_snapshot(buffer, limit: Optional[int] = None) -> List[LazyNewsItem]:
+    """Read the index of a snapshot held in `buffer` (bytes or mmap)"""
+    if len(buffer) < HEADER.size:
+        raise SnapshotFormatError("File too short for a snapshot header")
+    magic, version, _flags, count, index_offset = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise SnapshotFormatError("Not a news snapshot file")
+    if version != VERSION:
+        raise SnapshotFormatError(f"Unsupported snapshot version {version}")
+
+    entries_end = index_offset + count * ENTRY.size
+    strings = bytes(buffer[entries_end:])
+    if limit is not None:
+        count = min(count, limit)
+
+    items = []
+    position = 0
+    intern = sys.intern
+    entries = ENTRY.iter_unpack(buffer[index_offset:entries_end])
+    for _, entry in zip(range(count), entries):
+        ts, tz_minutes, start, length, id_len, source_len, category_len = entry
+        item_id = strings[position : position + id_len].decode("utf-8")
+        position += id_len
+        source = intern(strings[position : position + source_len].decode("utf-8"))
+        position += source_len
+        category = None
+        if category_len != NO_CATEGORY:
+            raw = strings[position : position + category_len]
+            category = intern(raw.decode("utf-8"))
+            position += category_len
+        items.append(
+            LazyNewsItem(
+                item_id,
+                source,
+                category,
+                datetime.fromtimestamp(ts, _timezone(tz_minutes)),
+                buffer,
+                (start, length),
+            )
+        )
+    return items
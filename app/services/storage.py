@@ -0,0 +1,361 @@
+import json
+import logging
+import mmap
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Collection, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.models.news import NewsItem
+from app.services.records import materialize
+from app.services.snapshot import read_snapshot, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+def _ensure_parent_dir(path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+@contextmanager
+def atomic_write(path: str, mode: str, fsync: bool):
+    """Open a temp file next to `path` and rename it over `path` on success
+
+    A crash mid-write therefore never leaves a truncated file behind.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".news_cache-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    if fsync:
+        _fsync_dir(directory)
+
+
+def _fsync_dir(directory: str):
+    """Persist a rename by syncing its directory (no-op where unsupported)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class NewsStorage:
+    """Base class for persistent news storage backends"""
+
+    # Whether the backend can answer filtered queries without loading everything
+    supports_query = False
+    # Whether the backend can persist a delta instead of the full cache
+    supports_delta = False
+
+    def load(self, limit: Optional[int] = None) -> List[NewsItem]:
+        """Load stored items, newest first, optionally capped at `limit`"""
+        raise NotImplementedError
+
+    def save(self, items: Iterable[NewsItem]):
+        """Persist the given items"""
+        raise NotImplementedError
+
+    def apply_delta(self, upserts: Iterable[NewsItem], deletes: Iterable[str]):
+        """Insert or update `upserts` and remove the `deletes` ids"""
+        raise NotImplementedError
+
+    def delete_before(self, cutoff: datetime, keep: Collection[str] = ()) -> int:
+        """Delete items published before `cutoff` except the `keep` ids"""
+        raise NotImplementedError
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: int = 10,
+        skip: int = 0,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[NewsItem]:
+        """Query stored items directly, newest first
+
+        `after` is a sort key from a cursor; the page then starts right
+        after it instead of counting from the start.
+        """
+        raise NotImplementedError
+
+    def get(self, item_id: str) -> Optional[NewsItem]:
+        """Look up a single stored item by id"""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """Number of stored items"""
+        return len(self.load())
+
+    def close(self):
+        """Release any resources held by the backend"""
+
+
+class JsonNewsStorage(NewsStorage):
+    """Stores the whole cache as a single JSON document"""
+
+    def __init__(self, path: Optional[str] = None, fsync: Optional[bool] = None):
+        self.path = path or settings.NEWS_STORAGE_FILE
+        self.fsync = settings.NEWS_STORAGE_FSYNC if fsync is None else fsync
+        _ensure_parent_dir(self.path)
+
+    def load(self, limit: Optional[int] = None) -> List[NewsItem]:
+        if not os.path.exists(self.path):
+            return []
+
+        with open(self.path, "r") as f:
+            data = json.load(f)
+
+        # Convert string dates back to datetime
+        for item in data:
+            if isinstance(item["published_at"], str):
+                try:
+                    item["published_at"] = datetime.fromisoformat(
+                        item["published_at"].replace("Z", "+00:00")
+                    )
+                except ValueError:
+                    item["published_at"] = datetime.now()
+
+        items = [NewsItem(**item) for item in data]
+        return items[:limit] if limit is not None else items
+
+    def save(self, items: Iterable[NewsItem]):
+        with atomic_write(self.path, "w", self.fsync) as f:
+            json.dump(
+                [materialize(item).model_dump() for item in items], f, default=str
+            )
+
+
+class SnapshotNewsStorage(NewsStorage):
+    """Versioned binary snapshot, memory-mapped and decoded lazily
+
+    Loading only reads the index section; article bodies are decoded into
+    NewsItem objects when a query returns them.
+    """
+
+    def __init__(self, path: Optional[str] = None, fsync: Optional[bool] = None):
+        self.path = path or settings.NEWS_SNAPSHOT_FILE
+        self.fsync = settings.NEWS_STORAGE_FSYNC if fsync is None else fsync
+        self._mmap: Optional[mmap.mmap] = None
+        _ensure_parent_dir(self.path)
+
+    def load(self, limit: Optional[int] = None) -> List[NewsItem]:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return []
+        with open(self.path, "rb") as f:
+            # The mapping stays valid after the file is replaced on save
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return read_snapshot(self._mmap, limit=limit)
+
+    def save(self, items: Iterable[NewsItem]):
+        with atomic_write(self.path, "wb", self.fsync) as f:
+            write_snapshot(f, list(items))
+
+
+class SqliteNewsStorage(NewsStorage):
+    """SQLite storage in WAL mode, upserting articles by id"""
+
+    supports_query = True
+    supports_delta = True
+
+    COLUMNS = (
+        "id",
+        "title",
+        "description",
+        "content",
+        "url",
+        "image_url",
+        "source",
+        "category",
+        "author",
+        "published_at",
+        "cluster_size",
+        "duplicate_ids",
+    )
+
+    # Columns added after the initial schema, with their definitions
+    ADDED_COLUMNS = {
+        "cluster_size": "INTEGER NOT NULL DEFAULT 1",
+        "duplicate_ids": "TEXT NOT NULL DEFAULT '[]'",
+    }
+
+    def __init__(self, path: Optional[str] = None, fsync: Optional[bool] = None):
+        self.path = path or settings.NEWS_STORAGE_DB
+        fsync = settings.NEWS_STORAGE_FSYNC if fsync is None else fsync
+        _ensure_parent_dir(self.path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL is corruption-safe in WAL mode; FULL also fsyncs every commit
+        self._conn.execute(f"PRAGMA synchronous={'FULL' if fsync else 'NORMAL'}")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS news (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    content TEXT,
+                    url TEXT NOT NULL,
+                    image_url TEXT,
+                    source TEXT NOT NULL,
+                    category TEXT,
+                    author TEXT,
+                    published_at TEXT NOT NULL,
+                    published_ts REAL NOT NULL,
+                    cluster_size INTEGER NOT NULL DEFAULT 1,
+                    duplicate_ids TEXT NOT NULL DEFAULT '[]'
+                );
+                CREATE INDEX IF NOT EXISTS idx_news_published
+                    ON news (published_ts DESC, id);
+                CREATE INDEX IF NOT EXISTS idx_news_category
+                    ON news (category, published_ts DESC, id);
+                CREATE INDEX IF NOT EXISTS idx_news_source
+                    ON news (source, published_ts DESC, id);
+                """
+            )
+            existing = {
+                row["name"] for row in self._conn.execute("PRAGMA table_info(news)")
+            }
+            for column, definition in self.ADDED_COLUMNS.items():
+                if column not in existing:
+                    self._conn.execute(
+                        f"ALTER TABLE news ADD COLUMN {column} {definition}"
+                    )
+
+    @classmethod
+    def _to_row(cls, item: NewsItem) -> Dict[str, Any]:
+        row = {column: getattr(item, column) for column in cls.COLUMNS}
+        row["published_at"] = item.published_at.isoformat()
+        row["published_ts"] = item.published_at.timestamp()
+        row["duplicate_ids"] = json.dumps(list(item.duplicate_ids))
+        return row
+
+    @classmethod
+    def _from_row(cls, row: sqlite3.Row) -> NewsItem:
+        data = {column: row[column] for column in cls.COLUMNS}
+        data["published_at"] = datetime.fromisoformat(data["published_at"])
+        data["duplicate_ids"] = tuple(json.loads(data["duplicate_ids"]))
+        return NewsItem(**data)
+
+    def _select(self, where: str, params: List[Any], limit: int, skip: int):
+        sql = (
+            f"SELECT {', '.join(self.COLUMNS)} FROM news {where} "
+            "ORDER BY published_ts DESC, id LIMIT ? OFFSET ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, [*params, limit, skip]).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def load(self, limit: Optional[int] = None) -> List[NewsItem]:
+        return self._select("", [], -1 if limit is None else limit, 0)
+
+    def save(self, items: Iterable[NewsItem]):
+        self.apply_delta(items, [])
+
+    def apply_delta(self, upserts: Iterable[NewsItem], deletes: Iterable[str]):
+        rows = [self._to_row(item) for item in upserts]
+        ids = [(item_id,) for item_id in deletes]
+        columns = (*self.COLUMNS, "published_ts")
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "id")
+        sql = (
+            f"INSERT INTO news ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + c for c in columns)}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates}"
+        )
+        with self._lock, self._conn:
+            if rows:
+                self._conn.executemany(sql, rows)
+            if ids:
+                self._conn.executemany("DELETE FROM news WHERE id = ?", ids)
+
+    def delete_before(self, cutoff: datetime, keep: Collection[str] = ()) -> int:
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep_ids (id TEXT)")
+            self._conn.execute("DELETE FROM keep_ids")
+            self._conn.executemany(
+                "INSERT INTO keep_ids VALUES (?)", [(item_id,) for item_id in keep]
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM news WHERE published_ts < ? "
+                "AND id NOT IN (SELECT id FROM keep_ids)",
+                [cutoff.timestamp()],
+            )
+            return cursor.rowcount
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: int = 10,
+        skip: int = 0,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[NewsItem]:
+        clauses, params = [], []
+        if after is not None:
+            # Keyset seek along the (published_ts DESC, id) indexes
+            timestamp, item_id = -after[0], after[1]
+            clauses.append("published_ts <= ? AND (published_ts < ? OR id > ?)")
+            params.extend([timestamp, timestamp, item_id])
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._select(where, params, limit, skip)
+
+    def get(self, item_id: str) -> Optional[NewsItem]:
+        items = self._select("WHERE id = ?", [item_id], 1, 0)
+        return items[0] if items else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM news").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+STORAGE_BACKENDS = {
+    "json": JsonNewsStorage,
+    "snapshot": SnapshotNewsStorage,
+    "sqlite": SqliteNewsStorage,
+}
+
+
+def get_storage(backend: Optional[str] = None) -> NewsStorage:
+    """Create the storage backend selected in settings"""
+    name = (backend or settings.NEWS_STORAGE_BACKEND).lower()
+    if name not in STORAGE_BACKENDS:
+        raise ValueError(
+            f"Unknown NEWS_STORAGE_BACKEND '{name}', "
+            f"expected one of: {', '.join(STORAGE_BACKENDS)}"
+        )
+    return STORAGE_BACKENDS[name]()
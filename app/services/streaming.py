@@ -0,0 +1,115 @@
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, TypeVar
+
+from fastapi import Request
+
+from app.models.generation import GeneratedNewsItem, StreamFormat
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MEDIA_TYPES = {
+    StreamFormat.SSE: "text/event-stream",
+    StreamFormat.NDJSON: "application/x-ndjson",
+}
+# Keep proxies from buffering or caching the stream
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def encode_frame(format: StreamFormat, event: str, data: Dict[str, Any]) -> bytes:
+    """One self-contained frame; tokens are JSON-encoded so newlines stay inside"""
+    if format == StreamFormat.SSE:
+        payload = json.dumps(data, separators=(",", ":"))
+        return f"event: {event}\ndata: {payload}\n\n".encode("utf-8")
+    payload = json.dumps({"event": event, **data}, separators=(",", ":"))
+    return f"{payload}\n".encode("utf-8")
+
+
+async def frame_events(
+    values: AsyncIterator[T],
+    format: StreamFormat,
+    event: str,
+    to_data: Callable[[T], Dict[str, Any]],
+) -> AsyncIterator[bytes]:
+    """Frame each value as it arrives, ending with a `done` or `error` frame
+
+    The response status is sent before the first value, so upstream
+    failures are reported in-band. Closing the frames closes `values`.
+    """
+    try:
+        async for value in values:
+            yield encode_frame(format, event, to_data(value))
+    except Exception as e:
+        logger.error(f"Error streaming future news: {e}")
+        yield encode_frame(format, "error", {"detail": str(e)})
+        return
+    finally:
+        await values.aclose()
+    yield encode_frame(format, "done", {})
+
+
+def frame_tokens(
+    tokens: AsyncIterator[str], format: StreamFormat
+) -> AsyncIterator[bytes]:
+    """`token` frames of raw generated text"""
+    return frame_events(tokens, format, "token", lambda token: {"token": token})
+
+
+def frame_articles(
+    articles: AsyncIterator[GeneratedNewsItem], format: StreamFormat
+) -> AsyncIterator[bytes]:
+    """`article` frames of parsed generated articles"""
+    return frame_events(
+        articles,
+        format,
+        "article",
+        lambda article: {"article": article.model_dump(mode="json")},
+    )
+
+
+async def wait_for_disconnect(request: Request):
+    """Return once the client has gone away"""
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def relay_until_disconnect(
+    request: Request, chunks: AsyncIterator[bytes]
+) -> AsyncIterator[bytes]:
+    """Relay `chunks` one at a time, closing them once the client disconnects
+
+    Each chunk is only requested after the previous one was sent. The
+    upstream completion is read at its own pace and its tokens are buffered
+    once per completion for every subscriber, so a slow client falls behind
+    in that buffer rather than slowing the model down. A disconnect cancels
+    the pending read right away, even between tokens, and closing `chunks`
+    aborts the upstream request once no other subscriber shares it.
+    """
+    disconnected = asyncio.ensure_future(wait_for_disconnect(request))
+    next_chunk = None
+    try:
+        while True:
+            next_chunk = asyncio.ensure_future(anext(chunks))
+            await asyncio.wait(
+                {next_chunk, disconnected}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not next_chunk.done():
+                logger.info("Client disconnected, aborting streaming generation")
+                return
+            try:
+                chunk = next_chunk.result()
+            except StopAsyncIteration:
+                return
+            yield chunk
+    finally:
+        disconnected.cancel()
+        # The pending read must finish before the iterator can be closed
+        if next_chunk is not None and not next_chunk.done():
+            next_chunk.cancel()
+            await asyncio.wait({next_chunk})
+        await chunks.aclose()
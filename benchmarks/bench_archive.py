@@ -0,0 +1,118 @@
+"""Benchmark time-range reads: one flat snapshot vs the day-partitioned archive.
+
+Archives a year of articles, then times a one-week page, a deep page and
+the year-horizon context sample. The baseline maps a single snapshot of
+the same articles and filters its whole index, which is what any
+unpartitioned history would need. Both sides are timed cold (files freshly
+mapped) and warm.
+
+Usage:
+    python benchmarks/bench_archive.py [articles_per_day]
+"""
+
+import mmap
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.models.news import NewsItem  # noqa: E402
+from app.services.archive import NewsArchive  # noqa: E402
+from app.services.news_store import sort_key  # noqa: E402
+from app.services.snapshot import read_snapshot, write_snapshot  # noqa: E402
+
+CATEGORIES = ["business", "technology", "science", "health", "politics"]
+SOURCES = [f"Source {i}" for i in range(30)]
+DAYS = 365
+DEFAULT_PER_DAY = 500
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SINCE = START + timedelta(days=200)
+UNTIL = SINCE + timedelta(days=7)
+
+
+def make_items(per_day):
+    rng = random.Random(42)
+    return [
+        NewsItem(
+            id=f"bench-{day}-{i}",
+            title=f"Benchmark article {day} {i}",
+            description="Short description of the benchmark article",
+            url=f"https://example.com/{day}/{i}",
+            source=rng.choice(SOURCES),
+            category=rng.choice(CATEGORIES),
+            published_at=START + timedelta(days=day, seconds=rng.randrange(86400)),
+        )
+        for day in range(DAYS)
+        for i in range(per_day)
+    ]
+
+
+def timeit(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def flat_query(path, since, until, limit, skip):
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    start, end = since.timestamp(), until.timestamp()
+    matching = [
+        item
+        for item in read_snapshot(buffer)
+        if start <= item.published_at.timestamp() < end
+    ]
+    return matching[skip : skip + limit]
+
+
+def main(per_day):
+    items = make_items(per_day)
+    print(f"{len(items)} articles over {DAYS} days")
+    with tempfile.TemporaryDirectory() as directory:
+        flat_path = os.path.join(directory, "flat.snap")
+        with open(flat_path, "wb") as f:
+            write_snapshot(f, sorted(items, key=sort_key))
+
+        root = os.path.join(directory, "archive")
+        started = time.perf_counter()
+        archive = NewsArchive(root, fsync=False)
+        archive.add(items)
+        archive.seal(START + timedelta(days=DAYS + 1))
+        print(f"archived and sealed in {time.perf_counter() - started:.1f} s")
+
+        reads = [
+            ("week page (20)", SINCE, UNTIL, 20, 0),
+            ("week deep page (skip 2000)", SINCE, UNTIL, 20, 2000),
+            ("year page (20)", START, START + timedelta(days=DAYS), 20, 0),
+        ]
+        print(f"{'read':<28} {'flat (ms)':>10} {'cold (ms)':>10} {'warm (ms)':>10}")
+        for label, since, until, limit, skip in reads:
+            flat = timeit(lambda: flat_query(flat_path, since, until, limit, skip))
+
+            def cold():
+                NewsArchive(root, fsync=False).query(
+                    since=since, until=until, limit=limit, skip=skip
+                )
+
+            warm = timeit(
+                lambda: archive.query(since=since, until=until, limit=limit, skip=skip)
+            )
+            print(
+                f"{label:<28} {flat * 1000:>10.1f} {timeit(cold) * 1000:>10.1f} "
+                f"{warm * 1000:>10.2f}"
+            )
+
+        sample = timeit(lambda: archive.sample(since=START, limit=20), repeat=3)
+        print(f"{'year sample (20)':<28} {'':>10} {'':>10} {sample * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PER_DAY)
@@ -0,0 +1,88 @@
+"""Benchmark time-to-first-article of the incremental article parser.
+
+Replays a three-article completion as ~4-character tokens at a fixed
+interval, like Ollama streaming a generation, and reports when each
+article becomes available: after the whole completion with the old
+find("[")/rfind("]") + json.loads extraction, and as soon as its object
+closes with ArticleStreamParser. Also reports raw parsing throughput.
+
+Usage:
+    python benchmarks/bench_article_parser.py [token_ms]
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.services.article_parser import ArticleStreamParser  # noqa: E402
+
+DEFAULT_TOKEN_MS = 2.0
+WORDS = "markets energy climate policy vote launch study growth city data".split()
+
+
+def completion():
+    rng = random.Random(7)
+    articles = [
+        {
+            "title": f"Future headline {i}",
+            "content": " ".join(rng.choice(WORDS) for _ in range(220)),
+            "predicted_date": "2030-01-02",
+            "source": "Tomorrow Times",
+            "category": "science",
+        }
+        for i in range(3)
+    ]
+    return "Here are the articles:\n" + json.dumps(articles, indent=2)
+
+
+async def stream(text, token_ms):
+    for start in range(0, len(text), 4):
+        await asyncio.sleep(token_ms / 1000)
+        yield text[start : start + 4]
+
+
+async def old_extraction(text, token_ms):
+    start, received = time.perf_counter(), []
+    async for token in stream(text, token_ms):
+        received.append(token)
+    generated = "".join(received)
+    articles = json.loads(generated[generated.find("[") : generated.rfind("]") + 1])
+    return [time.perf_counter() - start] * len(articles)
+
+
+async def incremental(text, token_ms):
+    start, times, parser = time.perf_counter(), [], ArticleStreamParser()
+    async for token in stream(text, token_ms):
+        for _ in parser.feed(token):
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def throughput(text, repeats=50):
+    tokens = [text[i : i + 4] for i in range(0, len(text), 4)]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        parser = ArticleStreamParser()
+        for token in tokens:
+            parser.feed(token)
+    return len(text) * repeats / (time.perf_counter() - start) / 1e6
+
+
+async def main(token_ms):
+    text = completion()
+    print(f"{len(text)} chars, {len(text) // 4} tokens at {token_ms} ms")
+    runs = (("old extraction", old_extraction), ("incremental", incremental))
+    for label, run in runs:
+        times = await run(text, token_ms)
+        print(f"{label:<16} articles at " + ", ".join(f"{t:5.2f}s" for t in times))
+    print(f"parser throughput {throughput(text):.1f} MB/s in 4-char tokens")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TOKEN_MS))
@@ -0,0 +1,80 @@
+"""Benchmark category classification of NewsAPI articles.
+
+Compares the previous per-article loop over categories (two .lower() calls
+per category) with CategoryClassifier's keyword table built once per config.
+
+Usage:
+    python benchmarks/bench_classifier.py [article_count]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.services.classifier import CategoryClassifier  # noqa: E402
+
+BASE_CATEGORIES = ["business", "technology", "science", "health", "politics"]
+WORDS = "market vote launch study patient court energy climate league film".split()
+
+
+def make_articles(count, categories):
+    rng = random.Random(7)
+    articles = []
+    for i in range(count):
+        words = rng.choices(WORDS, k=8)
+        if rng.random() < 0.5:
+            words.append(rng.choice(categories))
+        section = rng.choice(categories + ["world", "news"])
+        articles.append(
+            {
+                "url": f"https://example.com/{section}/2024/article-{i}",
+                "title": " ".join(words).title(),
+            }
+        )
+    return articles
+
+
+def loop_classify(articles, categories):
+    """The pre-classifier implementation from NewsService._parse_news_items"""
+    result = []
+    for article in articles:
+        category = None
+        for cat in categories:
+            if (
+                cat.lower() in article.get("url", "").lower()
+                or cat.lower() in article.get("title", "").lower()
+            ):
+                category = cat
+                break
+        result.append(category)
+    return result
+
+
+def main(count):
+    print(
+        f"{'categories':>10} {'articles':>9} {'loop (ms)':>10} {'classifier (ms)':>16}"
+    )
+    for extra in (0, 45):
+        categories = BASE_CATEGORIES + [f"topic{i}" for i in range(extra)]
+        articles = make_articles(count, categories)
+        classifier = CategoryClassifier(categories)
+        pairs = [(a["url"], a["title"]) for a in articles]
+
+        start = time.perf_counter()
+        expected = loop_classify(articles, categories)
+        loop_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        actual = classifier.classify_batch(pairs)
+        compiled_ms = (time.perf_counter() - start) * 1000
+
+        assert actual == expected
+        print(f"{len(categories):>10} {count:>9} {loop_ms:>10.1f} {compiled_ms:>16.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,103 @@
+"""Benchmark analytics-style reads: NewsItem loops vs NewsColumns masks.
+
+Times a time-window page, per-source counts within a window and a
+category+window count, on Python objects and on the columnar view.
+
+Usage:
+    python benchmarks/bench_columnar.py [sizes...]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.models.news import NewsItem  # noqa: E402
+from app.services.columnar import NewsColumns  # noqa: E402
+from app.services.news_store import NewsStore  # noqa: E402
+
+CATEGORIES = ["business", "technology", "science", "health", "politics"]
+SOURCES = [f"Source {i}" for i in range(50)]
+DEFAULT_SIZES = [100_000, 1_000_000]
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SINCE = START + timedelta(days=30)
+UNTIL = START + timedelta(days=60)
+
+
+def make_items(count):
+    rng = random.Random(42)
+    return [
+        NewsItem(
+            id=f"bench-{i}",
+            title=f"Benchmark article {i}",
+            url=f"https://example.com/{i}",
+            source=rng.choice(SOURCES),
+            category=rng.choice(CATEGORIES),
+            published_at=START + timedelta(seconds=rng.randrange(10_000_000)),
+        )
+        for i in range(count)
+    ]
+
+
+def in_window(item):
+    return SINCE <= item.published_at < UNTIL
+
+
+def timeit(func, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(sizes):
+    print(f"{'items':>10} {'read':<24} {'objects (ms)':>13} {'columns (ms)':>13}")
+    for size in sizes:
+        items = list(NewsStore(make_items(size)))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "columns.bin")
+            NewsColumns.from_items(items).save(path, fsync=False)
+            columns = NewsColumns.open(path)
+
+            reads = [
+                (
+                    "window page (20)",
+                    lambda: [item for item in items if in_window(item)][:20],
+                    lambda: columns.select(since=SINCE, until=UNTIL, limit=20),
+                ),
+                (
+                    "counts per source",
+                    lambda: Counter(item.source for item in items if in_window(item)),
+                    lambda: columns.count_by(
+                        "source", columns.mask(since=SINCE, until=UNTIL)
+                    ),
+                ),
+                (
+                    "category+window count",
+                    lambda: sum(
+                        1
+                        for item in items
+                        if item.category == "science" and in_window(item)
+                    ),
+                    lambda: int(
+                        columns.mask(category="science", since=SINCE, until=UNTIL).sum()
+                    ),
+                ),
+            ]
+            for label, objects, vectorized in reads:
+                print(
+                    f"{size:>10} {label:<24} {timeit(objects) * 1000:>13.1f} "
+                    f"{timeit(vectorized) * 1000:>13.2f}"
+                )
+            megabytes = os.path.getsize(path) / 1e6
+            print(f"{size:>10} {'(file size, MB)':<24} {'':>13} {megabytes:>13.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,127 @@
+"""Benchmark in-memory body compression with and without a trained dictionary.
+
+Builds realistic-looking article bodies (NewsAPI truncates content to ~200
+characters plus a "[+N chars]" marker), then measures resident bytes per
+Article and the cost of the two access patterns that matter: a list page
+that only projects id/title/published_at, and a detail read that
+decompresses description and content.
+
+Usage:
+    python benchmarks/bench_compression.py [count]
+"""
+
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.services.compression import PLAIN_CODEC, ContentCodec  # noqa: E402
+from app.services.records import Article, project  # noqa: E402
+
+DEFAULT_COUNT = 20_000
+WORDS = (
+    "the government said on monday that officials would announce new "
+    "measures to support the economy after inflation rose again while "
+    "markets fell sharply and investors worried about interest rates "
+    "according to a statement from the ministry president minister "
+    "company shares percent year people police court report million"
+).split()
+SOURCES = ["BBC News", "CNN", "Reuters", "Associated Press"]
+
+
+def sentence(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize() + "."
+
+
+def raw_articles(count):
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        content = f"{sentence(rng, 20)} {sentence(rng, 14)}"[:200]
+        yield {
+            "id": f"{i:016x}",
+            "title": sentence(rng, 9),
+            "description": f"{sentence(rng, 18)} {sentence(rng, 10)}",
+            "content": f"{content}… [+{rng.randrange(1000, 9000)} chars]",
+            "url": f"https://example.com/news/{i}",
+            "source": rng.choice(SOURCES),
+            "published_at": start + timedelta(seconds=i),
+        }
+
+
+def measure(count, codec):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # Fresh inputs, so the baseline pays for its own body strings
+    articles = [Article(**values, codec=codec) for values in raw_articles(count)]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return articles, size
+
+
+def timed(label, fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<28} {best * 1000:8.1f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT
+    raw = list(raw_articles(count))
+    body_bytes = sum(
+        len(a["description"].encode()) + len(a["content"].encode()) for a in raw
+    )
+    print(f"{count} articles, {body_bytes / count:.0f} body bytes each")
+
+    start = time.perf_counter()
+    trained = ContentCodec.train(
+        text for a in raw[:2000] for text in (a["description"], a["content"])
+    )
+    print(
+        f"dictionary: {len(trained.zdict)} bytes, "
+        f"trained in {(time.perf_counter() - start) * 1000:.0f} ms"
+    )
+
+    for label, codec in (
+        ("uncompressed", None),
+        ("zlib", PLAIN_CODEC),
+        ("zlib + dictionary", trained),
+    ):
+        if codec is None:
+            # Bypass the codec entirely for the baseline
+            codec = ContentCodec()
+            codec.encode = lambda text: text
+        report(label, count, codec, body_bytes)
+
+
+def report(label, count, codec, body_bytes):
+    # Runs per codec, so one run's articles are freed before the next
+    articles, size = measure(count, codec)
+    stored = sum(len(a._description or "") + len(a._content or "") for a in articles)
+    print(
+        f"{label}: {size / count:.0f} B/article resident, "
+        f"bodies {stored / body_bytes:.0%} of original"
+    )
+    timed(
+        "project id,title,published",
+        lambda: [project(a, ("id", "title", "published_at")) for a in articles],
+    )
+    timed(
+        "read description+content",
+        lambda: [(a.description, a.content) for a in articles],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark paging a full listing with skip/limit vs keyset cursors.
+
+Walks every page of one category while refreshes insert new articles
+between page requests, and reports per-page latency plus how many
+articles were served twice or never with each scheme.
+
+Usage:
+    python benchmarks/bench_cursor.py [size] [page_size]
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.models.news import NewsItem  # noqa: E402
+from app.services.news_store import (  # noqa: E402
+    NewsStore,
+    decode_cursor,
+    encode_cursor,
+)
+
+CATEGORIES = ["business", "technology", "science", "health", "politics"]
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+DEFAULT_SIZE = 100_000
+DEFAULT_PAGE = 50
+# New articles per refresh, one refresh every REFRESH_EVERY pages
+REFRESH_ITEMS = 20
+REFRESH_EVERY = 10
+
+
+def make_item(rng, i, seconds):
+    return NewsItem(
+        id=f"bench-{i}",
+        title=f"Benchmark article {i}",
+        url=f"https://example.com/{i}",
+        source="CNN",
+        category=rng.choice(CATEGORIES),
+        published_at=START + timedelta(seconds=seconds),
+    )
+
+
+def walk(size, page_size, use_cursor):
+    rng = random.Random(42)
+    store = NewsStore(make_item(rng, i, rng.randrange(10_000_000)) for i in range(size))
+    expected = {item.id for item in store if item.category == "science"}
+    seen, duplicates, pages, elapsed = set(), 0, 0, 0.0
+    skip, cursor, next_id = 0, None, size
+
+    while True:
+        start = time.perf_counter()
+        if use_cursor:
+            after = None if cursor is None else decode_cursor(cursor)[1]
+            page = store.query_records("science", limit=page_size, after=after)
+            cursor = encode_cursor(store.version, page[-1]) if page else None
+        else:
+            page = store.query_records("science", limit=page_size, skip=skip)
+            skip += page_size
+        elapsed += time.perf_counter() - start
+        if not page:
+            break
+        pages += 1
+        for item in page:
+            duplicates += item.id in seen
+            seen.add(item.id)
+
+        if pages % REFRESH_EVERY == 0:
+            # Breaking news lands ahead of every page already served
+            store.merge(
+                make_item(rng, next_id + n, 10_000_000 + next_id + n)
+                for n in range(REFRESH_ITEMS)
+            )
+            next_id += REFRESH_ITEMS
+
+    missed = len(expected - seen)
+    return pages, elapsed / pages * 1e6, duplicates, missed
+
+
+def main(size, page_size):
+    print(
+        f"{size} items, pages of {page_size}, "
+        f"{REFRESH_ITEMS} new items every {REFRESH_EVERY} pages"
+    )
+    print(f"{'scheme':<8} {'pages':>6} {'us/page':>8} {'duplicates':>11} {'missed':>7}")
+    for label, use_cursor in (("skip", False), ("cursor", True)):
+        pages, per_page, duplicates, missed = walk(size, page_size, use_cursor)
+        print(f"{label:<8} {pages:>6} {per_page:>8.1f} {duplicates:>11} {missed:>7}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [DEFAULT_SIZE, DEFAULT_PAGE][len(args) :]))
@@ -0,0 +1,71 @@
+"""Benchmark listing sources/categories by scanning articles vs store facets.
+
+Compares the distinct-source scan `get_sources` used to do over every
+cached article with `NewsStore.facets()`, both after a refresh (first call
+on a new version) and on repeated calls against the same version.
+
+Usage:
+    python benchmarks/bench_facets.py [size]
+"""
+
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.models.news import NewsItem  # noqa: E402
+from app.services.news_store import NewsStore  # noqa: E402
+
+CATEGORIES = ["business", "technology", "science", "health", "politics"]
+SOURCES = [f"source-{i}" for i in range(60)]
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+DEFAULT_SIZE = 100_000
+REPEATS = 50
+
+
+def make_item(rng, i):
+    return NewsItem(
+        id=f"bench-{i}",
+        title=f"Benchmark article {i}",
+        url=f"https://example.com/{i}",
+        source=rng.choice(SOURCES),
+        category=rng.choice(CATEGORIES),
+        published_at=START + timedelta(seconds=rng.randrange(10_000_000)),
+    )
+
+
+def scan(store):
+    # What answering with counts took before: one pass over every article
+    sources = Counter(item.source for item in store)
+    categories = Counter(item.category for item in store if item.category)
+    return sources, categories
+
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main(size):
+    rng = random.Random(42)
+    store = NewsStore(make_item(rng, i) for i in range(size))
+    print(f"{size} cached items, {len(SOURCES)} sources, {len(CATEGORIES)} categories")
+    print(f"{'scan all articles':<24} {timed(lambda: scan(store), 5):8.3f} ms")
+
+    def after_refresh():
+        store.merge([make_item(rng, size + rng.randrange(size))])
+        store.facets()
+
+    print(f"{'merge 1 + facets':<24} {timed(after_refresh, REPEATS):8.3f} ms")
+    print(f"{'facets, same version':<24} {timed(store.facets, REPEATS):8.4f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE)
@@ -0,0 +1,90 @@
+"""Benchmark answering a repeated generation from the generation cache.
+
+Measures what a repeated POST /api/generation costs once cached: building
+the prompt and its key for a 10-article context, then a memory hit, and a
+disk hit right after a restart. A real miss costs a full LLM completion,
+typically several seconds to minutes.
+
+Usage:
+    python benchmarks/bench_generation_cache.py [repeats]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.models.generation import GeneratedNewsItem, NewsStyle, TimeFrame  # noqa: E402
+from app.models.news import NewsItem  # noqa: E402
+from app.services.generation_cache import GenerationCache, generation_key  # noqa: E402
+from app.services.llm_service import LLMService  # noqa: E402
+
+DEFAULT_REPEATS = 2000
+BODY = "Officials said the plan would take effect next year. " * 20
+
+
+def context():
+    return [
+        NewsItem(
+            id=f"ctx-{i}",
+            title=f"Context article {i}",
+            content=BODY,
+            url=f"https://example.com/{i}",
+            source="CNN",
+            category="politics",
+            published_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+        for i in range(10)
+    ]
+
+
+def articles():
+    return [
+        GeneratedNewsItem(
+            title=f"Future {i}",
+            content=BODY,
+            predicted_date=datetime(2030, 1, 1),
+            source="Tomorrow Times",
+        )
+        for i in range(3)
+    ]
+
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main(repeats):
+    service = LLMService(cache=GenerationCache())
+    news_items = context()
+
+    def key():
+        prompt = service._create_prompt(news_items, TimeFrame.WEEK, NewsStyle.NEUTRAL)
+        return generation_key("llama3", prompt)
+
+    with tempfile.TemporaryDirectory() as directory:
+        GenerationCache(directory=directory).put(key(), articles())
+        memory = GenerationCache(directory=directory)
+        memory.get(key())
+
+        def disk_hit():
+            GenerationCache(directory=directory).get(key())
+
+        rows = (
+            ("prompt + key", timed(key, repeats)),
+            ("key + memory hit", timed(lambda: memory.get(key()), repeats)),
+            ("restart + disk hit", timed(disk_hit, repeats // 10)),
+        )
+        for label, micros in rows:
+            print(f"{label:<20} {micros:8.1f} us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REPEATS)
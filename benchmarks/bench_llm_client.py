@@ -0,0 +1,97 @@
+"""Benchmark a fresh Ollama client per request vs the shared pooled client.
+
+Runs a minimal keep-alive HTTP server on localhost that answers like
+Ollama's /api/generate, then issues the same number of concurrent
+requests through a new LLMService (and client) per request, as the
+per-request dependency used to, and through one pooled LLMService. Reports
+mean latency and how many TCP connections the server accepted.
+
+Usage:
+    python benchmarks/bench_llm_client.py [requests] [concurrency]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.models.generation import TimeFrame  # noqa: E402
+from app.services.llm_service import LLMService, create_ollama_client  # noqa: E402
+
+DEFAULT_REQUESTS = 2000
+DEFAULT_CONCURRENCY = 8
+BODY = json.dumps({"response": "[]"}).encode()
+
+
+class Server:
+    def __init__(self):
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                await reader.readexactly(length)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(BODY), BODY)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run(count, concurrency, pooled, base_url):
+    semaphore = asyncio.Semaphore(concurrency)
+    shared = LLMService(create_ollama_client(base_url)) if pooled else None
+
+    async def one():
+        async with semaphore:
+            service = shared or LLMService(create_ollama_client(base_url))
+            await service.generate_future_news([], time_frame=TimeFrame.DAY)
+            if shared is None:
+                # Closed here for a fair comparison; the old code never did
+                await service.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    elapsed = time.perf_counter() - start
+    if shared is not None:
+        await shared.close()
+    return elapsed / count * 1000
+
+
+async def main(count, concurrency):
+    server = Server()
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+    print(f"{count} requests, {concurrency} concurrent")
+    for label, pooled in (("client per request", False), ("pooled client", True)):
+        server.connections = 0
+        latency = await run(count, concurrency, pooled, base_url)
+        print(
+            f"{label:<20} {latency:7.3f} ms/request "
+            f"{server.connections:6} connections"
+        )
+    listener.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REQUESTS,
+            int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CONCURRENCY,
+        )
+    )
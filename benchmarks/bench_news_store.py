@@ -0,0 +1,83 @@
+"""Benchmark NewsService.get_news against the indexed NewsStore.
+
+Compares the previous implementation (linear filter + sort per request)
+with presorted NewsStore queries at increasing corpus sizes.
+
+Usage:
+    python benchmarks/bench_news_store.py [sizes...]
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.models.news import NewsItem  # noqa: E402
+from app.services.news_store import NewsStore  # noqa: E402
+
+CATEGORIES = ["business", "technology", "science", "health", "politics"]
+SOURCES = ["BBC News", "CNN", "Reuters", "Associated Press", "The Washington Post"]
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+
+def make_items(count):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        NewsItem(
+            id=f"bench-{i}",
+            title=f"Benchmark article {i}",
+            url=f"https://example.com/{i}",
+            source=rng.choice(SOURCES),
+            category=rng.choice(CATEGORIES),
+            published_at=start + timedelta(seconds=rng.randrange(10_000_000)),
+        )
+        for i in range(count)
+    ]
+
+
+def linear_get_news(items, category=None, source=None, limit=10, skip=0):
+    """The pre-index implementation of NewsService.get_news"""
+    filtered = items
+    if category:
+        filtered = [item for item in filtered if item.category == category]
+    if source:
+        filtered = [item for item in filtered if item.source == source]
+    filtered.sort(key=lambda x: x.published_at, reverse=True)
+    return filtered[skip : skip + limit]
+
+
+def timeit(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(sizes):
+    print(f"{'items':>10} {'query':<22} {'linear (ms)':>12} {'indexed (ms)':>13}")
+    for size in sizes:
+        items = make_items(size)
+        build_start = time.perf_counter()
+        store = NewsStore(items)
+        build_ms = (time.perf_counter() - build_start) * 1000
+        repeat = max(1, 100_000 // size)
+        for label, kwargs in [
+            ("unfiltered", {}),
+            ("category", {"category": "science"}),
+            ("category+source", {"category": "science", "source": "CNN"}),
+        ]:
+            linear = timeit(lambda: linear_get_news(list(items), **kwargs), repeat)
+            indexed = timeit(lambda: store.query(**kwargs), 1000)
+            print(
+                f"{size:>10} {label:<22} {linear * 1000:>12.3f} {indexed * 1000:>13.4f}"
+            )
+        print(f"{size:>10} {'(index build, once)':<22} {'':>12} {build_ms:>13.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,99 @@
+"""Benchmark memory and get_news throughput: NewsItem vs compact Article.
+
+Measures retained bytes per cached article with tracemalloc, then the
+throughput of NewsService.get_news serving 20-item pages from a cache of
+pydantic NewsItem objects versus compact Article records, with and without
+encoding the response body.
+
+Usage:
+    python benchmarks/bench_records.py [count]
+"""
+
+import asyncio
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.models.news import NewsItem, NewsResponse  # noqa: E402
+from app.services.news_service import NewsService  # noqa: E402
+from app.services.news_store import NewsStore  # noqa: E402
+from app.services.records import Article  # noqa: E402
+
+CATEGORIES = ["business", "technology", "science", "health", "politics"]
+SOURCES = ["BBC News", "CNN", "Reuters", "Associated Press", "The Washington Post"]
+DEFAULT_COUNT = 50_000
+
+
+def raw_articles(count):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        yield {
+            "id": f"{i:016x}",
+            "title": f"Benchmark article {i} about markets and policy",
+            "description": f"Short description of benchmark article {i}",
+            "content": f"Body of article {i}. " * 10,
+            "url": f"https://example.com/news/{i}",
+            "image_url": f"https://example.com/img/{i}.jpg",
+            # Decoded JSON yields a fresh string object per article
+            "source": "".join(rng.choice(SOURCES)),
+            "category": "".join(rng.choice(CATEGORIES)),
+            "author": "Benchmark Author",
+            "published_at": start + timedelta(seconds=rng.randrange(10_000_000)),
+        }
+
+
+def bytes_per_article(factory, count):
+    data = list(raw_articles(count))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [factory(**fields) for fields in data]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+
+def get_news_throughput(service, serialize, seconds=1.0):
+    async def run():
+        requests = 0
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            for skip in range(0, 200, 20):
+                news = await service.get_news(category="science", limit=20, skip=skip)
+                if serialize:
+                    NewsResponse(count=len(news), news=news).model_dump_json()
+                requests += 1
+        return requests / seconds
+
+    return asyncio.run(run())
+
+
+def main(count):
+    print(
+        f"{'representation':<16} {'bytes/article':>14} {'get_news req/s':>15} "
+        f"{'+ JSON req/s':>13}"
+    )
+    service = NewsService.__new__(NewsService)
+    for label, factory in [("NewsItem", NewsItem), ("Article", Article)]:
+        per_article = bytes_per_article(factory, count)
+        service.store = NewsStore(factory(**fields) for fields in raw_articles(count))
+        service.history_truncated = False
+        service.archive = None
+        print(
+            f"{label:<16} {per_article:>14.0f} "
+            f"{get_news_throughput(service, serialize=False):>15.0f} "
+            f"{get_news_throughput(service, serialize=True):>13.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COUNT)
@@ -0,0 +1,116 @@
+"""Benchmark how long a refresh merge stalls the event loop.
+
+Runs a ticker coroutine that measures the worst delay between its ticks
+while a refresh merges new articles into a large store, either in place on
+the loop (the old behaviour) or copy-on-write: the indexes are copied and
+merged in a worker thread and published by swapping one reference. The
+remaining stalls are the worker holding the GIL between switch intervals.
+
+Usage:
+    python benchmarks/bench_refresh_stall.py [size] [new_items]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.models.news import NewsItem  # noqa: E402
+from app.services.news_store import NewsStore  # noqa: E402
+
+CATEGORIES = ["business", "technology", "science", "health", "politics"]
+SOURCES = [f"Source {i}" for i in range(20)]
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+DEFAULT_SIZE = 200_000
+DEFAULT_NEW = 2_000
+TICK = 0.001
+
+
+def make_items(rng, first, count, seconds):
+    return [
+        NewsItem(
+            id=f"bench-{i}",
+            title=f"Benchmark article {i}",
+            url=f"https://example.com/{i}",
+            source=rng.choice(SOURCES),
+            category=rng.choice(CATEGORIES),
+            published_at=START + timedelta(seconds=rng.randrange(seconds)),
+        )
+        for i in range(first, first + count)
+    ]
+
+
+async def worst_stall(refresh):
+    stop = asyncio.Event()
+    worst = 0.0
+
+    async def ticker():
+        nonlocal worst
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(TICK)
+            now = time.perf_counter()
+            worst = max(worst, now - last - TICK)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    await refresh()
+    total = time.perf_counter() - start
+    stop.set()
+    await task
+    return worst, total
+
+
+async def main(size, new_items):
+    rng = random.Random(42)
+    base = make_items(rng, 0, size, 10_000_000)
+    fresh = make_items(rng, size, new_items, 10_500_000)
+    # Expire roughly the oldest 1% while merging
+    cutoff = START + timedelta(seconds=100_000)
+    print(f"{size} cached items, {new_items} new, ~1% expiring")
+
+    store = NewsStore(base)
+
+    async def in_place():
+        store.merge(fresh, evict_before=cutoff)
+
+    stall, total = await worst_stall(in_place)
+    print(
+        f"{'in place':<16} worst stall {stall * 1000:7.1f} ms, "
+        f"refresh {total * 1000:7.1f} ms"
+    )
+
+    current = NewsStore(base)
+
+    async def copy_on_write():
+        nonlocal current
+
+        def merge():
+            next_store = current.copy()
+            next_store.merge(fresh, evict_before=cutoff)
+            return next_store
+
+        current = await asyncio.to_thread(merge)
+
+    stall, total = await worst_stall(copy_on_write)
+    print(
+        f"{'copy-on-write':<16} worst stall {stall * 1000:7.1f} ms, "
+        f"refresh {total * 1000:7.1f} ms"
+    )
+
+    start = time.perf_counter()
+    for _ in range(10):
+        current.copy()
+    print(f"{'(copy alone)':<16} {(time.perf_counter() - start) * 100:17.1f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    asyncio.run(main(*(args + [DEFAULT_SIZE, DEFAULT_NEW][len(args) :])))
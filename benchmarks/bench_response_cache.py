@@ -0,0 +1,139 @@
+"""Benchmark /api/news with and without the per-version response cache.
+
+Serves 100-item pages of a populated cache and reports the mean latency
+per request for an uncached build (query, models, JSON encoding), a cache
+hit and a 304 revalidation: once calling the route handler directly and
+once through the whole app (in-process TestClient, whose own overhead is
+a few ms per request).
+
+Usage:
+    python benchmarks/bench_response_cache.py [requests]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+_data = tempfile.mkdtemp()
+os.environ.setdefault("NEWS_STORAGE_FILE", os.path.join(_data, "news_cache.json"))
+os.environ.setdefault("NEWS_COLUMNS_FILE", "")
+os.environ.setdefault("NEWS_ARCHIVE_DIR", "")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+from app.models.news import NewsItem  # noqa: E402
+from app.routers import news  # noqa: E402
+from app.services.news_service import NewsService  # noqa: E402
+from app.services.response_cache import ResponseCache  # noqa: E402
+from main import app  # noqa: E402
+
+CATEGORIES = ["business", "technology", "science", "health", "politics"]
+DEFAULT_REQUESTS = 500
+CACHED_ITEMS = 20_000
+URL = "/api/news?limit=100&category=science"
+
+
+def make_items(count):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        NewsItem(
+            id=f"bench-{i}",
+            title=f"Benchmark article {i} about markets and policy",
+            description=f"Short description of benchmark article {i}",
+            content=f"Body of article {i}. " * 10,
+            url=f"https://example.com/news/{i}",
+            source=rng.choice(["BBC News", "CNN", "Reuters"]),
+            category=rng.choice(CATEGORIES),
+            author="Benchmark Author",
+            published_at=start + timedelta(seconds=rng.randrange(10_000_000)),
+        )
+        for i in range(count)
+    ]
+
+
+def per_request(client, count, headers=None):
+    start = time.perf_counter()
+    for _ in range(count):
+        response = client.get(URL, headers=headers or {})
+    return (time.perf_counter() - start) / count * 1000, response
+
+
+def handler_request(headers=None):
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/news",
+            "query_string": b"limit=100&category=science",
+            "headers": [
+                (key.lower().encode(), value.encode())
+                for key, value in (headers or {}).items()
+            ],
+        }
+    )
+
+
+def per_handler_call(news_service, count, headers=None):
+    async def run():
+        start = time.perf_counter()
+        for _ in range(count):
+            response = await news.get_news(
+                handler_request(headers),
+                category="science",
+                source=None,
+                limit=100,
+                skip=0,
+                fields=None,
+                from_=None,
+                to=None,
+                cursor=None,
+                news_service=news_service,
+            )
+        return (time.perf_counter() - start) / count * 1000, response
+
+    return asyncio.run(run())
+
+
+def main(count):
+    news_service = NewsService()
+    news_service.news_cache = make_items(CACHED_ITEMS)
+    app.state.news_service = news_service
+    client = TestClient(app)
+
+    rows = []
+    news_service.response_cache = ResponseCache(max_entries=0)
+    rows.append(per_handler_call(news_service, count)[0])
+    news_service.response_cache = ResponseCache()
+    rows.append(per_handler_call(news_service, count)[0])
+    etag = per_handler_call(news_service, 1)[1].headers["ETag"]
+    rows.append(per_handler_call(news_service, count, {"If-None-Match": etag})[0])
+
+    news_service.response_cache = ResponseCache(max_entries=0)
+    uncached, response = per_request(client, count)
+    size = len(response.content)
+
+    news_service.response_cache = ResponseCache()
+    client.get(URL)
+    hit, response = per_request(client, count)
+    etag = response.headers["ETag"]
+    revalidated, response = per_request(client, count, {"If-None-Match": etag})
+    assert response.status_code == 304
+
+    print(f"{CACHED_ITEMS} cached items, 100-item pages ({size / 1024:.0f} KiB)")
+    print(f"{'ms/request':<12} {'handler':>10} {'full app':>10}")
+    for label, handler, full in zip(
+        ("uncached", "cache hit", "304"), rows, (uncached, hit, revalidated)
+    ):
+        print(f"{label:<12} {handler:>10.3f} {full:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REQUESTS)
@@ -0,0 +1,80 @@
+"""Benchmark BM25 search over the in-memory SearchIndex.
+
+Builds an index over synthetic articles with a Zipf-distributed vocabulary
+and times queries made of rare, medium and common terms.
+
+Usage:
+    python benchmarks/bench_search.py [sizes...]
+"""
+
+import itertools
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.models.news import NewsItem  # noqa: E402
+from app.services.search import SearchIndex  # noqa: E402
+
+VOCABULARY = [f"term{i}" for i in range(50_000)]
+CUM_WEIGHTS = list(
+    itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY)))
+)
+DEFAULT_SIZES = [50_000, 500_000]
+QUERIES = {
+    "rare": "term20000 term30000",
+    "medium": "term500 term900",
+    "common": "term40 term70",
+}
+
+
+def make_items(count):
+    rng = random.Random(42)
+    published_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        words = rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=40)
+        yield NewsItem(
+            id=f"bench-{i}",
+            title=" ".join(words[:8]),
+            description=" ".join(words[8:]),
+            url=f"https://example.com/{i}",
+            source="Benchmark",
+            published_at=published_at,
+        )
+
+
+def timeit(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(sizes):
+    print(
+        f"{'items':>10} {'query':<8} {'matches':>9} "
+        f"{'first (ms)':>11} {'top-10 (ms)':>12} {'all (ms)':>9}"
+    )
+    for size in sizes:
+        start = time.perf_counter()
+        index = SearchIndex(make_items(size))
+        build_s = time.perf_counter() - start
+        for label, query in QUERIES.items():
+            # The first top-k query after a change sorts the term's postings
+            first = timeit(lambda: index.search(query, limit=10), 1)
+            top_k = timeit(lambda: index.search(query, limit=10), 20)
+            exhaustive = timeit(lambda: index.search(query), 3)
+            matches = len(index.search(query))
+            print(
+                f"{size:>10} {label:<8} {matches:>9} {first * 1000:>11.2f} "
+                f"{top_k * 1000:>12.2f} {exhaustive * 1000:>9.2f}"
+            )
+        print(f"{size:>10} {'(build)':<8} {'':>9} {build_s * 1000:>11.0f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,125 @@
+"""Benchmark coalescing identical concurrent generation requests.
+
+Simulates one GPU: a fake Ollama serves one completion at a time, each
+taking a fixed time (streamed as tokens for the streaming path). A burst
+of identical requests, like many users opening the frontend at once, is
+sent without and with coalescing. Reports upstream completions, mean
+and worst latency.
+
+Usage:
+    python benchmarks/bench_single_flight.py [clients] [completion_ms]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+from app.models.generation import NewsStyle, TimeFrame  # noqa: E402
+from app.services.generation_cache import GenerationCache  # noqa: E402
+from app.services.llm_service import LLMService  # noqa: E402
+
+DEFAULT_CLIENTS = 20
+DEFAULT_COMPLETION_MS = 100
+TOKENS = 20
+ARTICLES = json.dumps(
+    [
+        {
+            "title": "Future",
+            "content": "Body",
+            "predicted_date": "2030-01-01",
+            "source": "Tomorrow Times",
+        }
+    ]
+)
+
+
+def fake_ollama(completion_ms):
+    gpu = asyncio.Lock()
+    completions = []
+
+    async def tokens():
+        async with gpu:
+            completions.append(1)
+            for i in range(TOKENS):
+                await asyncio.sleep(completion_ms / 1000 / TOKENS)
+                yield (json.dumps({"response": f"t{i} "}) + "\n").encode()
+
+    async def handler(request):
+        if json.loads(request.content).get("stream"):
+            return httpx.Response(200, content=tokens())
+        async with gpu:
+            completions.append(1)
+            await asyncio.sleep(completion_ms / 1000)
+        return httpx.Response(200, json={"response": ARTICLES})
+
+    return handler, completions
+
+
+async def burst(clients, completion_ms, request):
+    handler, completions = fake_ollama(completion_ms)
+    client = httpx.AsyncClient(
+        base_url="http://ollama.test", transport=httpx.MockTransport(handler)
+    )
+    service = LLMService(client=client, cache=GenerationCache(max_entries=0))
+    latencies = []
+
+    async def one():
+        start = time.perf_counter()
+        await request(service)
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(clients)))
+    await service.close()
+    return len(completions), latencies
+
+
+async def direct(service):
+    await service.generate_future_news([], time_frame=TimeFrame.DAY)
+
+
+async def coalesced(service):
+    await service.generate_future_news_cached([], time_frame=TimeFrame.DAY)
+
+
+async def stream_direct(service):
+    prompt = service._create_prompt([], TimeFrame.DAY, NewsStyle.NEUTRAL)
+    async for _ in service._stream_completion(service.default_model, prompt):
+        pass
+
+
+async def stream_coalesced(service):
+    async for _ in service.stream_future_news([], time_frame=TimeFrame.DAY):
+        pass
+
+
+async def main(clients, completion_ms):
+    print(f"{clients} identical requests, {completion_ms} ms per completion, 1 GPU")
+    runs = (
+        ("generate", direct),
+        ("generate, coalesced", coalesced),
+        ("stream", stream_direct),
+        ("stream, coalesced", stream_coalesced),
+    )
+    for label, request in runs:
+        completions, latencies = await burst(clients, completion_ms, request)
+        mean = sum(latencies) / len(latencies) * 1000
+        print(
+            f"{label:<20} {completions:3} completions  "
+            f"mean {mean:7.0f} ms  worst {max(latencies) * 1000:7.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CLIENTS,
+            int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_COMPLETION_MS,
+        )
+    )
@@ -0,0 +1,78 @@
+"""Benchmark cold-start cache loading: JSON document vs binary snapshot.
+
+Measures the time from an existing cache file to a NewsStore ready to
+serve the first page, which is what NewsService pays on startup.
+
+Usage:
+    python benchmarks/bench_snapshot_load.py [sizes...]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.models.news import NewsItem  # noqa: E402
+from app.services.news_store import NewsStore  # noqa: E402
+from app.services.storage import (  # noqa: E402
+    JsonNewsStorage,
+    SnapshotNewsStorage,
+)
+
+CATEGORIES = ["business", "technology", "science", "health", "politics"]
+SOURCES = ["BBC News", "CNN", "Reuters", "Associated Press", "The Washington Post"]
+DEFAULT_SIZES = [10_000, 100_000]
+
+
+def make_items(count):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    body = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8
+    return [
+        NewsItem(
+            id=f"bench-{i}",
+            title=f"Benchmark article {i}",
+            description=f"Description of benchmark article {i}",
+            content=body,
+            url=f"https://example.com/{i}",
+            source=rng.choice(SOURCES),
+            category=rng.choice(CATEGORIES),
+            author="Benchmark Author",
+            published_at=start + timedelta(seconds=rng.randrange(10_000_000)),
+        )
+        for i in range(count)
+    ]
+
+
+def time_startup(storage):
+    start = time.perf_counter()
+    store = NewsStore(storage.load())
+    store.query(limit=10)
+    return time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'items':>10} {'backend':<10} {'file (MB)':>10} {'startup (ms)':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            items = make_items(size)
+            backends = [
+                ("json", JsonNewsStorage(os.path.join(directory, "n.json"), False)),
+                ("snapshot", SnapshotNewsStorage(os.path.join(directory, "n.snap"))),
+            ]
+            for name, storage in backends:
+                storage.save(items)
+                elapsed = min(time_startup(storage) for _ in range(3))
+                megabytes = os.path.getsize(storage.path) / 1e6
+                print(
+                    f"{size:>10} {name:<10} {megabytes:>10.1f} {elapsed * 1000:>13.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,85 @@
+"""Benchmark the streaming relay: per-token overhead and abort latency.
+
+Pushes tokens from an instant upstream through SSE framing and the
+disconnect-aware relay to measure the cost per token, then disconnects a
+client while the upstream is waiting on its next token and measures how
+long it takes until the upstream request is closed.
+
+Usage:
+    python benchmarks/bench_streaming.py [tokens]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("NEWSAPI_API_KEY", "benchmark")
+
+from app.models.generation import StreamFormat  # noqa: E402
+from app.services.streaming import frame_tokens, relay_until_disconnect  # noqa: E402
+
+DEFAULT_TOKENS = 20_000
+# Gap between tokens while measuring the abort; a model mid-generation
+TOKEN_INTERVAL = 0.05
+ABORT_TRIALS = 20
+
+
+class Client:
+    def __init__(self):
+        self.gone = asyncio.Event()
+
+    async def receive(self):
+        await self.gone.wait()
+        return {"type": "http.disconnect"}
+
+
+async def upstream(count, interval=0.0, closed=None):
+    try:
+        for i in range(count):
+            if interval:
+                await asyncio.sleep(interval)
+            yield f" token{i}"
+    finally:
+        if closed is not None:
+            closed.append(time.perf_counter())
+
+
+async def per_token(count):
+    start = time.perf_counter()
+    relay = relay_until_disconnect(
+        Client(), frame_tokens(upstream(count), StreamFormat.SSE)
+    )
+    async for _ in relay:
+        pass
+    return (time.perf_counter() - start) / count * 1e6
+
+
+async def abort_latency():
+    client, closed = Client(), []
+    frames = frame_tokens(upstream(10**6, TOKEN_INTERVAL, closed), StreamFormat.SSE)
+
+    async def consume():
+        async for _ in relay_until_disconnect(client, frames):
+            pass
+
+    task = asyncio.ensure_future(consume())
+    await asyncio.sleep(TOKEN_INTERVAL * 2.5)
+    gone_at = time.perf_counter()
+    client.gone.set()
+    await task
+    return (closed[0] - gone_at) * 1000
+
+
+async def main(count):
+    print(f"relay overhead       {await per_token(count):8.1f} us/token")
+    latencies = [await abort_latency() for _ in range(ABORT_TRIALS)]
+    print(
+        f"disconnect -> abort  {max(latencies):8.3f} ms worst "
+        f"(token every {TOKEN_INTERVAL * 1000:.0f} ms)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TOKENS))
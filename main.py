@@ -12,6 +12,8 @@ from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
 from app.routers import news, generation, frontend
+from app.services.llm_service import LLMService
+from app.services.news_service import NewsService
 from app.services.scheduler import start_scheduler, shutdown_scheduler
 
 logging.basicConfig(
@@ -26,15 +28,21 @@ STATIC_DIR = BASE_DIR / "static"
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Shared services, reused by every request and by the scheduler
+    app.state.news_service = NewsService()
+    app.state.llm_service = LLMService()
+
     # Start background tasks
     logger.info("Starting scheduler for news fetching...")
-    start_scheduler()
+    start_scheduler(app.state.news_service)
     
     yield
     
     # Clean up resources
     logger.info("Shutting down scheduler...")
     shutdown_scheduler()
+    await app.state.news_service.close()
+    await app.state.llm_service.close()
 
 
 app = FastAPI(
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Script to import an existing JSON news cache into the SQLite storage backend.
+"""
+import argparse
+import logging
+import os
+import sys
+
+# Add the parent directory to sys.path to allow importing app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.services.storage import JsonNewsStorage, SqliteNewsStorage  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+
+def migrate(json_path: str, db_path: str) -> int:
+    """Upsert every item of the JSON cache into the SQLite database."""
+    if not os.path.exists(json_path):
+        logging.error(f"JSON cache not found: {json_path}")
+        return 1
+
+    items = JsonNewsStorage(json_path).load()
+    storage = SqliteNewsStorage(db_path)
+    try:
+        storage.save(items)
+        logging.info(
+            f"Imported {len(items)} items from {json_path} into {db_path} "
+            f"({storage.count()} items stored)"
+        )
+    finally:
+        storage.close()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--json", default=settings.NEWS_STORAGE_FILE, help="Path of the JSON cache"
+    )
+    parser.add_argument(
+        "--db", default=settings.NEWS_STORAGE_DB, help="Path of the SQLite database"
+    )
+    args = parser.parse_args()
+    return migrate(args.json, args.db)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.news import NewsItem
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_item(index=1, category="politics", source="CNN", **fields) -> NewsItem:
+    """Test article `item-<index>`, published `index` hours after BASE_TIME
+
+    Any other NewsItem field, `id` and `published_at` included, can be
+    given as a keyword argument to override the default.
+    """
+    values = {
+        "id": f"item-{index}",
+        "title": f"News {index}",
+        "url": f"https://example.com/{index}",
+        "source": source,
+        "category": category,
+        "published_at": BASE_TIME + timedelta(hours=index),
+    }
+    values.update(fields)
+    return NewsItem(**values)
@@ -4,12 +4,27 @@ from unittest.mock import patch, MagicMock
 import json
 
 from main import app
+from app.models.generation import GeneratedNewsItem
 from app.models.news import NewsItem
 from datetime import datetime
 
 
 @pytest.fixture
-def client():
+def client(tmp_path, monkeypatch):
+    from app.config import settings
+
+    # Keep the service's cache, columns and archive out of the working tree
+    monkeypatch.setattr(settings, "NEWS_STORAGE_FILE", str(tmp_path / "news.json"))
+    monkeypatch.setattr(settings, "NEWS_SNAPSHOT_FILE", str(tmp_path / "news.snap"))
+    monkeypatch.setattr(settings, "NEWS_STORAGE_DB", str(tmp_path / "news.db"))
+    monkeypatch.setattr(settings, "NEWS_COLUMNS_FILE", str(tmp_path / "columns.bin"))
+    monkeypatch.setattr(settings, "NEWS_ARCHIVE_DIR", str(tmp_path / "archive"))
+    # The service is created lazily on first use; start each test afresh so
+    # it picks up these paths and holds no responses from earlier tests
+    app.state.news_service = None
+    llm_service = getattr(app.state, "llm_service", None)
+    if llm_service is not None:
+        llm_service.cache.clear()
     return TestClient(app)
 
 
@@ -114,6 +129,26 @@ def test_get_sources(mock_get_sources, client):
     assert "Test Source 2" in data
 
 
+@patch("app.services.news_service.NewsService.get_facets")
+def test_facets_endpoint(mock_get_facets, client):
+    from app.models.news import Facet, NewsFacets
+
+    mock_get_facets.return_value = NewsFacets(
+        total=3,
+        sources=[Facet(value="CNN", count=3, newest="2024-01-01T12:00:00Z")],
+        categories=[Facet(value="politics", count=3)],
+    )
+
+    response = client.get("/api/news/facets")
+    assert response.status_code == 200
+    assert response.json()["total"] == 3
+    assert response.json()["sources"][0]["value"] == "CNN"
+    assert response.json()["categories"] == [
+        {"value": "politics", "count": 3, "newest": None}
+    ]
+    assert "ETag" in response.headers
+
+
 @patch("app.services.llm_service.LLMService.generate_future_news")
 @patch("app.services.news_service.NewsService.get_news")
 def test_generate_future_news(mock_get_news, mock_generate, client, mock_news_items):
@@ -121,13 +156,13 @@ def test_generate_future_news(mock_get_news, mock_generate, client, mock_news_it
     
     # Mock the LLM response
     mock_generate.return_value = [
-        {
-            "title": "Future News Title",
-            "content": "Future news content",
-            "predicted_date": datetime.now(),
-            "source": "AI News Generator",
-            "category": "politics",
-        }
+        GeneratedNewsItem(
+            title="Future News Title",
+            content="Future news content",
+            predicted_date=datetime.now(),
+            source="Tomorrow Times",
+            category="politics",
+        )
     ]
     
     request_data = {
@@ -139,12 +174,86 @@ def test_generate_future_news(mock_get_news, mock_generate, client, mock_news_it
     
     response = client.post("/api/generation", json=request_data)
     assert response.status_code == 200
+    assert response.headers["Cache-Status"].endswith("fwd=miss")
     
     data = response.json()
     assert "generated_news" in data
     assert len(data["generated_news"]) > 0
     assert "time_frame" in data
     assert data["time_frame"] == "week"
+    
+    # The same context and parameters are answered from the cache
+    response = client.post("/api/generation", json=request_data)
+    assert response.headers["Cache-Status"].endswith("; hit")
+    assert response.json()["generated_news"] == data["generated_news"]
+    mock_generate.assert_awaited_once()
+
+
+@patch("app.services.llm_service.LLMService.stream_future_news")
+@patch("app.services.news_service.NewsService.get_news")
+def test_stream_future_news_as_sse_and_ndjson(
+    mock_get_news, mock_stream, client, mock_news_items
+):
+    mock_get_news.return_value = mock_news_items
+
+    async def tokens(**kwargs):
+        for token in ("Future", " news"):
+            yield token
+
+    mock_stream.side_effect = tokens
+    request_data = {"time_frame": "day"}
+
+    response = client.post("/api/generation/stream", json=request_data)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.split("\n\n")[:3] == [
+        'event: token\ndata: {"token":"Future"}',
+        'event: token\ndata: {"token":" news"}',
+        "event: done\ndata: {}",
+    ]
+
+    response = client.post(
+        "/api/generation/stream",
+        json=request_data,
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    frames = [json.loads(line) for line in response.text.splitlines()]
+    assert [frame["event"] for frame in frames] == ["token", "token", "done"]
+
+
+@patch("app.services.llm_service.LLMService.stream_future_news")
+@patch("app.services.news_service.NewsService.get_news")
+def test_stream_future_articles(mock_get_news, mock_stream, client, mock_news_items):
+    mock_get_news.return_value = mock_news_items
+    article = {
+        "title": "Future News Title",
+        "content": "Future news content",
+        "predicted_date": "2030-01-01T00:00:00",
+        "source": "AI News Generator",
+        "category": "politics",
+    }
+    completion = json.dumps([article, article])
+
+    async def tokens(*args, **kwargs):
+        for start in range(0, len(completion), 4):
+            yield completion[start:start + 4]
+
+    mock_stream.side_effect = tokens
+
+    response = client.post("/api/generation/stream/articles?format=ndjson", json={})
+    assert response.status_code == 200
+    frames = [json.loads(line) for line in response.text.splitlines()]
+    assert [frame["event"] for frame in frames] == ["article", "article", "done"]
+    assert frames[0]["article"] == article
+
+
+@patch("app.services.news_service.NewsService.get_news")
+def test_stream_future_news_without_context(mock_get_news, client):
+    mock_get_news.return_value = []
+
+    response = client.post("/api/generation/stream?format=ndjson", json={})
+    assert response.status_code == 404
 
 
 @patch("app.services.llm_service.LLMService.list_available_models")
@@ -159,3 +268,259 @@ def test_get_available_models(mock_list_models, client):
     assert "llama3" in data
     assert "mistral" in data
     assert "phi3" in data
+
+
+def test_llm_service_is_shared_between_requests(client):
+    from app.services.llm_service import get_llm_service
+
+    app.state.llm_service = None
+    request = MagicMock()
+    request.app = app
+
+    first = get_llm_service(request)
+    assert get_llm_service(request) is first
+
+    response = client.get("/api/generation/stats")
+    assert response.status_code == 200
+    assert response.json()["max_connections"] == first.stats().max_connections
+    assert response.json()["in_flight"] == 0
+
+
+@patch("app.services.news_service.NewsService._load_cache")
+def test_news_service_is_shared_between_requests(mock_load_cache, client):
+    from app.services.news_service import get_news_service
+
+    app.state.news_service = None
+    request = MagicMock()
+    request.app = app
+
+    first = get_news_service(request)
+    second = get_news_service(request)
+
+    assert first is second
+    assert app.state.news_service is first
+    mock_load_cache.assert_called_once()
+    app.state.news_service = None
+
+
+@patch("app.services.news_service.NewsService.get_news_item")
+def test_get_news_item_endpoint(mock_get_news_item, client, mock_news_items):
+    mock_get_news_item.return_value = mock_news_items[0]
+
+    response = client.get("/api/news/test-1")
+    assert response.status_code == 200
+    assert response.json()["title"] == "Test News 1"
+
+    mock_get_news_item.return_value = None
+    response = client.get("/api/news/missing")
+    assert response.status_code == 404
+
+
+@patch("app.services.news_service.NewsService.search_news")
+def test_search_news_endpoint(mock_search_news, client, mock_news_items):
+    mock_search_news.return_value = [mock_news_items[1]]
+
+    response = client.get("/api/news/search?q=test+news&limit=5")
+    assert response.headers["X-News-Version"].isdigit()
+    assert response.status_code == 200
+    data = response.json()
+    assert data["query"] == "test news"
+    assert data["count"] == 1
+    assert data["news"][0]["id"] == "test-2"
+    mock_search_news.assert_awaited_once_with(
+        "test news", category=None, source=None, limit=5, skip=0
+    )
+
+    assert client.get("/api/news/search").status_code == 422
+
+
+@patch("app.services.llm_service.LLMService.generate_future_news")
+@patch("app.services.news_service.NewsService.search_news")
+def test_generate_uses_search_for_query(
+    mock_search_news, mock_generate, client, mock_news_items
+):
+    mock_search_news.return_value = mock_news_items
+    mock_generate.return_value = []
+
+    response = client.post(
+        "/api/generation", json={"query": "elections", "context_size": 3}
+    )
+    assert response.status_code == 200
+    assert response.json()["context_used"] == 2
+    mock_search_news.assert_awaited_once_with(
+        "elections", category=None, source=None, limit=3
+    )
+
+
+@patch("app.services.news_service.NewsService.get_stats")
+def test_stats_endpoint(mock_get_stats, client):
+    from app.models.news import CacheStats
+
+    mock_get_stats.return_value = CacheStats(
+        items=2, resident_bytes=1024, categories={"politics": 2}, max_items=100
+    )
+
+    response = client.get("/api/news/stats")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"] == 2
+    assert data["max_items"] == 100
+    assert data["evicted_trimmed"] == 0
+
+
+@patch("app.services.news_service.NewsService.get_news_fields")
+def test_get_news_field_projection(mock_get_news_fields, client):
+    published = datetime(2024, 1, 1)
+    mock_get_news_fields.return_value = [
+        {"id": "test-1", "title": "Test News 1", "published_at": published}
+    ]
+
+    response = client.get("/api/news?fields=title, published_at,title")
+    assert response.status_code == 200
+    data = response.json()
+    assert data == {
+        "count": 1,
+        "news": [
+            {
+                "id": "test-1",
+                "title": "Test News 1",
+                "published_at": "2024-01-01T00:00:00",
+            }
+        ],
+        "next_cursor": None,
+    }
+    mock_get_news_fields.assert_called_once_with(
+        ["id", "title", "published_at"],
+        category=None,
+        source=None,
+        limit=10,
+        skip=0,
+        since=None,
+        until=None,
+        cursor=None,
+    )
+
+
+def test_get_news_rejects_unknown_fields(client):
+    response = client.get("/api/news?fields=title,password")
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+@patch("app.services.news_service.NewsService.get_news")
+def test_get_news_time_range(mock_get_news, client, mock_news_items):
+    mock_get_news.return_value = mock_news_items
+
+    response = client.get("/api/news?from=2024-01-01T00:00:00Z&to=2024-02-01")
+    assert response.status_code == 200
+    kwargs = mock_get_news.call_args.kwargs
+    assert kwargs["since"].isoformat() == "2024-01-01T00:00:00+00:00"
+    assert kwargs["until"].date().isoformat() == "2024-02-01"
+
+    response = client.get("/api/news?from=2024-02-01&to=2024-01-01")
+    assert response.status_code == 400
+
+
+@patch("app.services.news_service.NewsService.get_archive_partitions")
+def test_archive_endpoint(mock_get_partitions, client):
+    from app.models.news import ArchivePartition
+
+    mock_get_partitions.return_value = [
+        ArchivePartition(
+            day="2024-01-01", count=3, sealed=True, categories={"politics": 3}
+        )
+    ]
+
+    response = client.get("/api/news/archive?from=2024-01-01")
+    assert response.status_code == 200
+    assert response.json()[0]["day"] == "2024-01-01"
+    assert response.json()[0]["categories"] == {"politics": 3}
+
+
+@patch("app.services.llm_service.LLMService.generate_future_news")
+@patch("app.services.news_service.NewsService.get_news")
+@patch("app.services.news_service.NewsService.sample_history")
+def test_generate_year_horizon_samples_history(
+    mock_sample_history, mock_get_news, mock_generate, client, mock_news_items
+):
+    mock_sample_history.return_value = mock_news_items
+    mock_generate.return_value = []
+
+    response = client.post(
+        "/api/generation", json={"time_frame": "year", "context_size": 4}
+    )
+    assert response.status_code == 200
+    assert response.json()["context_used"] == 2
+    mock_get_news.assert_not_called()
+    kwargs = mock_sample_history.call_args.kwargs
+    assert kwargs["limit"] == 4
+    assert (datetime.now(kwargs["since"].tzinfo) - kwargs["since"]).days == 365
+
+
+@patch("app.services.news_service.NewsService.next_cursor")
+@patch("app.services.news_service.NewsService.get_news")
+def test_get_news_cursor_pagination(
+    mock_get_news, mock_next_cursor, client, mock_news_items
+):
+    from app.services.news_store import encode_cursor
+
+    mock_get_news.return_value = mock_news_items
+    mock_next_cursor.return_value = "next-page"
+    cursor = encode_cursor(3, mock_news_items[0])
+
+    response = client.get(f"/api/news?limit=2&cursor={cursor}")
+    assert response.status_code == 200
+    assert response.json()["next_cursor"] == "next-page"
+    assert mock_get_news.call_args.kwargs["cursor"] == cursor
+    mock_next_cursor.assert_called_once_with(mock_news_items, 2, cursor)
+    assert response.headers["X-News-Version"].isdigit()
+
+    assert client.get("/api/news?cursor=garbage").status_code == 400
+    response = client.get(f"/api/news?cursor={cursor}&from=2024-01-01")
+    assert response.status_code == 400
+
+
+@patch("app.services.news_service.NewsService.get_news")
+def test_news_responses_are_cached_per_version(mock_get_news, client, mock_news_items):
+    mock_get_news.return_value = mock_news_items
+
+    first = client.get("/api/news?category=politics&limit=2")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"].startswith(("public", "no-cache"))
+
+    # Same query, same version: served from the cache, parameter order aside
+    second = client.get("/api/news?limit=2&category=politics")
+    assert second.content == first.content
+    assert second.headers["ETag"] == etag
+    assert mock_get_news.call_count == 1
+
+    not_modified = client.get(
+        "/api/news?category=politics&limit=2", headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    # Publishing a new version invalidates the entry
+    news_service = app.state.news_service
+    news_service.news_cache = news_service.news_cache
+    mock_get_news.return_value = mock_news_items[:1]
+    refreshed = client.get(
+        "/api/news?category=politics&limit=2", headers={"If-None-Match": etag}
+    )
+    assert refreshed.status_code == 200
+    assert refreshed.json()["count"] == 1
+    assert refreshed.headers["ETag"] != etag
+    assert mock_get_news.call_count == 2
+
+
+@patch("app.services.news_service.NewsService.get_categories")
+def test_categories_answer_if_none_match(mock_get_categories, client):
+    mock_get_categories.return_value = ["politics"]
+
+    response = client.get("/api/news/categories")
+    etag = response.headers["ETag"]
+    response = client.get("/api/news/categories", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    mock_get_categories.assert_awaited_once()
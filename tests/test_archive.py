@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+
+from app.services.archive import NewsArchive, partition_day
+from app.services.snapshot import LazyNewsItem
+from tests.conftest import make_item
+
+NOW = datetime(2024, 1, 10, 12, tzinfo=timezone.utc)
+
+
+def archived(day, hour, index=0, **fields):
+    return make_item(
+        id=f"item-{day}-{hour}-{index}",
+        published_at=datetime(2024, 1, day, hour, tzinfo=timezone.utc),
+        **fields,
+    )
+
+
+def filled_archive(path):
+    archive = NewsArchive(str(path), fsync=False)
+    archive.add(
+        [archived(day, hour) for day in (1, 2, 3) for hour in (6, 12, 18)]
+        + [archived(2, 9, category="business", source="BBC News")]
+    )
+    return archive
+
+
+def test_days_seal_after_grace_period(tmp_path):
+    archive = NewsArchive(str(tmp_path), grace=timedelta(hours=6), fsync=False)
+    archive.add([archived(9, 12), archived(10, 8)])
+
+    assert archive.seal(datetime(2024, 1, 10, 5, tzinfo=timezone.utc)) == []
+    assert archive.seal(NOW) == [datetime(2024, 1, 9).date()]
+    assert (tmp_path / "2024-01-09.snap").exists()
+    assert not (tmp_path / "2024-01-09.open.jsonl").exists()
+    assert (tmp_path / "2024-01-10.open.jsonl").exists()
+
+    # Sealed days are immutable; late articles are counted, not written
+    assert archive.add([archived(9, 23)]) == 0
+    assert archive.late_dropped == 1
+    assert len(archive) == 2
+
+
+def test_partition_summaries_are_precomputed_at_seal(tmp_path):
+    archive = filled_archive(tmp_path)
+    archive.seal(NOW)
+
+    reopened = NewsArchive(str(tmp_path), fsync=False)
+    day2 = reopened.partitions(
+        since=datetime(2024, 1, 2, tzinfo=timezone.utc),
+        until=datetime(2024, 1, 3, tzinfo=timezone.utc),
+    )
+    assert len(day2) == 1
+    assert day2[0].sealed and day2[0].count == 4
+    assert day2[0].categories == {"politics": 3, "business": 1}
+    assert day2[0].sources == {"CNN": 3, "BBC News": 1}
+    assert day2[0].last_published.hour == 18
+    # Summaries come from the manifest without mapping any segment
+    assert not reopened._mapped
+
+
+def test_query_reads_only_partitions_in_range(tmp_path):
+    archive = filled_archive(tmp_path)
+    archive.seal(NOW)
+
+    news = archive.query(
+        since=datetime(2024, 1, 2, 9, tzinfo=timezone.utc),
+        until=datetime(2024, 1, 3, 12, tzinfo=timezone.utc),
+        limit=10,
+    )
+    assert [item.id for item in news] == [
+        "item-3-6-0",
+        "item-2-18-0",
+        "item-2-12-0",
+        "item-2-9-0",
+    ]
+    assert all(isinstance(item, LazyNewsItem) for item in news)
+    assert set(archive._mapped) == {
+        partition_day(news[0].published_at),
+        partition_day(news[-1].published_at),
+    }
+
+
+def test_query_pages_and_filters_across_days(tmp_path):
+    archive = filled_archive(tmp_path)
+    archive.seal(NOW)
+    archive.add([archived(10, 6)])  # still open
+
+    everything = archive.query(limit=100)
+    assert len(everything) == 11
+    assert everything[0].id == "item-10-6-0"
+    assert archive.query(limit=3, skip=4) == everything[4:7]
+
+    # Whole days are skipped by their summary counts alone
+    archive._mapped.clear()
+    page = archive.query(category="politics", limit=2, skip=4)
+    assert [item.id for item in page] == ["item-2-18-0", "item-2-12-0"]
+    assert list(archive._mapped) == [partition_day(page[0].published_at)]
+
+    assert archive.query(source="BBC News")[0].category == "business"
+    assert archive.query(category="science") == []
+
+
+def test_reopen_recovers_open_days_and_skips_torn_lines(tmp_path):
+    archive = NewsArchive(str(tmp_path), fsync=False)
+    item = archived(10, 6)
+    archive.add([item])
+    archive.add([item.model_copy(update={"title": "Updated"})])
+    with open(tmp_path / "2024-01-10.open.jsonl", "a") as f:
+        f.write('{"id": "torn')
+
+    reopened = NewsArchive(str(tmp_path), fsync=False)
+    assert [i.title for i in reopened.query()] == ["Updated"]
+    assert reopened.backfill([item, archived(10, 7)]) == 1
+    assert len(reopened) == 2
+
+
+def test_sample_spreads_over_days(tmp_path):
+    archive = filled_archive(tmp_path)
+    archive.seal(NOW)
+
+    sample = archive.sample(limit=3)
+    assert sorted(item.published_at.day for item in sample) == [1, 2, 3]
+    assert [item.published_at.hour for item in sample] == [18, 18, 18]
+
+    assert len(archive.sample(limit=5, category="politics")) == 5
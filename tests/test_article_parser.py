@@ -0,0 +1,82 @@
+import json
+
+from app.services.article_parser import ArticleStreamParser, parse_articles
+
+
+def article(index, **overrides):
+    values = {
+        "title": f"Future headline {index}",
+        "content": f"Body {index}",
+        "predicted_date": "2030-01-02",
+        "source": "Tomorrow Times",
+        "category": "science",
+    }
+    values.update(overrides)
+    return values
+
+
+def feed_in_pieces(text, size):
+    parser = ArticleStreamParser()
+    emitted = []
+    for start in range(0, len(text), size):
+        emitted.append(len(parser.feed(text[start : start + size])))
+    return parser, emitted
+
+
+def test_articles_are_emitted_as_soon_as_they_close():
+    first = json.dumps(article(1))
+    text = f"[{first}, {json.dumps(article(2))}]"
+    parser = ArticleStreamParser()
+
+    assert parser.feed(text[: len(first)]) == []
+    [item] = parser.feed(text[len(first) : len(first) + 2])
+    assert item.title == "Future headline 1"
+    assert [item.title for item in parser.feed(text[len(first) + 2 :])] == [
+        "Future headline 2"
+    ]
+
+
+def test_one_character_at_a_time_with_braces_and_escapes_in_strings():
+    tricky = article(1, content='He said "{not an object}" \\ then } left')
+    text = "[" + json.dumps(tricky) + "," + json.dumps(article(2)) + "]"
+    parser, emitted = feed_in_pieces(text, 1)
+
+    assert sum(emitted) == 2
+    assert parse_articles(text)[0].content == tricky["content"]
+
+
+def test_escape_split_from_the_escaped_quote():
+    text = json.dumps([article(1, title='A \\"quoted\\" {title}')])
+    backslash = text.index("\\\\")
+    parser = ArticleStreamParser()
+
+    assert parser.feed(text[: backslash + 1]) == []
+    [item] = parser.feed(text[backslash + 1 :])
+    assert item.title == 'A \\"quoted\\" {title}'
+
+
+def test_prose_and_fences_around_the_array_are_ignored():
+    text = (
+        'Sure! Here are "three" articles:\n```json\n'
+        + json.dumps([article(1), article(2)], indent=2)
+        + "\n```\nEnjoy {the future}."
+    )
+    assert [item.title for item in parse_articles(text)] == [
+        "Future headline 1",
+        "Future headline 2",
+    ]
+
+
+def test_invalid_objects_are_skipped():
+    missing_title = {key: value for key, value in article(2).items() if key != "title"}
+    text = (
+        f'[{json.dumps(article(1))}, {{"title": oops}}, '
+        f"{json.dumps(missing_title)}, {json.dumps(article(3))}]"
+    )
+    parser = ArticleStreamParser()
+
+    assert [item.title for item in parser.feed(text)] == [
+        "Future headline 1",
+        "Future headline 3",
+    ]
+    assert parser.skipped == 2
@@ -0,0 +1,46 @@
+from app.services.classifier import CategoryClassifier
+
+
+def test_classify_matches_url_or_title():
+    classifier = CategoryClassifier(["business", "technology"])
+
+    assert classifier.classify("https://x.com/technology/1", "Chips") == "technology"
+    assert classifier.classify("https://x.com/1", "Business Leaders Meet") == "business"
+    assert classifier.classify("https://x.com/1", "Weather") is None
+
+
+def test_first_configured_category_wins():
+    classifier = CategoryClassifier(["business", "technology"])
+
+    # "technology" appears first in the text but "business" is listed first
+    result = classifier.classify("https://x.com/technology/1", "Business as usual")
+    assert result == "business"
+
+
+def test_synonyms_map_to_their_category():
+    classifier = CategoryClassifier(
+        ["science", "technology"], {"technology": ["software", " AI-chip "]}
+    )
+
+    assert (
+        classifier.classify("https://x.com/1", "New SOFTWARE release") == "technology"
+    )
+    assert classifier.classify("https://x.com/1", "An ai-chip shortage") == "technology"
+
+
+def test_classify_batch_keeps_articles_apart():
+    classifier = CategoryClassifier(["health", "politics"])
+    result = classifier.classify_batch(
+        [
+            ("https://x.com/health/1", "Flu season"),
+            ("https://x.com/2", "Election results"),
+            ("https://x.com/3", "politics"),
+            ("", ""),
+        ]
+    )
+
+    assert result == ["health", None, "politics", None]
+
+
+def test_classifier_without_categories():
+    assert CategoryClassifier([]).classify_batch([("a", "b")]) == [None]
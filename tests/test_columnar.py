@@ -0,0 +1,70 @@
+import io
+from datetime import timedelta
+
+import pytest
+
+from app.services.columnar import ColumnsFormatError, NewsColumns
+from tests.conftest import BASE_TIME, make_item
+
+
+def make_items():
+    # Newest first, like the store
+    return [
+        make_item(
+            i,
+            source=["CNN", "BBC", "Reuters"][i % 3],
+            category=None if i == 4 else ["politics", "science"][i % 2],
+        )
+        for i in reversed(range(6))
+    ]
+
+
+def test_masks_and_selects_newest_first():
+    columns = NewsColumns.from_items(make_items())
+
+    assert len(columns) == 6
+    assert columns.select(category="politics") == ["item-2", "item-0"]
+    assert columns.select(source="CNN", limit=1) == ["item-3"]
+    assert columns.select(
+        since=BASE_TIME + timedelta(hours=1), until=BASE_TIME + timedelta(hours=3)
+    ) == ["item-2", "item-1"]
+    assert columns.select(limit=2, skip=1) == ["item-4", "item-3"]
+    assert columns.select(category="missing") == []
+
+
+def test_counts_skip_missing_categories():
+    columns = NewsColumns.from_items(make_items())
+
+    assert columns.count_by("source") == {"Reuters": 2, "BBC": 2, "CNN": 2}
+    assert columns.count_by("category") == {"science": 3, "politics": 2}
+    mask = columns.mask(source="CNN")
+    assert columns.count_by("category", mask) == {"science": 1, "politics": 1}
+    with pytest.raises(ValueError):
+        columns.count_by("author")
+
+
+def test_file_round_trip_is_memory_mapped(tmp_path):
+    items = make_items()
+    path = str(tmp_path / "columns.bin")
+    NewsColumns.from_items(items).save(path, fsync=False)
+
+    columns = NewsColumns.open(path)
+    assert not columns.published.flags.writeable
+    assert columns.matches(items)
+    assert not columns.matches(items[1:])
+    # Same count and ends, different rows in between
+    assert not columns.matches([items[0], items[2], items[1], *items[3:]])
+    assert columns.select(category="science") == ["item-5", "item-3", "item-1"]
+    assert columns.count_by("source") == {"Reuters": 2, "BBC": 2, "CNN": 2}
+
+
+def test_rejects_foreign_files():
+    buffer = io.BytesIO()
+    NewsColumns.from_items(make_items()).write(buffer)
+    data = bytearray(buffer.getvalue())
+
+    with pytest.raises(ColumnsFormatError):
+        NewsColumns.from_buffer(b"nope")
+    data[8] = 9
+    with pytest.raises(ColumnsFormatError, match="version 9"):
+        NewsColumns.from_buffer(bytes(data))
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+
+from app.services.compression import PLAIN_CODEC, ContentCodec
+from app.services.records import Article
+
+BODIES = [
+    f"The central bank said on day {i} that interest rates would stay "
+    f"unchanged as inflation continued to ease across the economy, "
+    f"officials told reporters in the capital."
+    for i in range(60)
+]
+
+
+def test_short_and_missing_texts_stay_plain():
+    codec = ContentCodec.train(BODIES)
+
+    assert codec.encode(None) is None
+    assert codec.encode("Short text") == "Short text"
+    assert codec.decode("Short text") == "Short text"
+
+
+def test_trained_dictionary_shrinks_bodies():
+    codec = ContentCodec.train(BODIES)
+    body = BODIES[0]
+
+    plain = PLAIN_CODEC.encode(body)
+    trained = codec.encode(body)
+    assert codec.trained and not PLAIN_CODEC.trained
+    assert isinstance(trained, bytes)
+    assert len(trained) < len(plain) < len(body.encode("utf-8"))
+    assert codec.decode(trained) == body
+    assert PLAIN_CODEC.decode(plain) == body
+
+
+def test_dictionary_respects_size_limit():
+    codec = ContentCodec.train(BODIES, size=128)
+    assert 0 < len(codec.zdict) <= 128
+
+
+def test_article_decompresses_bodies_on_access():
+    codec = ContentCodec.train(BODIES)
+    article = Article(
+        id="a",
+        title="Rates unchanged",
+        url="https://example.com/a",
+        source="Reuters",
+        published_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        description=BODIES[1],
+        content=BODIES[2],
+        codec=codec,
+    )
+
+    assert isinstance(article._description, bytes)
+    assert article.description == BODIES[1]
+    assert article.content == BODIES[2]
+    assert article.estimated_size() < len(BODIES[1]) + len(BODIES[2])
+    assert article.replace(title="New title").content == BODIES[2]
+    assert article.materialize().description == BODIES[1]
@@ -0,0 +1,114 @@
+import io
+
+from app.services.dedup import MinHashIndex, NearDuplicateDetector, minhash, similarity
+from app.services.records import Article
+from app.services.snapshot import read_snapshot, write_snapshot
+from tests.conftest import make_item
+
+
+def test_minhash_similarity_tracks_word_overlap():
+    a = minhash("Fed raises interest rates by a quarter point amid inflation fears")
+    b = minhash("Fed raises interest rates by quarter point amid inflation worries")
+    c = minhash("Apple unveils new iPhone at September event")
+
+    assert similarity(a, a) == 1.0
+    assert similarity(a, b) > 0.6
+    assert similarity(a, c) < 0.3
+    assert minhash("Same words") == minhash("same   WORDS!")
+
+
+def test_index_finds_similar_and_forgets_removed():
+    index = MinHashIndex(0.6)
+    index.add("fed", minhash("Fed raises interest rates amid inflation fears"))
+    index.add("apple", minhash("Apple unveils new iPhone at September event"))
+
+    query = minhash("Fed raises interest rates amid inflation fears, Reuters")
+    assert index.find(query) == "fed"
+    assert index.find(minhash("Volcano erupts in Iceland")) is None
+
+    index.remove("fed")
+    assert index.find(query) is None
+    assert len(index) == 1
+
+
+def test_detector_keeps_one_canonical_per_cluster():
+    detector = NearDuplicateDetector(0.6)
+    store = {}
+    batch = [
+        make_item(id="a", title="Fed raises interest rates amid inflation fears"),
+        make_item(id="b", title="Fed raises interest rates amid inflation fears - BBC"),
+        make_item(id="c", title="Apple unveils new iPhone at September event"),
+    ]
+
+    result = detector.deduplicate(batch, store.get)
+    assert [item.id for item in result] == ["a", "c"]
+    assert result[0].cluster_size == 2
+    assert result[0].duplicate_ids == ("b",)
+    store.update({item.id: item for item in result})
+
+    # A later copy bumps the canonical article already in the cache
+    late = make_item(
+        id="d", title="Fed raises interest rates amid inflation fears: CNN"
+    )
+    result = detector.deduplicate([late], store.get)
+    assert [item.id for item in result] == ["a"]
+    assert result[0].cluster_size == 3
+
+
+def test_detector_rebuilds_clusters_from_cached_items():
+    detector = NearDuplicateDetector(0.6)
+    cached = make_item(id="a", title="Fed raises interest rates amid inflation fears")
+    cached = cached.model_copy(update={"cluster_size": 2, "duplicate_ids": ("b",)})
+    detector.rebuild([cached])
+
+    again = make_item(
+        id="b", title="Fed raises interest rates amid inflation fears - BBC"
+    )
+    result = detector.deduplicate([again], {"a": cached}.get)
+    assert result == [cached]
+
+
+def test_rebuild_does_not_decode_snapshot_items():
+    cached = make_item(
+        id="a",
+        title="Fed raises interest rates amid inflation fears",
+        cluster_size=2,
+        duplicate_ids=("b",),
+    )
+    buffer = io.BytesIO()
+    write_snapshot(buffer, [cached])
+    lazy = read_snapshot(buffer.getvalue())
+    detector = NearDuplicateDetector(0.6)
+    detector.rebuild(lazy)
+    assert lazy[0]._item is None
+
+    late = make_item(id="c", title="Fed raises interest rates amid inflation fears")
+    result = detector.deduplicate([late], {"a": lazy[0]}.get)
+    assert [item.id for item in result] == ["a"]
+    assert result[0].cluster_size == 3
+
+
+def test_detector_keeps_stored_records_compact():
+    detector = NearDuplicateDetector(0.6)
+    cached = Article.from_item(
+        make_item(id="a", title="Fed raises interest rates amid inflation fears")
+    )
+    detector.rebuild([cached])
+
+    again = make_item(
+        id="b", title="Fed raises interest rates amid inflation fears - BBC"
+    )
+    result = detector.deduplicate([again], {"a": cached}.get)
+    assert isinstance(result[0], Article)
+    assert result[0].cluster_size == 2
+
+
+def test_detector_starts_new_cluster_when_canonical_is_gone():
+    detector = NearDuplicateDetector(0.6)
+    first = make_item(id="a", title="Fed raises rates amid inflation fears")
+    detector.deduplicate([first], {}.get)
+
+    copy = make_item(id="b", title="Fed raises rates amid inflation fears - BBC")
+    result = detector.deduplicate([copy], {}.get)
+    assert [item.id for item in result] == ["b"]
+    assert result[0].cluster_size == 1
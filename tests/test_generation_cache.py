@@ -0,0 +1,86 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from app.models.generation import GeneratedNewsItem
+from app.services import generation_cache
+from app.services.generation_cache import GenerationCache, generation_key
+
+
+def articles(title="Future"):
+    return [
+        GeneratedNewsItem(
+            title=title,
+            content="Body",
+            predicted_date=datetime(2030, 1, 1),
+            source="Tomorrow Times",
+        )
+    ]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(generation_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_key_depends_on_model_and_prompt():
+    assert generation_key("llama3", "prompt") == generation_key("llama3", "prompt")
+    assert generation_key("llama3", "prompt") != generation_key("mistral", "prompt")
+    assert generation_key("llama3", "prompt") != generation_key("llama3", "prompt 2")
+
+
+def test_entries_are_evicted_least_recently_used_first():
+    cache = GenerationCache(max_entries=2)
+    cache.put("a", articles("a"))
+    cache.put("b", articles("b"))
+    cache.get("a")
+    cache.put("c", articles("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a")[0].title == "a"
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = GenerationCache(ttl=60)
+    cache.put("a", articles())
+
+    clock[0] += 59
+    assert cache.get("a") is not None
+    clock[0] += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_disk_tier_survives_restarts(tmp_path, clock):
+    directory = str(tmp_path / "generations")
+    GenerationCache(ttl=60, directory=directory).put("a", articles("kept"))
+
+    restarted = GenerationCache(ttl=60, directory=directory)
+    assert restarted.get("a")[0].title == "kept"
+    assert restarted.stats().disk_hits == 1
+    # Promoted to memory, so the next lookup does not read the file
+    assert restarted.get("a") is not None
+    assert restarted.stats().hits == 1
+
+
+def test_expired_and_corrupt_disk_entries_are_pruned(tmp_path, clock):
+    directory = str(tmp_path)
+    GenerationCache(ttl=60, directory=directory).put("old", articles())
+    with open(os.path.join(directory, "broken.json"), "w") as f:
+        f.write("{not json")
+
+    clock[0] += 120
+    cache = GenerationCache(ttl=60, directory=directory)
+    assert os.listdir(directory) == []
+    assert cache.get("old") is None
+
+
+def test_zero_entries_disables_the_cache(tmp_path):
+    cache = GenerationCache(max_entries=0, directory=str(tmp_path))
+    cache.put("a", articles())
+    assert cache.get("a") is None
+    assert os.listdir(tmp_path) == []
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 import json
 from unittest.mock import patch, MagicMock, AsyncMock
@@ -6,7 +7,7 @@ from datetime import datetime
 
 from app.services.llm_service import LLMService
 from app.models.news import NewsItem
-from app.models.generation import TimeFrame, NewsStyle
+from app.models.generation import CacheOutcome, TimeFrame, NewsStyle
 
 
 @pytest.fixture
@@ -129,8 +130,9 @@ async def test_generate_future_news(llm_service, mock_news_items):
     assert "health" in result[0].category
     assert "environment" in result[1].category
     
-    # Check API call
+    # Check API call; one JSON reply, not the default NDJSON stream
     llm_service.client.post.assert_called_once()
+    assert llm_service.client.post.call_args.kwargs["json"]["stream"] is False
 
 
 @pytest.mark.asyncio
@@ -170,3 +172,212 @@ async def test_generate_future_news_json_error(llm_service, mock_news_items):
     # Should return a fallback article
     assert len(result) == 1
     assert "Error" in result[0].category or "Generated" in result[0].title
+
+
+def make_pooled_service(handler):
+    client = httpx.AsyncClient(
+        base_url="http://ollama.test", transport=httpx.MockTransport(handler)
+    )
+    return LLMService(client=client)
+
+
+@pytest.mark.asyncio
+async def test_requests_share_the_pooled_client_and_are_counted():
+    def handler(request):
+        if request.url.path == "/api/tags":
+            return httpx.Response(200, json={"models": [{"name": "llama3"}]})
+        raise httpx.ConnectError("connection refused", request=request)
+
+    service = make_pooled_service(handler)
+    client = service.client
+    assert await service.list_available_models() == ["llama3"]
+    with pytest.raises(httpx.ConnectError):
+        await service.generate_future_news(news_items=[], time_frame=TimeFrame.DAY)
+
+    stats = service.stats()
+    assert (stats.requests, stats.errors, stats.in_flight) == (2, 1, 0)
+    assert stats.peak_in_flight == 1
+    assert service.client is client
+
+    await service.close()
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_stream_future_news_uses_the_pooled_client(mock_news_items):
+    def handler(request):
+        assert request.url.path == "/api/generate"
+        return httpx.Response(200, text=json.dumps({"response": "Tomorrow"}))
+
+    service = make_pooled_service(handler)
+    chunks = [chunk async for chunk in service.stream_future_news(mock_news_items)]
+
+    assert chunks == ["Tomorrow"]
+    assert service.stats().requests == 1
+    assert service.stats().in_flight == 0
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_future_news_reassembles_split_lines(mock_news_items):
+    lines = [
+        json.dumps({"response": "Markets", "done": False}),
+        json.dumps({"response": " rally\n", "done": False}),
+        json.dumps({"response": "", "done": True}),
+        json.dumps({"response": "ignored"}),
+    ]
+    body = ("\n".join(lines) + "\n").encode()
+
+    async def chunks():
+        # Split mid-line and merge lines, as TCP reads do
+        for start in range(0, len(body), 7):
+            yield body[start:start + 7]
+
+    def handler(request):
+        return httpx.Response(200, content=chunks())
+
+    service = make_pooled_service(handler)
+    tokens = [token async for token in service.stream_future_news(mock_news_items)]
+
+    assert tokens == ["Markets", " rally\n"]
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_future_news_raises_on_upstream_error(mock_news_items):
+    service = make_pooled_service(lambda request: httpx.Response(404, text="no model"))
+
+    with pytest.raises(Exception, match="404"):
+        async for _ in service.stream_future_news(mock_news_items):
+            pass
+    assert service.stats().errors == 1
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_future_articles_yields_each_article_when_it_closes(
+    mock_news_items,
+):
+    completion = json.dumps(
+        [
+            {
+                "title": f"Future {i}",
+                "content": "Body",
+                "predicted_date": "2030-01-01",
+                "source": "Tomorrow Times",
+            }
+            for i in range(3)
+        ]
+    )
+    tokens = [completion[i:i + 5] for i in range(0, len(completion), 5)]
+    consumed = []
+
+    async def fake_stream(*args, **kwargs):
+        for token in tokens:
+            consumed.append(token)
+            yield token
+
+    service = LLMService(client=AsyncMock())
+    service.stream_future_news = fake_stream
+    articles = service.stream_future_articles(mock_news_items)
+
+    first = await anext(articles)
+    assert first.title == "Future 0"
+    assert len(consumed) < len(tokens) / 2
+    assert [item.title async for item in articles] == ["Future 1", "Future 2"]
+
+
+@pytest.mark.asyncio
+async def test_generate_future_news_cached_reuses_identical_generations(
+    llm_service, mock_news_items
+):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "response": json.dumps(
+            [
+                {
+                    "title": "Future",
+                    "content": "Body",
+                    "predicted_date": "2030-01-01",
+                    "source": "AI News Generator",
+                }
+            ]
+        )
+    }
+    llm_service.client.post.return_value = mock_response
+
+    first, outcome = await llm_service.generate_future_news_cached(mock_news_items)
+    assert outcome == CacheOutcome.MISS
+    again, outcome = await llm_service.generate_future_news_cached(mock_news_items)
+    assert outcome == CacheOutcome.HIT and again == first
+    _, outcome = await llm_service.generate_future_news_cached(
+        mock_news_items, style=NewsStyle.OPTIMISTIC
+    )
+    assert outcome == CacheOutcome.MISS
+    assert llm_service.client.post.call_count == 2
+    assert llm_service.stats().cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_future_news_cached_skips_fallbacks(llm_service, mock_news_items):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"response": "No JSON today"}
+    llm_service.client.post.return_value = mock_response
+
+    await llm_service.generate_future_news_cached(mock_news_items)
+    _, outcome = await llm_service.generate_future_news_cached(mock_news_items)
+    assert outcome == CacheOutcome.MISS
+    assert len(llm_service.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_generations_share_one_completion(
+    llm_service, mock_news_items
+):
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"response": "[]"}
+
+    async def slow_post(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return mock_response
+
+    llm_service.client.post.side_effect = slow_post
+
+    results = await asyncio.gather(
+        *(llm_service.generate_future_news_cached(mock_news_items) for _ in range(4))
+    )
+
+    assert llm_service.client.post.await_count == 1
+    assert [outcome for _, outcome in results] == [CacheOutcome.MISS] + [
+        CacheOutcome.COLLAPSED
+    ] * 3
+    assert llm_service.stats().coalesced_generations == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_streams_share_one_completion(mock_news_items):
+    requests = []
+
+    async def body():
+        for token in ("Tomorrow", " and", " beyond"):
+            await asyncio.sleep(0.005)
+            yield (json.dumps({"response": token}) + "\n").encode()
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=body())
+
+    service = make_pooled_service(handler)
+
+    async def consume():
+        return [token async for token in service.stream_future_news(mock_news_items)]
+
+    results = await asyncio.gather(consume(), consume(), consume())
+
+    assert results == [["Tomorrow", " and", " beyond"]] * 3
+    assert len(requests) == 1
+    assert service.stats().coalesced_streams == 2
+    await service.close()
@@ -0,0 +1,106 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.news_fetcher import NewsFetcher, NewsFetchError
+
+
+def make_fetcher(handler):
+    client = httpx.AsyncClient(
+        base_url="https://newsapi.test/v2",
+        transport=httpx.MockTransport(handler),
+    )
+    fetcher = NewsFetcher(api_key="test-key", client=client)
+    fetcher.retry_backoff = 0
+    return fetcher
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_requests_sources_and_categories():
+    seen = []
+
+    def handler(request):
+        seen.append(dict(request.url.params))
+        return httpx.Response(200, json={"status": "ok", "articles": []})
+
+    fetcher = make_fetcher(handler)
+    responses = await fetcher.fetch_all(["bbc-news", "cnn"], ["science"])
+    await fetcher.aclose()
+
+    assert len(responses) == 3
+    assert {"sources": "bbc-news", "language": "en"} in seen
+    assert {"sources": "cnn", "language": "en"} in seen
+    assert {"category": "science", "language": "en"} in seen
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_runs_requests_concurrently():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"articles": []})
+
+    fetcher = make_fetcher(handler)
+    fetcher.max_concurrency = 3
+    await fetcher.fetch_all(["a", "b", "c", "d", "e"], ["x", "y"])
+    await fetcher.aclose()
+
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_get_top_headlines_retries_transient_errors():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"articles": [{"title": "ok"}]})
+
+    fetcher = make_fetcher(handler)
+    result = await fetcher.get_top_headlines(sources="cnn")
+    await fetcher.aclose()
+
+    assert calls == 3
+    assert result["articles"][0]["title"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_get_top_headlines_does_not_retry_client_errors():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(401, json={"status": "error"})
+
+    fetcher = make_fetcher(handler)
+    with pytest.raises(NewsFetchError):
+        await fetcher.get_top_headlines(sources="cnn")
+    await fetcher.aclose()
+
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_skips_failed_requests():
+    def handler(request):
+        if request.url.params.get("sources") == "broken":
+            raise httpx.ConnectError("boom")
+        return httpx.Response(200, json={"articles": []})
+
+    fetcher = make_fetcher(handler)
+    fetcher.retries = 0
+    responses = await fetcher.fetch_all(["broken", "cnn"], [])
+    await fetcher.aclose()
+
+    assert len(responses) == 1
@@ -1,10 +1,12 @@
 import pytest
 import json
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch, MagicMock, AsyncMock
 import os
 from datetime import datetime
 
 from app.services.news_service import NewsService
+from app.services.news_store import sort_key
+from app.services.storage import JsonNewsStorage
 from app.models.news import NewsItem
 
 
@@ -39,37 +41,48 @@ def mock_newsapi_response():
 
 
 @pytest.fixture
-def mock_news_service():
-    with patch("newsapi.NewsApiClient") as mock_newsapi:
-        service = NewsService()
-        service.newsapi = mock_newsapi
-        yield service
+def mock_news_service(tmp_path, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(
+        settings, "NEWS_COLUMNS_FILE", str(tmp_path / "news_columns.bin")
+    )
+    monkeypatch.setattr(settings, "NEWS_ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(
+        settings, "NEWS_STORAGE_FILE", str(tmp_path / "news_cache.json")
+    )
+    service = NewsService()
+    service.fetcher = AsyncMock()
+    service.storage = JsonNewsStorage(str(tmp_path / "news_cache.json"))
+    # The fixture articles are near-identical on purpose; dedup is tested apart
+    service.detector = None
+    yield service
 
 
 @pytest.mark.asyncio
 async def test_fetch_news(mock_news_service, mock_newsapi_response):
     # Setup mock responses
-    mock_news_service.newsapi.get_top_headlines.return_value = mock_newsapi_response
+    mock_news_service.fetcher.fetch_all.return_value = [mock_newsapi_response]
+    
+    # Call the method
+    result = await mock_news_service.fetch_news()
+    
+    # Check calls to NewsAPI
+    mock_news_service.fetcher.fetch_all.assert_awaited_once()
     
-    # Mock file operations
-    with patch("builtins.open", mock_open()) as mock_file, \
-         patch("json.dump") as mock_json_dump, \
-         patch("os.path.exists", return_value=False):
-        
-        # Call the method
-        result = await mock_news_service.fetch_news()
-        
-        # Check calls to NewsAPI
-        assert mock_news_service.newsapi.get_top_headlines.call_count > 0
-        
-        # Check the results
-        assert len(result) == 2
-        assert result[0].title == "Test News Title"
-        assert result[1].title == "Test News Title 2"
-        
-        # Check that cache was saved
-        mock_file.assert_called()
-        mock_json_dump.assert_called()
+    # Check the results
+    assert len(result) == 2
+    assert result[0].title == "Test News Title"
+    assert result[1].title == "Test News Title 2"
+    
+    # Writes are queued behind a debounce; flushing persists them
+    assert mock_news_service.persister.pending
+    await mock_news_service.persister.flush()
+    assert not mock_news_service.persister.pending
+    
+    # Check that cache was saved
+    with open(mock_news_service.storage.path) as f:
+        assert len(json.load(f)) == 2
 
 
 @pytest.mark.asyncio
@@ -181,3 +194,541 @@ def test_parse_news_items(mock_news_service, mock_newsapi_response):
     assert result[0].source == "Test Source"
     assert result[1].title == "Test News Title 2"
     assert result[1].source == "Test Source 2"
+
+
+@pytest.mark.asyncio
+async def test_get_news_reads_deep_history_from_storage(mock_news_service):
+    mock_news_service.news_cache = [
+        NewsItem(
+            id="recent",
+            title="Recent News",
+            url="https://example.com/recent",
+            source="CNN",
+            published_at=datetime.now(),
+        )
+    ]
+    older = NewsItem(
+        id="older",
+        title="Older News",
+        url="https://example.com/older",
+        source="CNN",
+        published_at=datetime(2020, 1, 1),
+    )
+    mock_news_service.storage = MagicMock()
+    mock_news_service.storage.query.return_value = [older]
+
+    # Served from memory while the page fits in the loaded window
+    result = await mock_news_service.get_news(limit=1)
+    assert result[0].id == "recent"
+    mock_news_service.storage.query.assert_not_called()
+
+    # Deeper pages fall back to storage once history was truncated
+    mock_news_service.history_truncated = True
+    result = await mock_news_service.get_news(limit=1, skip=1)
+    assert result == [older]
+    mock_news_service.storage.query.assert_called_once_with(
+        category=None, source=None, limit=1, skip=1
+    )
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_continue_into_storage(mock_news_service):
+    mock_news_service.news_cache = [
+        NewsItem(
+            id="recent",
+            title="Recent News",
+            url="https://example.com/recent",
+            source="CNN",
+            published_at=datetime(2024, 1, 2),
+        )
+    ]
+    older = NewsItem(
+        id="older",
+        title="Older News",
+        url="https://example.com/older",
+        source="CNN",
+        published_at=datetime(2020, 1, 1),
+    )
+    mock_news_service.storage = MagicMock()
+    mock_news_service.storage.query.return_value = [older]
+    mock_news_service.storage.get.return_value = older
+    mock_news_service.history_truncated = True
+
+    page = await mock_news_service.get_news(limit=1)
+    cursor = mock_news_service.next_cursor(page, 1)
+    page = await mock_news_service.get_news(limit=1, cursor=cursor)
+    assert page == [older]
+    mock_news_service.storage.query.assert_called_once_with(
+        category=None,
+        source=None,
+        limit=1,
+        skip=0,
+        after=sort_key(mock_news_service.store.get("recent")),
+    )
+
+    # The storage page hands out a cursor of its own
+    assert mock_news_service.next_cursor(page, 1, cursor) is not None
+
+
+@pytest.mark.asyncio
+async def test_fetch_news_merges_and_persists_delta(
+    mock_news_service, mock_newsapi_response
+):
+    mock_news_service.storage = MagicMock()
+    mock_news_service.storage.supports_delta = True
+    mock_news_service.storage.supports_query = False
+    mock_news_service.news_cache = []
+    mock_news_service.fetcher.fetch_all.return_value = [mock_newsapi_response]
+
+    await mock_news_service.fetch_news()
+    assert len(mock_news_service.last_merge.added) == 2
+    await mock_news_service.persister.flush()
+    mock_news_service.storage.apply_delta.assert_called_once()
+
+    # A second identical refresh changes nothing and writes nothing
+    await mock_news_service.fetch_news()
+    assert not mock_news_service.last_merge.changed
+    await mock_news_service.persister.flush()
+    mock_news_service.storage.apply_delta.assert_called_once()
+    assert len(mock_news_service.news_cache) == 2
+
+
+def test_article_ids_are_stable_and_normalized(
+    mock_news_service, mock_newsapi_response
+):
+    from app.services.news_service import make_article_id
+
+    first = mock_news_service._parse_news_items(mock_newsapi_response)
+    second = mock_news_service._parse_news_items(mock_newsapi_response)
+    assert [item.id for item in first] == [item.id for item in second]
+    assert first[0].id != first[1].id
+
+    # Tracking params, case, fragments and trailing slashes do not matter
+    assert make_article_id("https://example.com/a", "Title") == make_article_id(
+        "HTTPS://Example.com/a/?utm_source=feed#top", "  title "
+    )
+    assert len(make_article_id("https://example.com/a", "Title")) == 16
+    assert make_article_id("https://example.com/a", "Title") != make_article_id(
+        "https://example.com/b", "Title"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_news_item_by_id(mock_news_service):
+    item = NewsItem(
+        id="abc",
+        title="News",
+        url="https://example.com/abc",
+        source="CNN",
+        published_at=datetime.now(),
+    )
+    mock_news_service.news_cache = [item]
+
+    assert await mock_news_service.get_news_item("abc") == item
+    assert await mock_news_service.get_news_item("missing") is None
+
+
+def make_article(title, description, url):
+    return {
+        "source": {"id": None, "name": url.split("/")[2]},
+        "title": title,
+        "description": description,
+        "url": url,
+        "publishedAt": "2023-05-20T12:00:00Z",
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_news_folds_near_duplicates(mock_news_service):
+    from app.services.dedup import NearDuplicateDetector
+
+    mock_news_service.detector = NearDuplicateDetector(0.6)
+    mock_news_service.storage = MagicMock()
+    mock_news_service.news_cache = []
+    story = "Fed raises interest rates by a quarter point amid inflation fears"
+    summary = "The Federal Reserve raised rates."
+    mock_news_service.fetcher.fetch_all.return_value = [
+        {
+            "articles": [
+                make_article(story, summary, "https://bbc.com/1"),
+                make_article("Unrelated sports result", "A team won.", "https://bbc.com/2"),
+            ]
+        },
+        {"articles": [make_article(story + " - CNN", summary, "https://cnn.com/1")]},
+    ]
+
+    result = await mock_news_service.fetch_news()
+    assert len(result) == 2
+    assert len(mock_news_service.news_cache) == 2
+    canonical = next(item for item in result if item.title == story)
+    assert canonical.cluster_size == 2
+    assert len(canonical.duplicate_ids) == 1
+
+    # Refetching the same copies does not inflate the popularity signal
+    await mock_news_service.fetch_news()
+    assert mock_news_service.store.get(canonical.id).cluster_size == 2
+    assert not mock_news_service.last_merge.changed
+
+
+@pytest.mark.asyncio
+async def test_search_news_ranks_and_follows_refreshes(
+    mock_news_service, mock_newsapi_response
+):
+    mock_news_service.news_cache = [
+        NewsItem(
+            id="rates",
+            title="Fed raises interest rates",
+            url="https://example.com/rates",
+            source="CNN",
+            category="business",
+            published_at=datetime.now(),
+        ),
+        NewsItem(
+            id="election",
+            title="Election night results",
+            url="https://example.com/election",
+            source="BBC",
+            category="politics",
+            published_at=datetime.now(),
+        ),
+    ]
+
+    result = await mock_news_service.search_news("interest rates")
+    assert [item.id for item in result] == ["rates"]
+    assert await mock_news_service.search_news("rates", category="politics") == []
+    assert await mock_news_service.search_news("election", source="BBC")
+
+    # Items merged by a refresh become searchable without a rebuild
+    mock_news_service.fetcher.fetch_all.return_value = [mock_newsapi_response]
+    await mock_news_service.fetch_news()
+    result = await mock_news_service.search_news("test news description", limit=5)
+    assert {item.title for item in result} == {"Test News Title", "Test News Title 2"}
+
+
+@pytest.mark.asyncio
+async def test_time_window_and_counts_use_columns(mock_news_service):
+    from datetime import timedelta, timezone
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    mock_news_service.news_cache = [
+        NewsItem(
+            id=f"item-{i}",
+            title=f"News {i}",
+            url=f"https://example.com/{i}",
+            source="CNN" if i % 2 else "BBC",
+            category="politics" if i < 3 else None,
+            published_at=start + timedelta(days=i),
+        )
+        for i in range(6)
+    ]
+
+    result = await mock_news_service.get_news(
+        since=start + timedelta(days=1), until=start + timedelta(days=4), limit=10
+    )
+    assert [item.id for item in result] == ["item-3", "item-2", "item-1"]
+    result = await mock_news_service.get_news(
+        source="CNN", since=start, limit=1, skip=1
+    )
+    assert [item.id for item in result] == ["item-3"]
+
+    assert await mock_news_service.count_news("source") == {"BBC": 3, "CNN": 3}
+    assert await mock_news_service.count_news(
+        "category", since=start + timedelta(days=2)
+    ) == {"politics": 1}
+
+
+@pytest.mark.asyncio
+async def test_storage_writes_invalidate_cached_responses(
+    mock_news_service, mock_newsapi_response
+):
+    mock_news_service.fetcher.fetch_all.return_value = [mock_newsapi_response]
+    await mock_news_service.fetch_news()
+    # A page cached before the write-behind flush may have read old storage
+    mock_news_service.response_cache.put("page", b"[]")
+    await mock_news_service.persister.flush()
+    assert mock_news_service.response_cache.get("page") is None
+
+
+@pytest.mark.asyncio
+async def test_columns_are_persisted_and_mapped_on_load(
+    mock_news_service, mock_newsapi_response
+):
+    from app.config import settings
+
+    mock_news_service.fetcher.fetch_all.return_value = [mock_newsapi_response]
+    await mock_news_service.fetch_news()
+    # Built with the merge and queued with the batch that produced them
+    assert mock_news_service._columns is not None
+    mock_news_service._columns = None
+    await mock_news_service.persister.flush()
+    assert os.path.exists(settings.NEWS_COLUMNS_FILE)
+
+    mock_news_service._columns = None
+    mock_news_service._load_columns()
+    assert mock_news_service._columns is not None
+    assert await mock_news_service.count_news("source") == {
+        "Test Source": 1,
+        "Test Source 2": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_cache_holds_compact_records(mock_news_service, mock_newsapi_response):
+    from app.services.records import Article
+
+    mock_news_service.fetcher.fetch_all.return_value = [mock_newsapi_response]
+    await mock_news_service.fetch_news()
+
+    assert all(isinstance(item, Article) for item in mock_news_service.store)
+    result = await mock_news_service.get_news(limit=5)
+    assert result and all(isinstance(item, NewsItem) for item in result)
+
+
+@pytest.mark.asyncio
+async def test_refresh_trims_to_budget_and_reports_stats(
+    mock_news_service, mock_newsapi_response, monkeypatch
+):
+    from datetime import timezone
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "NEWS_HISTORY_DAYS", 0)
+    monkeypatch.setattr(settings, "NEWS_MAX_ITEMS", 3)
+    mock_news_service.news_cache = [
+        NewsItem(
+            id=f"old-{i}",
+            title=f"Old {i}",
+            url=f"https://example.com/old/{i}",
+            source="CNN",
+            category="politics",
+            published_at=datetime(2020, 1, i + 1, tzinfo=timezone.utc),
+        )
+        for i in range(3)
+    ]
+    mock_news_service.fetcher.fetch_all.return_value = [mock_newsapi_response]
+
+    await mock_news_service.fetch_news()
+
+    assert [item.id for item in mock_news_service.last_merge.trimmed] == [
+        "old-0",
+        "old-1",
+    ]
+    stats = await mock_news_service.get_stats()
+    assert stats.items == 3
+    assert stats.max_items == 3
+    assert stats.max_age_days is None
+    assert stats.evicted_trimmed == 2
+    assert stats.evicted_expired == 0
+    assert stats.resident_bytes == mock_news_service.store.resident_bytes
+    assert stats.categories == {"politics": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_news_fields_reads_only_requested_fields(
+    mock_news_service, mock_newsapi_response
+):
+    from app.services.records import Article
+
+    mock_news_service.fetcher.fetch_all.return_value = [mock_newsapi_response]
+    await mock_news_service.fetch_news()
+
+    with patch.object(
+        Article, "content", property(lambda self: pytest.fail("content read"))
+    ):
+        result = await mock_news_service.get_news_fields(["id", "title"], limit=5)
+
+    assert result
+    assert all(set(entry) == {"id", "title"} for entry in result)
+    assert result[0]["id"] == (await mock_news_service.get_news(limit=1))[0].id
+
+
+@pytest.mark.asyncio
+async def test_codec_is_trained_once_enough_bodies_are_seen(mock_news_service):
+    articles = [
+        {
+            "title": f"Rates {i}",
+            "url": f"https://example.com/rates/{i}",
+            "source": {"name": "Reuters"},
+            "description": f"The central bank kept interest rates unchanged {i}.",
+            "content": "Officials said inflation continued to ease across "
+            f"the economy on day {i}.",
+            "publishedAt": "2024-01-01T00:00:00Z",
+        }
+        for i in range(30)
+    ]
+    mock_news_service.fetcher.fetch_all.return_value = [
+        {"status": "ok", "articles": articles[:10], "category": "business"}
+    ]
+    await mock_news_service.fetch_news()
+    assert not mock_news_service.codec.trained
+
+    mock_news_service.fetcher.fetch_all.return_value = [
+        {"status": "ok", "articles": articles, "category": "business"}
+    ]
+    await mock_news_service.fetch_news()
+    assert mock_news_service.codec.trained
+
+    news = await mock_news_service.get_news(limit=30)
+    assert len(news) == 30
+    assert {item.content for item in news} == {a["content"] for a in articles}
+
+
+@pytest.mark.asyncio
+async def test_time_ranges_are_served_from_the_archive(
+    mock_news_service, mock_newsapi_response
+):
+    from datetime import timezone
+
+    mock_news_service.fetcher.fetch_all.return_value = [mock_newsapi_response]
+    await mock_news_service.fetch_news()
+
+    # The 2023 day closed long ago, so it is sealed right away
+    partitions = await mock_news_service.get_archive_partitions()
+    assert [(p.day.isoformat(), p.count, p.sealed) for p in partitions] == [
+        ("2023-05-20", 2, True)
+    ]
+
+    archive = mock_news_service.archive
+    with patch.object(archive, "query", wraps=archive.query) as query:
+        # Within the cached window the columns answer
+        news = await mock_news_service.get_news(
+            since=datetime(2023, 5, 20, 12, 30, tzinfo=timezone.utc),
+            until=datetime(2023, 5, 21, tzinfo=timezone.utc),
+        )
+        assert [item.title for item in news] == ["Test News Title 2"]
+        query.assert_not_called()
+
+        # Reaching back past the oldest cached item goes to the archive
+        news = await mock_news_service.get_news(
+            since=datetime(2023, 5, 1, tzinfo=timezone.utc),
+            until=datetime(2023, 5, 20, 12, 30, tzinfo=timezone.utc),
+        )
+        assert [item.title for item in news] == ["Test News Title"]
+        query.assert_called_once()
+
+    history = await mock_news_service.sample_history(
+        since=datetime(2023, 5, 1, tzinfo=timezone.utc)
+    )
+    assert [item.title for item in history] == [
+        "Test News Title 2",
+        "Test News Title",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_stay_stable_across_refreshes(mock_news_service):
+    from datetime import timedelta, timezone
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    mock_news_service.news_cache = [
+        NewsItem(
+            id=f"item-{i}",
+            title=f"News {i}",
+            url=f"https://example.com/{i}",
+            source="CNN",
+            published_at=start + timedelta(hours=i),
+        )
+        for i in range(5)
+    ]
+
+    page = await mock_news_service.get_news(limit=2)
+    cursor = mock_news_service.next_cursor(page, 2)
+    assert [item.id for item in page] == ["item-4", "item-3"]
+
+    # A refresh adds newer articles between the two requests
+    mock_news_service.news_cache = mock_news_service.news_cache + [
+        NewsItem(
+            id="breaking",
+            title="Breaking",
+            url="https://example.com/breaking",
+            source="CNN",
+            published_at=start + timedelta(days=1),
+        )
+    ]
+
+    page = await mock_news_service.get_news(limit=2, cursor=cursor)
+    assert [item.id for item in page] == ["item-2", "item-1"]
+    fields = await mock_news_service.get_news_fields(["id"], limit=2, cursor=cursor)
+    assert fields == [{"id": "item-2"}, {"id": "item-1"}]
+
+    cursor = mock_news_service.next_cursor(fields, 2)
+    page = await mock_news_service.get_news(limit=2, cursor=cursor)
+    assert [item.id for item in page] == ["item-0"]
+    assert mock_news_service.next_cursor(page, 2) is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_publishes_a_new_version_without_blocking_reads(
+    mock_news_service, mock_newsapi_response
+):
+    import asyncio
+    import threading
+    from app.services.news_store import NewsStore
+
+    mock_news_service.news_cache = [
+        NewsItem(
+            id="old",
+            title="Old News",
+            url="https://example.com/old",
+            source="CNN",
+            published_at=datetime(2023, 5, 19),
+        )
+    ]
+    before = mock_news_service.store
+    mock_news_service.fetcher.fetch_all.return_value = [mock_newsapi_response]
+
+    merging, release = threading.Event(), threading.Event()
+    merge = NewsStore.merge
+
+    def slow_merge(self, *args, **kwargs):
+        merging.set()
+        release.wait(5)
+        return merge(self, *args, **kwargs)
+
+    with patch.object(NewsStore, "merge", slow_merge):
+        refresh = asyncio.create_task(mock_news_service.fetch_news())
+        while not merging.is_set():
+            await asyncio.sleep(0.01)
+
+        # The loop keeps serving the published version during the merge
+        assert mock_news_service.store is before
+        assert [i.id for i in await mock_news_service.get_news()] == ["old"]
+        release.set()
+        await refresh
+
+    after = mock_news_service.store
+    assert after is not before and after.version > before.version
+    # "old" expired in the new version only
+    assert after.get("old") is None and before.get("old") is not None
+    assert len(after) == 2
+    assert mock_news_service.snapshot().version == after.version
+
+
+@pytest.mark.asyncio
+async def test_cursor_pins_the_version_it_was_issued_for(mock_news_service):
+    from datetime import timedelta
+
+    items = [
+        NewsItem(
+            id=f"item-{i}",
+            title=f"News {i}",
+            url=f"https://example.com/{i}",
+            source="CNN",
+            published_at=datetime(2024, 1, 1) + timedelta(hours=i),
+        )
+        for i in range(4)
+    ]
+    mock_news_service.news_cache = items
+    page = await mock_news_service.get_news(limit=2)
+    cursor = mock_news_service.next_cursor(page, 2)
+
+    # A new version drops an item the first listing has not reached yet
+    mock_news_service.news_cache = items[:1] + items[2:]
+    page = await mock_news_service.get_news(limit=2, cursor=cursor)
+    assert [item.id for item in page] == ["item-1", "item-0"]
+    assert mock_news_service.snapshot(cursor).version < mock_news_service.store.version
+
+    # Once the version is no longer retained, the current one is used
+    for _ in range(4):
+        mock_news_service.news_cache = items[:1] + items[2:]
+    page = await mock_news_service.get_news(limit=2, cursor=cursor)
+    assert [item.id for item in page] == ["item-0"]
@@ -0,0 +1,224 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.news import NewsItem
+from app.services.news_store import (
+    NewsStore,
+    decode_cursor,
+    encode_cursor,
+    sort_key,
+)
+from tests.conftest import make_item
+
+NOON = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def ago(minutes):
+    return NOON - timedelta(minutes=minutes)
+
+
+@pytest.fixture
+def store():
+    return NewsStore(
+        [
+            make_item(1, "politics", "CNN", published_at=ago(30)),
+            make_item(2, "technology", "BBC", published_at=ago(10)),
+            make_item(3, "politics", "BBC", published_at=ago(20)),
+            make_item(4, None, "CNN", published_at=ago(0)),
+        ]
+    )
+
+
+def test_query_returns_newest_first(store):
+    result = store.query(limit=10)
+    assert [item.id for item in result] == ["item-4", "item-2", "item-3", "item-1"]
+
+
+def test_query_filters_by_category_and_source(store):
+    assert [i.id for i in store.query(category="politics")] == ["item-3", "item-1"]
+    assert [i.id for i in store.query(source="CNN")] == ["item-4", "item-1"]
+    assert [i.id for i in store.query(category="politics", source="BBC")] == ["item-3"]
+    assert store.query(category="sports") == []
+
+
+def test_query_paginates(store):
+    assert [i.id for i in store.query(limit=2, skip=1)] == ["item-2", "item-3"]
+
+
+def test_query_seeks_after_cursor_key(store):
+    after = sort_key(store.get("item-2"))
+    assert [i.id for i in store.query(limit=10, after=after)] == ["item-3", "item-1"]
+    assert [i.id for i in store.query(limit=1, skip=1, after=after)] == ["item-1"]
+    # The key need not be in the filtered index itself
+    assert [i.id for i in store.query(source="CNN", after=after)] == ["item-1"]
+
+    # Newer items inserted ahead of the cursor do not shift the next page
+    store.merge([make_item(5, published_at=ago(-5))])
+    assert [i.id for i in store.query(limit=1, after=after)] == ["item-3"]
+
+
+def test_cursor_round_trip_and_validation(store):
+    item = store.get("item-3")
+    cursor = encode_cursor(store.version, item)
+
+    assert decode_cursor(cursor) == (store.version, sort_key(item))
+    assert "=" not in cursor
+    for bad in ("", "not-a-cursor", encode_cursor(1, item)[:-3], "WzEsMl0"):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+
+def test_version_changes_with_the_contents(store):
+    version = store.version
+    store.merge([make_item(1, "politics", "CNN", published_at=ago(30))])
+    assert store.version == version
+    store.merge([make_item(5, published_at=ago(0))])
+    assert store.version > version
+
+
+def test_copy_is_independent_of_the_original(store):
+    store.version = 7
+    copy = store.copy()
+    assert copy.version == 7
+    assert copy.resident_bytes == store.resident_bytes
+    assert [i.id for i in copy.query(limit=10)] == [i.id for i in store.query(limit=10)]
+
+    copy.merge([make_item(5, "politics", "CNN", published_at=ago(-5))])
+    copy.trim(max_items=4)
+    assert len(store) == 4 and store.version == 7
+    assert store.get("item-5") is None
+    assert [i.id for i in store.query(category="politics")] == ["item-3", "item-1"]
+    assert [i.id for i in copy.query(category="politics")] == ["item-5", "item-3"]
+    assert copy.version > 7
+
+
+def test_query_does_not_mutate_store(store):
+    store.query(limit=1)[:] = []
+    assert len(store.query(limit=10)) == 4
+
+
+def test_store_deduplicates_by_id_and_supports_lookup():
+    store = NewsStore(
+        [make_item(1, published_at=ago(5)), make_item(1, published_at=ago(0))]
+    )
+    assert len(store) == 1
+    assert store.get("item-1").published_at.minute == 0
+    assert store.get("missing") is None
+
+
+def test_store_lists_distinct_categories_and_sources(store):
+    assert sorted(store.categories()) == ["politics", "technology"]
+    assert sorted(store.sources()) == ["BBC", "CNN"]
+
+
+def test_store_facets_count_values_and_track_newest(store):
+    facets = store.facets()
+    assert facets.total == 4
+    assert [(f.value, f.count) for f in facets.sources] == [("BBC", 2), ("CNN", 2)]
+    assert [(f.value, f.count) for f in facets.categories] == [
+        ("politics", 2),
+        ("technology", 1),
+    ]
+    assert facets.sources[1].newest == store.get("item-4").published_at
+    assert store.facets() is facets
+
+
+def test_store_facets_follow_merges(store):
+    before = store.facets()
+    store.merge(
+        [make_item(5, "sports", "CNN", published_at=ago(-5))],
+        evict_before=datetime(2024, 1, 1, 11, 35, tzinfo=timezone.utc),
+    )
+    facets = store.facets()
+    assert facets is not before
+    assert facets.total == 4
+    cnn = next(f for f in facets.sources if f.value == "CNN")
+    assert (cnn.count, cnn.newest) == (2, store.get("item-5").published_at)
+    # item-1, the only older politics article, was evicted
+    assert [(f.value, f.count) for f in facets.categories] == [
+        ("politics", 1),
+        ("sports", 1),
+        ("technology", 1),
+    ]
+
+
+def test_store_orders_naive_and_aware_datetimes():
+    aware = make_item(1, published_at=ago(0))
+    naive = NewsItem(
+        id="naive",
+        title="Naive",
+        url="https://example.com/naive",
+        source="CNN",
+        published_at=datetime(2000, 1, 1),
+    )
+    assert [i.id for i in NewsStore([naive, aware]).query()] == ["item-1", "naive"]
+
+
+def test_merge_adds_updates_and_keeps_history(store):
+    changed = make_item(2, "technology", "BBC", published_at=ago(5))
+    unchanged = make_item(3, "politics", "BBC", published_at=ago(20))
+    result = store.merge([make_item(5, published_at=ago(1)), changed, unchanged])
+
+    assert [i.id for i in result.added] == ["item-5"]
+    assert [i.id for i in result.updated] == ["item-2"]
+    assert result.evicted == []
+    assert len(store) == 5
+    assert [i.id for i in store.query(source="BBC")] == ["item-2", "item-3"]
+    assert store.get("item-2") is changed
+
+
+def test_merge_evicts_expired_items_not_in_refresh(store):
+    cutoff = datetime(2024, 1, 1, 11, 35, tzinfo=timezone.utc)
+    refreshed = make_item(1, "politics", "CNN", published_at=ago(30))
+    result = store.merge([refreshed], evict_before=cutoff)
+
+    # item-1 is older than the cutoff but was just fetched again
+    assert [i.id for i in result.evicted] == []
+    result = store.merge([], evict_before=cutoff)
+    assert [i.id for i in result.evicted] == ["item-1"]
+    assert store.get("item-1") is None
+    assert [i.id for i in store.query(category="politics")] == ["item-3"]
+    assert [i.id for i in store.query(category="politics", source="CNN")] == []
+
+
+def test_merge_reports_no_change_for_identical_items(store):
+    result = store.merge([make_item(1, "politics", "CNN", published_at=ago(30))])
+    assert not result.changed
+
+
+def test_trim_evicts_oldest_of_largest_category_first():
+    store = NewsStore(
+        [make_item(i, "politics", published_at=ago(i)) for i in range(1, 7)]
+        + [make_item(10, "science", published_at=ago(100))]
+        + [make_item(11, None, published_at=ago(200))]
+    )
+
+    trimmed = store.trim(max_items=4)
+
+    # Politics dominated, so its oldest items went even though the quiet
+    # categories hold older articles
+    assert [item.id for item in trimmed] == ["item-6", "item-5", "item-4", "item-3"]
+    assert store.category_counts() == {"politics": 2, "science": 1}
+    assert store.get("item-11") is not None
+
+
+def test_trim_respects_byte_budget_and_keep(store):
+    start = store.resident_bytes
+    assert start > 0
+
+    trimmed = store.trim(max_bytes=1, keep={"item-1", "item-3"})
+
+    assert {item.id for item in trimmed} == {"item-2", "item-4"}
+    assert [item.id for item in store] == ["item-3", "item-1"]
+    assert 0 < store.resident_bytes < start
+
+
+def test_merge_reports_trimmed_separately(store):
+    result = store.merge([make_item(5, "science", published_at=ago(0))], max_items=3)
+
+    assert [item.id for item in result.added] == ["item-5"]
+    assert result.evicted == []
+    assert len(result.trimmed) == 2
+    assert len(store) == 3
+    assert result.removed == result.trimmed
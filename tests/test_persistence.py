@@ -0,0 +1,108 @@
+import asyncio
+import json
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.news_store import MergeResult
+from app.services.persistence import WriteBatch, WriteBehindPersister, write_batch
+from app.services.storage import JsonNewsStorage
+from tests.conftest import make_item
+
+
+def test_write_batch_coalesces_latest_change_per_id():
+    batch = WriteBatch()
+    batch.add(upserts=[make_item(1), make_item(2)])
+    batch.add(upserts=[make_item(1, title="Updated")], deletes=["item-2"])
+    batch.add(upserts=[make_item(2, title="Back")])
+
+    assert batch.upserts["item-1"].title == "Updated"
+    assert batch.upserts["item-2"].title == "Back"
+    assert batch.deletes == set()
+
+
+@pytest.mark.asyncio
+async def test_persister_debounces_into_one_write_off_the_loop():
+    writes = []
+
+    def write(batch):
+        writes.append((sorted(batch.upserts), batch.deletes, threading.get_ident()))
+
+    persister = WriteBehindPersister(write, debounce_seconds=0.05)
+    persister.submit(MergeResult(added=[make_item(1)]))
+    persister.submit(MergeResult(added=[make_item(2)], evicted=[make_item(1)]))
+    assert writes == []
+
+    await asyncio.sleep(0.2)
+    assert len(writes) == 1
+    upserts, deletes, thread_id = writes[0]
+    assert (upserts, deletes) == (["item-2"], {"item-1"})
+    assert thread_id != threading.get_ident()
+    assert not persister.pending
+
+
+@pytest.mark.asyncio
+async def test_persister_close_flushes_pending_writes():
+    write = MagicMock()
+    persister = WriteBehindPersister(write, debounce_seconds=60)
+    persister.submit(MergeResult(added=[make_item(1)]))
+
+    await persister.close()
+    write.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_persister_requeues_failed_writes():
+    write = MagicMock(side_effect=[OSError("disk full"), None])
+    persister = WriteBehindPersister(write, debounce_seconds=60)
+    persister.submit(MergeResult(added=[make_item(1)]))
+
+    await persister.flush()
+    assert persister.pending
+    await persister.flush()
+    assert not persister.pending
+    assert list(write.call_args[0][0].upserts) == ["item-1"]
+    await persister.close()
+
+
+@pytest.mark.asyncio
+async def test_persister_retries_failed_writes_with_backoff():
+    write = MagicMock(side_effect=[OSError("disk full"), OSError("disk full"), None])
+    persister = WriteBehindPersister(write, debounce_seconds=0.005)
+    persister.submit(MergeResult(added=[make_item(1)]))
+
+    # No further submit is needed for the batch to be written
+    await asyncio.sleep(0.2)
+    assert write.call_count == 3
+    assert not persister.pending
+    assert persister.failures == 0
+    await persister.close()
+
+
+def test_json_save_is_atomic(tmp_path):
+    path = tmp_path / "news.json"
+    storage = JsonNewsStorage(str(path), fsync=True)
+    storage.save([make_item(1)])
+
+    with patch("json.dump", side_effect=RuntimeError("crash mid-write")):
+        with pytest.raises(RuntimeError):
+            storage.save([make_item(1), make_item(2)])
+
+    # The previous cache survives and no temp files are left behind
+    assert len(json.loads(path.read_text())) == 1
+    assert os.listdir(tmp_path) == ["news.json"]
+
+
+def test_write_batch_uses_snapshot_for_full_rewrite_backends(tmp_path):
+    storage = JsonNewsStorage(str(tmp_path / "news.json"))
+    batch = WriteBatch()
+    batch.add(upserts=[make_item(2)])
+
+    with pytest.raises(ValueError):
+        write_batch(storage, batch)
+
+    batch.snapshot = [make_item(1), make_item(2)]
+    write_batch(storage, batch)
+    assert len(storage.load()) == 2
@@ -0,0 +1,75 @@
+from app.models.news import NewsItem
+from app.services.news_store import NewsStore
+from app.services.records import Article, materialize, replace
+from tests.conftest import make_item
+
+
+def test_round_trip_through_compact_record():
+    item = make_item(description="Description", duplicate_ids=("a",), cluster_size=2)
+    article = Article.from_item(item)
+
+    assert article == item
+    assert materialize(article) == item
+    assert isinstance(materialize(article), NewsItem)
+    assert materialize(item) is item
+    assert Article.from_item(article) is article
+
+
+def test_source_and_category_are_interned():
+    # Built at runtime, so equal strings are distinct objects until interned
+    first, second = (
+        Article.from_item(make_item(index, source="".join(["C", "N", "N"])))
+        for index in (1, 2)
+    )
+    assert first.source is second.source
+    assert first.category is second.category
+
+
+def test_records_have_no_instance_dict():
+    assert not hasattr(Article.from_item(make_item()), "__dict__")
+
+
+def test_replace_keeps_the_record_kind():
+    item = make_item()
+    article = Article.from_item(item)
+
+    changed = replace(article, cluster_size=3)
+    assert isinstance(changed, Article)
+    assert changed.cluster_size == 3 and article.cluster_size == 1
+    assert isinstance(replace(item, cluster_size=3), NewsItem)
+    assert changed != article
+
+
+def test_store_converts_only_returned_items():
+    store = NewsStore([Article.from_item(make_item(i)) for i in range(1, 4)])
+
+    assert all(isinstance(item, Article) for item in store)
+    page = store.query(limit=2)
+    assert [type(item) for item in page] == [NewsItem, NewsItem]
+    assert [item.id for item in page] == ["item-3", "item-2"]
+    assert store.get("item-1") == make_item(1)
+
+
+def test_store_reuses_models_until_an_item_changes():
+    store = NewsStore([Article.from_item(make_item(1))])
+
+    first = store.get("item-1")
+    assert store.query(limit=1)[0] is first
+
+    store.merge([Article.from_item(make_item(1, cluster_size=5))])
+    assert store.get("item-1") is not first
+    assert store.get("item-1").cluster_size == 5
+
+
+def test_copied_store_never_serves_another_versions_model():
+    store = NewsStore([Article.from_item(make_item(1))])
+    first = store.get("item-1")
+
+    copy = store.copy()
+    assert copy.get("item-1") is first
+    copy.merge([Article.from_item(make_item(1, cluster_size=5))])
+
+    # The old version still maps its own record to the old model
+    assert store.get("item-1") is first
+    assert copy.get("item-1").cluster_size == 5
+    assert copy.model(store.record("item-1")).cluster_size == 1
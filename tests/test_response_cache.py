@@ -0,0 +1,48 @@
+from app.services.response_cache import ResponseCache, etag_matches, make_etag
+
+
+def test_etag_is_strong_and_content_derived():
+    etag = make_etag(b'{"count":1}')
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag(b'{"count":1}')
+    assert etag != make_etag(b'{"count":2}')
+
+
+def test_if_none_match_comparison():
+    etag = make_etag(b"body")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_cache_is_lru_bounded_and_clearable():
+    cache = ResponseCache(max_entries=2)
+    first = cache.put("a", b"1")
+    cache.put("b", b"2")
+    assert cache.get("a") is first  # "a" is now the most recent
+    cache.put("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("c").body == b"3"
+    assert (cache.hits, cache.misses) == (2, 1)
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_zero_size_disables_caching():
+    cache = ResponseCache(max_entries=0)
+    assert cache.put("a", b"1").body == b"1"
+    assert cache.get("a") is None
+
+
+def test_entries_built_across_a_clear_are_not_stored():
+    cache = ResponseCache()
+    generation = cache.generation
+    cache.clear()
+    assert cache.put("a", b"stale", generation).body == b"stale"
+    assert cache.get("a") is None
+
+    cache.put("a", b"fresh", cache.generation)
+    assert cache.get("a").body == b"fresh"
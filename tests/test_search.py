@@ -0,0 +1,81 @@
+from app.services.news_store import MergeResult
+from app.services.search import SearchIndex, tokenize
+from tests.conftest import make_item
+
+
+def ids(hits):
+    return [item_id for item_id, _ in hits]
+
+
+def test_tokenize_drops_stopwords_and_keeps_repeats():
+    assert tokenize("The Fed and the FED: rates") == ["fed", "fed", "rates"]
+
+
+def test_ranks_by_term_frequency_and_rarity():
+    index = SearchIndex(
+        [
+            make_item(id="a", title="Fed raises rates", content="rates rates rates"),
+            make_item(id="b", title="Fed holds rates steady"),
+            make_item(id="c", title="Election results are in"),
+        ]
+    )
+
+    assert ids(index.search("rates")) == ["a", "b"]
+    # The rarer term decides the ranking
+    assert ids(index.search("fed steady")) == ["b", "a"]
+    assert index.search("unknown") == []
+    assert ids(index.search("RATES", limit=1)) == ["a"]
+
+
+def test_where_filters_hits():
+    index = SearchIndex(
+        [make_item(id="a", title="Fed rates"), make_item(id="b", title="Fed rates")]
+    )
+    assert ids(index.search("fed", where=lambda item_id: item_id == "b")) == ["b"]
+
+
+def test_apply_keeps_postings_in_sync():
+    index = SearchIndex(
+        [make_item(id="a", title="Fed rates"), make_item(id="b", title="Election")]
+    )
+
+    index.apply(
+        MergeResult(
+            added=[make_item(id="c", title="Climate summit")],
+            updated=[make_item(id="a", title="Market rally")],
+            evicted=[make_item(id="b", title="Election")],
+        )
+    )
+
+    assert len(index) == 2
+    assert "b" not in index
+    assert index.search("election") == []
+    assert index.search("fed") == []
+    assert set(ids(index.search("rally climate"))) == {"a", "c"}
+    assert index._postings.keys() == {"climate", "summit", "market", "rally"}
+
+
+def test_top_k_matches_exhaustive_ranking(monkeypatch):
+    import random
+
+    # Force the threshold algorithm even on this small corpus
+    monkeypatch.setattr("app.services.search.EXHAUSTIVE_MAX_POSTINGS", 0)
+
+    rng = random.Random(7)
+    words = [f"w{i}" for i in range(30)]
+    index = SearchIndex(
+        make_item(id=str(i), title=" ".join(rng.choices(words, k=rng.randint(1, 12))))
+        for i in range(3000)
+    )
+
+    for query in ["w1", "w2 w3", "w0 w5 w29", "w4 missing"]:
+        exhaustive = index.search(query)
+        for limit in (1, 10, 50):
+            assert ids(index.search(query, limit=limit)) == ids(exhaustive[:limit])
+        assert index.search(query, limit=0) == []
+
+    def odd(item_id):
+        return int(item_id) % 2 == 1
+
+    expected = [hit for hit in index.search("w1 w2") if odd(hit[0])][:5]
+    assert ids(index.search("w1 w2", limit=5, where=odd)) == ids(expected)
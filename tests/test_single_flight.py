@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight, StreamFanout
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_run_once():
+    flight = SingleFlight()
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("key", generate) for _ in range(3)))
+
+    assert calls == [1]
+    assert results == [("result", False), ("result", True), ("result", True)]
+    assert flight.coalesced == 2
+    assert len(flight) == 0
+    # Finished calls are not reused
+    assert await flight.do("key", generate) == ("result", False)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+    )
+    assert [str(result) for result in results] == ["upstream down"] * 2
+
+
+@pytest.mark.asyncio
+async def test_call_is_cancelled_only_when_every_waiter_left():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    cancelled = []
+
+    async def generate():
+        started.set()
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    first = asyncio.ensure_future(flight.do("key", generate))
+    second = asyncio.ensure_future(flight.do("key", generate))
+    await started.wait()
+
+    first.cancel()
+    await asyncio.sleep(0)
+    assert cancelled == []
+    second.cancel()
+    await asyncio.gather(first, second, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert cancelled == [True]
+    assert len(flight) == 0
+
+
+async def ticking(count, opened, closed=None, interval=0.005):
+    opened.append(1)
+    try:
+        for i in range(count):
+            await asyncio.sleep(interval)
+            yield i
+    finally:
+        if closed is not None:
+            closed.append(True)
+
+
+@pytest.mark.asyncio
+async def test_fanout_shares_one_upstream_and_replays_to_late_joiners():
+    fanout, opened = StreamFanout(), []
+
+    async def consume(delay):
+        await asyncio.sleep(delay)
+        stream = fanout.subscribe("key", lambda: ticking(5, opened))
+        return [item async for item in stream]
+
+    results = await asyncio.gather(consume(0), consume(0.012))
+
+    assert results == [[0, 1, 2, 3, 4]] * 2
+    assert opened == [1]
+    assert fanout.coalesced == 1
+    assert len(fanout) == 0
+
+
+@pytest.mark.asyncio
+async def test_fanout_closes_upstream_when_last_subscriber_leaves():
+    fanout, opened, closed = StreamFanout(), [], []
+    first = fanout.subscribe("key", lambda: ticking(10**6, opened, closed))
+    second = fanout.subscribe("key", lambda: ticking(10**6, opened, closed))
+
+    assert await anext(first) == 0
+    assert await anext(second) == 0
+    await first.aclose()
+    assert await anext(second) == 1
+    assert closed == []
+
+    await second.aclose()
+    await asyncio.sleep(0.01)
+    assert closed == [True]
+    assert len(fanout) == 0
+
+
+@pytest.mark.asyncio
+async def test_fanout_closes_upstream_when_subscriber_leaves_before_reading():
+    fanout, opened, closed = StreamFanout(), [], []
+    stream = fanout.subscribe("key", lambda: ticking(10**6, opened, closed))
+    await asyncio.sleep(0.01)
+    assert opened == [1]
+
+    # A client that disconnects before the first read still lets go
+    await stream.aclose()
+    await asyncio.sleep(0.01)
+    assert closed == [True]
+    assert len(fanout) == 0
+
+
+@pytest.mark.asyncio
+async def test_fanout_errors_reach_every_subscriber():
+    fanout = StreamFanout()
+
+    async def failing():
+        yield "a"
+        raise RuntimeError("upstream down")
+
+    async def consume():
+        items = []
+        with pytest.raises(RuntimeError, match="upstream down"):
+            async for item in fanout.subscribe("key", failing):
+                items.append(item)
+        return items
+
+    assert await asyncio.gather(consume(), consume()) == [["a"], ["a"]]
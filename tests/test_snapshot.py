@@ -0,0 +1,124 @@
+import io
+import struct
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.news import NewsItem
+from app.services.news_store import NewsStore
+from app.services.snapshot import (
+    HEADER,
+    MAGIC,
+    LazyNewsItem,
+    SnapshotFormatError,
+    read_fields,
+    read_snapshot,
+    write_snapshot,
+)
+from app.services.storage import SnapshotNewsStorage, get_storage
+from tests.conftest import make_item
+
+
+def snapshot_bytes(items):
+    buffer = io.BytesIO()
+    write_snapshot(buffer, items)
+    return buffer.getvalue()
+
+
+def test_round_trip_preserves_items():
+    plus_two = datetime(2024, 1, 1, 2, tzinfo=timezone(timedelta(hours=2)))
+    items = [
+        make_item(
+            2,
+            description="Description – ünïcode",
+            published_at=plus_two,
+            duplicate_ids=("a", "b"),
+            cluster_size=3,
+        ),
+        make_item(1, category=None, author="Jane"),
+    ]
+    loaded = read_snapshot(snapshot_bytes(items))
+
+    assert [item.materialize() for item in loaded] == items
+    assert loaded[1].category is None
+    assert loaded[0].published_at.utcoffset() == timedelta(hours=2)
+
+
+def test_load_is_lazy_until_materialized():
+    loaded = read_snapshot(snapshot_bytes([make_item(1)]))[0]
+
+    assert isinstance(loaded, LazyNewsItem)
+    assert loaded._item is None
+    assert (loaded.id, loaded.source, loaded.category) == ("item-1", "CNN", "politics")
+    assert loaded._item is None
+
+    assert loaded.title == "News 1"
+    assert isinstance(loaded._item, NewsItem)
+
+
+def test_read_fields_leaves_lazy_items_undecoded():
+    loaded = read_snapshot(snapshot_bytes([make_item(1, duplicate_ids=("a",))]))[0]
+
+    fields = ("id", "title", "duplicate_ids")
+    assert read_fields(loaded, fields) == ("item-1", "News 1", ("a",))
+    assert loaded._item is None
+    loaded.materialize()
+    assert read_fields(loaded, fields) == ("item-1", "News 1", ("a",))
+
+
+def test_limit_reads_only_leading_entries():
+    items = [make_item(3), make_item(2), make_item(1)]
+    loaded = read_snapshot(snapshot_bytes(items), limit=2)
+    assert [item.id for item in loaded] == ["item-3", "item-2"]
+
+
+def test_rejects_foreign_and_future_files():
+    with pytest.raises(SnapshotFormatError):
+        read_snapshot(b"[]")
+    with pytest.raises(SnapshotFormatError):
+        read_snapshot(b"x" * HEADER.size)
+
+    data = bytearray(snapshot_bytes([make_item(1)]))
+    struct.pack_into("<H", data, len(MAGIC), 99)
+    with pytest.raises(SnapshotFormatError, match="version 99"):
+        read_snapshot(bytes(data))
+
+
+def test_rewrite_copies_undecoded_records():
+    data = snapshot_bytes([make_item(2), make_item(1)])
+    loaded = read_snapshot(data)
+    loaded[0].materialize()
+
+    assert snapshot_bytes(loaded) == data
+    assert loaded[1]._item is None
+
+
+def test_store_returns_materialized_items():
+    store = NewsStore(read_snapshot(snapshot_bytes([make_item(1), make_item(2)])))
+
+    page = store.query(limit=10)
+    assert all(isinstance(item, NewsItem) for item in page)
+    assert [item.id for item in page] == ["item-2", "item-1"]
+    assert isinstance(store.get("item-1"), NewsItem)
+
+
+def test_snapshot_storage_save_and_load(tmp_path):
+    storage = SnapshotNewsStorage(str(tmp_path / "news.snap"), fsync=False)
+    assert storage.load() == []
+
+    items = [make_item(2), make_item(1)]
+    storage.save(items)
+    loaded = storage.load()
+    assert [item.materialize() for item in loaded] == items
+
+    # Saving over a mapped file leaves the earlier mapping readable
+    storage.save([make_item(3), *loaded])
+    assert loaded[1].title == "News 1"
+    assert [item.id for item in storage.load()] == ["item-3", "item-2", "item-1"]
+
+
+def test_get_storage_snapshot_backend(tmp_path, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "NEWS_SNAPSHOT_FILE", str(tmp_path / "news.snap"))
+    assert isinstance(get_storage("snapshot"), SnapshotNewsStorage)
@@ -0,0 +1,103 @@
+import pytest
+
+from app.services.news_store import sort_key
+from app.services.storage import JsonNewsStorage, SqliteNewsStorage, get_storage
+from tests.conftest import make_item
+
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    storage = SqliteNewsStorage(str(tmp_path / "news.db"))
+    yield storage
+    storage.close()
+
+
+def test_sqlite_uses_wal_mode(sqlite_storage):
+    mode = sqlite_storage._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_sqlite_round_trip_newest_first(sqlite_storage):
+    sqlite_storage.save([make_item(1), make_item(3), make_item(2)])
+
+    loaded = sqlite_storage.load()
+    assert [item.id for item in loaded] == ["item-3", "item-2", "item-1"]
+    assert loaded[0] == make_item(3)
+    assert [item.id for item in sqlite_storage.load(limit=1)] == ["item-3"]
+
+
+def test_sqlite_upserts_by_id(sqlite_storage):
+    sqlite_storage.save([make_item(1)])
+    sqlite_storage.save([make_item(1, title="Updated"), make_item(2)])
+
+    assert sqlite_storage.count() == 2
+    assert sqlite_storage.query(limit=10)[-1].title == "Updated"
+
+
+def test_sqlite_query_filters_and_paginates(sqlite_storage):
+    sqlite_storage.save(
+        [
+            make_item(1, "politics", "CNN"),
+            make_item(2, "technology", "BBC"),
+            make_item(3, "politics", "BBC"),
+            make_item(4, "politics", "CNN"),
+        ]
+    )
+
+    assert [i.id for i in sqlite_storage.query(category="politics")] == [
+        "item-4",
+        "item-3",
+        "item-1",
+    ]
+    assert [i.id for i in sqlite_storage.query(source="BBC")] == ["item-3", "item-2"]
+    assert [
+        i.id for i in sqlite_storage.query(category="politics", limit=1, skip=1)
+    ] == ["item-3"]
+
+
+def test_sqlite_query_seeks_after_a_sort_key(sqlite_storage):
+    tied = make_item(2).model_copy(update={"id": "item-2b"})
+    sqlite_storage.save([make_item(1), make_item(2), tied, make_item(3)])
+
+    after = sort_key(make_item(2))
+    assert [i.id for i in sqlite_storage.query(after=after)] == ["item-2b", "item-1"]
+    assert [i.id for i in sqlite_storage.query(limit=1, after=after)] == ["item-2b"]
+    assert sqlite_storage.query(after=sort_key(make_item(1))) == []
+
+
+def test_json_round_trip(tmp_path):
+    storage = JsonNewsStorage(str(tmp_path / "cache" / "news.json"))
+    assert storage.load() == []
+
+    storage.save([make_item(1), make_item(2)])
+    assert storage.load() == [make_item(1), make_item(2)]
+
+
+def test_get_storage_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        get_storage("redis")
+
+
+def test_migrate_json_cache_into_sqlite(tmp_path):
+    from scripts.migrate_news_cache import migrate
+
+    json_path = str(tmp_path / "news.json")
+    db_path = str(tmp_path / "news.db")
+    JsonNewsStorage(json_path).save([make_item(1), make_item(2)])
+
+    assert migrate(json_path, db_path) == 0
+    assert migrate(json_path, db_path) == 0
+
+    storage = SqliteNewsStorage(db_path)
+    assert [item.id for item in storage.load()] == ["item-2", "item-1"]
+    storage.close()
+
+
+def test_sqlite_apply_delta_and_delete_before(sqlite_storage):
+    sqlite_storage.save([make_item(1), make_item(2), make_item(3)])
+    sqlite_storage.apply_delta([make_item(4)], ["item-3"])
+    assert [i.id for i in sqlite_storage.load()] == ["item-4", "item-2", "item-1"]
+
+    cutoff = make_item(3).published_at
+    assert sqlite_storage.delete_before(cutoff, keep=["item-1"]) == 1
+    assert [i.id for i in sqlite_storage.load()] == ["item-4", "item-1"]
@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+import pytest
+
+from app.models.generation import StreamFormat
+from app.services.streaming import encode_frame, frame_tokens, relay_until_disconnect
+
+
+async def tokens(*values, error=None):
+    for value in values:
+        yield value
+    if error is not None:
+        raise error
+
+
+class FakeRequest:
+    """Request whose client disconnects once `gone` is set"""
+
+    def __init__(self):
+        self.gone = asyncio.Event()
+
+    async def receive(self):
+        await self.gone.wait()
+        return {"type": "http.disconnect"}
+
+
+def test_sse_frames_keep_newlines_inside_the_data_line():
+    frame = encode_frame(StreamFormat.SSE, "token", {"token": "a\n\nb"})
+    assert frame == b'event: token\ndata: {"token":"a\\n\\nb"}\n\n'
+
+
+def test_ndjson_frames_are_one_line_each():
+    frame = encode_frame(StreamFormat.NDJSON, "token", {"token": "a\nb"})
+    assert frame.count(b"\n") == 1
+    assert json.loads(frame) == {"event": "token", "token": "a\nb"}
+
+
+@pytest.mark.asyncio
+async def test_frame_tokens_ends_with_done_or_error():
+    frames = [f async for f in frame_tokens(tokens("a", "b"), StreamFormat.NDJSON)]
+    assert [json.loads(f)["event"] for f in frames] == ["token", "token", "done"]
+
+    failing = tokens("a", error=RuntimeError("upstream died"))
+    frames = [f async for f in frame_tokens(failing, StreamFormat.NDJSON)]
+    assert json.loads(frames[-1]) == {"event": "error", "detail": "upstream died"}
+
+
+@pytest.mark.asyncio
+async def test_relay_closes_upstream_when_client_disconnects():
+    closed = asyncio.Event()
+
+    async def slow_upstream():
+        try:
+            yield b"first"
+            # The model is still thinking when the client goes away
+            await asyncio.sleep(3600)
+            yield b"never"
+        finally:
+            closed.set()
+
+    request = FakeRequest()
+    relayed = []
+
+    async def consume():
+        async for chunk in relay_until_disconnect(request, slow_upstream()):
+            relayed.append(chunk)
+            request.gone.set()
+
+    await asyncio.wait_for(consume(), timeout=1)
+    assert relayed == [b"first"]
+    assert closed.is_set()
+
+
+@pytest.mark.asyncio
+async def test_relay_passes_every_chunk_through():
+    request = FakeRequest()
+    chunks = [c async for c in relay_until_disconnect(request, tokens(b"a", b"b"))]
+    assert chunks == [b"a", b"b"]
+
+
+@pytest.mark.asyncio
+async def test_closing_frames_closes_the_upstream():
+    closed = []
+
+    async def upstream():
+        try:
+            yield "a"
+            yield "b"
+        finally:
+            closed.append(True)
+
+    frames = frame_tokens(upstream(), StreamFormat.SSE)
+    await anext(frames)
+    await frames.aclose()
+    assert closed == [True]